@@ -6,27 +6,45 @@ https://github.com/andrew-codechimp/HA-Calendar-Event
 
 from __future__ import annotations
 
+from functools import partial
+
 import voluptuous as vol
 from awesomeversion.awesomeversion import AwesomeVersion
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import __version__ as HA_VERSION  # noqa: N812
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import config_validation as cv, entity_registry as er
 from homeassistant.helpers.helper_integration import async_handle_source_entity_changes
 from homeassistant.helpers.typing import ConfigType
 
+from .cache import async_get_event_cache
 from .const import (
     CONF_CALENDAR_ENTITY_ID,
     CONF_MATCH,
     CONF_MATCH_ATTRIBUTE,
+    CONF_MAX_CONCURRENT_FETCHES,
+    DEFAULT_MAX_CONCURRENT_FETCHES,
     DOMAIN,
     LOGGER,
     MIN_HA_VERSION,
     PLATFORMS,
 )
-
-CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+from .limiter import async_get_fetch_limiter
+from .services import async_setup_services
+
+CONFIG_SCHEMA = vol.Schema(
+    {
+        vol.Optional(DOMAIN): vol.Schema(
+            {
+                vol.Optional(
+                    CONF_MAX_CONCURRENT_FETCHES, default=DEFAULT_MAX_CONCURRENT_FETCHES
+                ): cv.positive_int,
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
 LEGACY_CONF_SUMMARY = "summary"
 
 
@@ -45,6 +63,13 @@ async def async_setup(
         LOGGER.critical(msg)
         return False
 
+    if DOMAIN in config:
+        async_get_fetch_limiter(hass).async_set_limit(
+            config[DOMAIN][CONF_MAX_CONCURRENT_FETCHES]
+        )
+
+    async_setup_services(hass)
+
     return True
 
 
@@ -52,45 +77,78 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up calendar_event from a config entry."""
 
     entity_registry = er.async_get(hass)
-
-    try:
-        _ = er.async_validate_entity_id(
-            entity_registry, entry.options[CONF_CALENDAR_ENTITY_ID]
-        )
-    except vol.Invalid:
-        LOGGER.error(
-            "Failed to setup calendar_event for unknown entity %s",
-            entry.options[CONF_CALENDAR_ENTITY_ID],
+    calendar_entity_ids: list[str] = entry.options[CONF_CALENDAR_ENTITY_ID]
+
+    for calendar_entity_id in calendar_entity_ids:
+        try:
+            _ = er.async_validate_entity_id(entity_registry, calendar_entity_id)
+        except vol.Invalid:
+            LOGGER.error(
+                "Failed to setup calendar_event for unknown entity %s",
+                calendar_entity_id,
+            )
+
+            return False
+
+    for calendar_entity_id in calendar_entity_ids:
+        entry.async_on_unload(
+            async_handle_source_entity_changes(
+                hass,
+                helper_config_entry_id=entry.entry_id,
+                set_source_entity_id_or_uuid=partial(
+                    _async_replace_calendar, hass, entry, calendar_entity_id
+                ),
+                source_device_id=None,
+                source_entity_id_or_uuid=calendar_entity_id,
+                source_entity_removed=partial(
+                    _async_remove_calendar, hass, entry, calendar_entity_id
+                ),
+            )
         )
 
-        return False
+    # Helpers evaluate against the persisted events until calendars are available
+    await async_get_event_cache(hass).async_load()
 
-    def set_source_entity_id_or_uuid(source_entity_id: str) -> None:
-        hass.config_entries.async_update_entry(
-            entry,
-            options={**entry.options, CONF_CALENDAR_ENTITY_ID: source_entity_id},
-        )
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    async def source_entity_removed() -> None:
-        # The source entity has been removed, remove the config entry.
-        await hass.config_entries.async_remove(entry.entry_id)
+    entry.async_on_unload(entry.add_update_listener(config_entry_update_listener))
 
-    entry.async_on_unload(
-        async_handle_source_entity_changes(
-            hass,
-            helper_config_entry_id=entry.entry_id,
-            set_source_entity_id_or_uuid=set_source_entity_id_or_uuid,
-            source_device_id=None,
-            source_entity_id_or_uuid=entry.options[CONF_CALENDAR_ENTITY_ID],
-            source_entity_removed=source_entity_removed,
-        )
+    return True
+
+
+@callback
+def _async_replace_calendar(
+    hass: HomeAssistant, entry: ConfigEntry, old_entity_id: str, new_entity_id: str
+) -> None:
+    """Point the helper at a calendar whose entity id has changed."""
+    hass.config_entries.async_update_entry(
+        entry,
+        options={
+            **entry.options,
+            CONF_CALENDAR_ENTITY_ID: [
+                new_entity_id if entity_id == old_entity_id else entity_id
+                for entity_id in entry.options[CONF_CALENDAR_ENTITY_ID]
+            ],
+        },
     )
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    entry.async_on_unload(entry.add_update_listener(config_entry_update_listener))
+async def _async_remove_calendar(
+    hass: HomeAssistant, entry: ConfigEntry, removed_entity_id: str
+) -> None:
+    """Drop a removed calendar, removing the helper once none are left."""
+    remaining = [
+        entity_id
+        for entity_id in entry.options[CONF_CALENDAR_ENTITY_ID]
+        if entity_id != removed_entity_id
+    ]
+    if not remaining:
+        await hass.config_entries.async_remove(entry.entry_id)
+        return
 
-    return True
+    hass.config_entries.async_update_entry(
+        entry, options={**entry.options, CONF_CALENDAR_ENTITY_ID: remaining}
+    )
 
 
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
@@ -109,6 +167,19 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
             version=2,
         )
 
+    if config_entry.version < 3:
+        options = dict(config_entry.options)
+
+        # Helpers can now watch several calendars
+        if isinstance(options.get(CONF_CALENDAR_ENTITY_ID), str):
+            options[CONF_CALENDAR_ENTITY_ID] = [options[CONF_CALENDAR_ENTITY_ID]]
+
+        hass.config_entries.async_update_entry(
+            config_entry,
+            options=options,
+            version=3,
+        )
+
     return True
 
 
@@ -120,4 +191,9 @@ async def config_entry_update_listener(hass: HomeAssistant, entry: ConfigEntry)
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
 
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+    if unload_ok and not hass.config_entries.async_loaded_entries(DOMAIN):
+        await async_get_event_cache(hass).async_unload()
+
+    return unload_ok
@@ -2,29 +2,101 @@
 
 from __future__ import annotations
 
+import asyncio
 from asyncio import Task, TimerHandle
-from datetime import timedelta
+from collections import deque
+from collections.abc import Collection
+from functools import cached_property
+from time import perf_counter
+from typing import Any
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EVENT_STATE_CHANGED
-from homeassistant.core import Event, HomeAssistant, callback
-from homeassistant.exceptions import HomeAssistantError
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    STATE_ON,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+)
+from homeassistant.core import (
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
-from homeassistant.helpers.event import async_track_entity_registry_updated_event
+from homeassistant.helpers.event import (
+    async_track_entity_registry_updated_event,
+    async_track_state_change_event,
+)
+from homeassistant.helpers.restore_state import ExtraStoredData, RestoreEntity
 from homeassistant.util import dt as dt_util
-from homeassistant.util.dt import utcnow
 
+from .cache import CalendarEventCache, async_get_event_cache
+from .clock import Clock, async_get_clock
 from .const import (
+    ATTR_CALENDAR,
+    ATTR_CONFIG_ENTRY_ID,
     ATTR_DESCRIPTION,
     ATTR_LOCATION,
     ATTR_SUMMARY,
+    CACHE_MAX_AGE,
+    CACHE_WINDOW,
     CONF_CALENDAR_ENTITY_ID,
     CONF_COMPARISON_METHOD,
     CONF_MATCH,
     CONF_MATCH_ATTRIBUTE,
+    CONF_NORMALIZE,
+    CONF_REFRESH_CLASS,
+    EVENT_MATCH_ENDED,
+    EVENT_MATCH_STARTED,
+    EXECUTOR_MATCH_COST,
+    FETCH_RETRY_INTERVAL,
+    RECENT_EVALUATIONS,
+    REFRESH_BOUNDARY_ONLY,
+    REFRESH_NORMAL,
+    REFRESH_REALTIME,
+    REFRESH_RELAXED,
+)
+from .matcher import EventMatcher
+from .models import CachedVerdict, CalendarEventRecord, CalendarSnapshot
+from .profiling import (
+    DRIFT_SCHEDULE_UPDATE,
+    DRIFT_UPDATE_STATE,
+    STAGE_MATCHING,
+    STAGE_STATE_LOOKUP,
+    STAGE_STATE_WRITE,
+    TimerDriftMonitor,
+    UpdateProfiler,
+    async_get_profiler,
+    async_get_timer_drift,
+)
+
+CHANGE_STATE = "state"
+CHANGE_EVENT = "event"
+CHANGE_METADATA = "metadata"
+
+# Calendar attributes describing the event in progress or the next one
+_CALENDAR_EVENT_ATTRIBUTES = (
+    "message",
+    "all_day",
+    "start_time",
+    "end_time",
+    ATTR_DESCRIPTION,
+    ATTR_LOCATION,
 )
 
+# Seconds between checks while a calendar is on and how old the events they
+# use may be, by refresh class. None checks only as events start or end, and
+# uses the calendar's adaptive refresh interval respectively.
+_REFRESH_POLICIES: dict[str, tuple[int | None, float | None]] = {
+    REFRESH_REALTIME: (CACHE_MAX_AGE, CACHE_MAX_AGE),
+    REFRESH_NORMAL: (60, None),
+    REFRESH_RELAXED: (60 * 60, None),
+    REFRESH_BOUNDARY_ONLY: (None, CACHE_WINDOW),
+}
+
 
 async def config_entry_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Update listener, called when the config entry options are changed."""
@@ -39,12 +111,14 @@ async def async_setup_entry(
     """Initialize Calendar Event config entry."""
 
     name: str | None = config_entry.options.get("name")
-    calendar_entity: str = config_entry.options[CONF_CALENDAR_ENTITY_ID]
+    calendar_entity_ids: list[str] = config_entry.options[CONF_CALENDAR_ENTITY_ID]
     match: str = config_entry.options[CONF_MATCH]
     match_attribute: str = config_entry.options.get(CONF_MATCH_ATTRIBUTE, "summary")
     comparison_method: str = config_entry.options.get(
         CONF_COMPARISON_METHOD, "contains"
     )
+    normalize: bool = config_entry.options.get(CONF_NORMALIZE, False)
+    refresh_class: str = config_entry.options.get(CONF_REFRESH_CLASS, REFRESH_NORMAL)
     unique_id = config_entry.entry_id
 
     config_entry.async_on_unload(
@@ -58,16 +132,72 @@ async def async_setup_entry(
                 config_entry,
                 name,
                 unique_id,
-                calendar_entity,
+                calendar_entity_ids,
                 match,
                 match_attribute,
                 comparison_method,
+                normalize=normalize,
+                refresh_class=refresh_class,
             )
         ]
     )
 
 
-class CalendarEventBinarySensor(BinarySensorEntity):
+class MatchedEventsData(ExtraStoredData):
+    """The matching events in progress a helper fired match_started for."""
+
+    def __init__(self, events: frozenset[CalendarEventRecord]) -> None:
+        """Initialize the stored events."""
+        self.events = events
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the events to store."""
+        return {
+            "events": [
+                [
+                    event.calendar_entity_id,
+                    event.start,
+                    event.end,
+                    event.summary,
+                    event.description,
+                    event.location,
+                    event.all_day,
+                ]
+                for event in self.events
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, restored: dict[str, Any]) -> MatchedEventsData:
+        """Return the stored events, none if they are not valid."""
+        try:
+            return cls(
+                frozenset(
+                    CalendarEventRecord.create(
+                        str(calendar_entity_id),
+                        float(start),
+                        float(end),
+                        str(summary),
+                        str(description),
+                        str(location),
+                        all_day=bool(all_day),
+                    )
+                    for (
+                        calendar_entity_id,
+                        start,
+                        end,
+                        summary,
+                        description,
+                        location,
+                        all_day,
+                    ) in restored["events"]
+                )
+            )
+        except (KeyError, TypeError, ValueError):
+            return cls(frozenset())
+
+
+class CalendarEventBinarySensor(BinarySensorEntity, RestoreEntity):
     """Representation of a Calendar Event sensor."""
 
     _attr_should_poll = False
@@ -78,6 +208,7 @@ class CalendarEventBinarySensor(BinarySensorEntity):
 
     _unrecorded_attributes = frozenset(
         {
+            ATTR_CALENDAR,
             ATTR_SUMMARY,
             ATTR_DESCRIPTION,
             ATTR_LOCATION,
@@ -90,33 +221,89 @@ class CalendarEventBinarySensor(BinarySensorEntity):
         config_entry: ConfigEntry,
         name: str | None,
         unique_id: str | None,
-        calendar_entity_id: str,
+        calendar_entity_ids: list[str],
         match: str,
         match_attribute: str,
         comparison_method: str,
+        *,
+        normalize: bool = False,
+        refresh_class: str = REFRESH_NORMAL,
     ) -> None:
         """Initialize the Calendar Event sensor."""
         self._attr_unique_id = unique_id
         self._attr_name = name
-        self._calendar_entity_id = calendar_entity_id
-        self._match = match
-        self._match_attribute = match_attribute
-        self._comparison_method = comparison_method
+        self._calendar_entity_ids = calendar_entity_ids
+        self._matcher = EventMatcher(
+            match, match_attribute, comparison_method, normalize=normalize
+        )
         self._hass = hass
         self._config_entry = config_entry
+        self._check_interval, self._max_age = _REFRESH_POLICIES[refresh_class]
 
         self._attr_is_on = False
         self._attr_extra_state_attributes = {}
         self._call_later_handle: TimerHandle | None = None
+        self._wakeup: float | None = None
         self._update_task: Task | None = None
+        self._refresh_after: float | None = None
+        self._verdict: CachedVerdict | None = None
+        self._matched_events: frozenset[CalendarEventRecord] = frozenset()
+        # Whether an active calendar couldn't be fetched in the last update
+        self._fetch_failed = False
+        # Matching events of each calendar and the fingerprint they were built from
+        self._matching: dict[str, tuple[int, set[CalendarEventRecord]]] = {}
+        # When the latest updates ran and how many seconds they took
+        self._evaluations: deque[tuple[float, float]] = deque(maxlen=RECENT_EVALUATIONS)
+
+    @property
+    def calendar_entity_ids(self) -> list[str]:
+        """Return the monitored calendars."""
+        return self._calendar_entity_ids
+
+    @property
+    def matcher(self) -> EventMatcher:
+        """Return the compiled match criteria."""
+        return self._matcher
+
+    @cached_property
+    def _profiler(self) -> UpdateProfiler:
+        """Return the profiler shared by every helper."""
+        return async_get_profiler(self._hass)
+
+    @cached_property
+    def _clock(self) -> Clock:
+        """Return the clock of the integration."""
+        return async_get_clock(self._hass)
+
+    @cached_property
+    def _cache(self) -> CalendarEventCache:
+        """Return the event cache shared by every helper."""
+        return async_get_event_cache(self._hass)
+
+    @cached_property
+    def _timer_drift(self) -> TimerDriftMonitor:
+        """Return the timer drift monitor shared by every helper."""
+        return async_get_timer_drift(self._hass)
+
+    @property
+    def extra_restore_state_data(self) -> MatchedEventsData:
+        """Return the matches in progress, not to fire them again once reloaded."""
+        return MatchedEventsData(self._matched_events)
 
     async def async_added_to_hass(self) -> None:
         """Handle added to Hass."""
         await super().async_added_to_hass()
 
-        # Add state listener for the calendar entity
+        if (restored := await self.async_get_last_extra_data()) is not None:
+            self._matched_events = MatchedEventsData.from_dict(
+                restored.as_dict()
+            ).events
+
+        # Add state listener for the calendar entities
         self.async_on_remove(
-            self._hass.bus.async_listen(EVENT_STATE_CHANGED, self._state_changed)  # type: ignore[arg-type]
+            async_track_state_change_event(
+                self._hass, self._calendar_entity_ids, self._state_changed
+            )
         )
 
         # Track entity registry updates to detect when entity is disabled/enabled
@@ -143,6 +330,7 @@ class CalendarEventBinarySensor(BinarySensorEntity):
         if self._call_later_handle is not None:
             self._call_later_handle.cancel()
             self._call_later_handle = None
+        self._wakeup = None
 
     def _cancel_update_task(self) -> None:
         """Cancel any in-progress update task."""
@@ -152,9 +340,62 @@ class CalendarEventBinarySensor(BinarySensorEntity):
 
     def _schedule_update(self) -> None:
         """Cancel any pending update and schedule a fresh one."""
+        wakeup = self._wakeup
         self._cancel_call_later()
         self._cancel_update_task()
-        self._update_task = self._hass.async_create_task(self._update_state())
+        if wakeup is not None and (now := self._clock.monotonic()) >= wakeup:
+            self._timer_drift.async_record(DRIFT_SCHEDULE_UPDATE, now - wakeup)
+        else:
+            wakeup = None
+        self._update_task = self._hass.async_create_task(self._update_state(wakeup))
+
+    @callback
+    def async_diagnostics(self) -> dict[str, Any]:
+        """Return the criteria, schedule and latest updates of the helper."""
+        wakeup = None
+        if self._wakeup is not None:
+            wakeup = dt_util.utc_from_timestamp(
+                self._clock.timestamp() + self._wakeup - self._clock.monotonic()
+            ).isoformat()
+        update_task = None
+        if self._update_task is not None:
+            update_task = "done" if self._update_task.done() else "running"
+        verdict = None
+        if self._verdict is not None:
+            verdict = {
+                "fingerprints": dict(self._verdict.fingerprints),
+                "valid_until": dt_util.utc_from_timestamp(
+                    self._verdict.valid_until
+                ).isoformat(),
+                "event": self._verdict.event.as_dict()
+                if self._verdict.event is not None
+                else None,
+                "in_progress": len(self._verdict.in_progress),
+            }
+        return {
+            "entity_id": self.entity_id,
+            "is_on": self._attr_is_on,
+            "calendars": self._calendar_entity_ids,
+            "matcher": self._matcher.as_dict(),
+            "check_interval": self._check_interval,
+            "max_age": self._max_age,
+            "next_wakeup": wakeup,
+            "update_task": update_task,
+            "verdict": verdict,
+            "evaluations": [
+                {
+                    "at": dt_util.utc_from_timestamp(at).isoformat(),
+                    "duration_ms": round(duration * 1000, 3),
+                }
+                for at, duration in self._evaluations
+            ],
+        }
+
+    async def async_refresh(self) -> None:
+        """Update the helper now, waiting for the update to finish."""
+        self._schedule_update()
+        if self._update_task is not None:
+            await asyncio.wait([self._update_task])
 
     async def async_will_remove_from_hass(self) -> None:
         """Handle entity removal."""
@@ -163,37 +404,93 @@ class CalendarEventBinarySensor(BinarySensorEntity):
         await super().async_will_remove_from_hass()
 
     @callback
-    def _state_changed(self, event: Event) -> None:
-        """Handle calendar entity state changes."""
-        if event.data.get("entity_id") == self._calendar_entity_id:
-            # Only update state if the entity is enabled
-            if self.enabled:
-                self._schedule_update()
-            else:
-                # Cancel any pending timers and tasks if disabled
-                self._cancel_call_later()
-                self._cancel_update_task()
-
-    async def _update_state(self) -> None:
-        """Update the binary sensor state based on calendar events."""
+    def _state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Handle calendar entity state changes.
+
+        Changes that only touch other attributes than the calendar's event
+        can't change the result and are ignored. The events are only fetched
+        again when the cached events don't explain the change, either way the
+        calendar is refreshed at the usual rate again while it is changing.
+        """
+        calendar_entity_id = event.data.get("entity_id")
+        if calendar_entity_id not in self._calendar_entity_ids:
+            return
 
-        # Don't update if the entity is disabled
+        # Only update state if the entity is enabled
         if not self.enabled:
+            # Cancel any pending timers and tasks if disabled
             self._cancel_call_later()
+            self._cancel_update_task()
+            return
+
+        new_state = event.data["new_state"]
+        change = classify_state_change(event.data["old_state"], new_state)
+        if change == CHANGE_METADATA:
             return
+        self._cache.async_reset_max_age(calendar_entity_id)
+        if not self._cache_explains(calendar_entity_id, new_state):
+            # Events fetched before the calendar changed may be outdated
+            self._refresh_after = self._clock.timestamp()
+        self._schedule_update()
+
+    def _cache_explains(self, calendar_entity_id: str, state: State | None) -> bool:
+        """Check if the cached events agree with a calendar's new state.
+
+        A calendar that is no longer on needs no new events. One that is on
+        should be showing an event in progress that is already cached.
+        """
+        if state is None or state.state != STATE_ON:
+            return True
+        snapshot = self._cache.async_get_cached(calendar_entity_id)
+        summary = state.attributes.get("message")
+        if snapshot is None or summary is None:
+            return False
+        description = state.attributes.get(ATTR_DESCRIPTION)
+        location = state.attributes.get(ATTR_LOCATION)
+        now = self._clock.timestamp()
+        return any(
+            event.start <= now < event.end
+            and event.summary == summary
+            and (description is None or event.description == description)
+            and (location is None or event.location == location)
+            for event in snapshot.events
+        )
 
-        calendar_state = self._hass.states.get(self._calendar_entity_id)
+    async def _update_state(self, wakeup: float | None = None) -> None:
+        """Update the binary sensor state based on calendar events.
+
+        wakeup is the loop time the update was due when run by the timer.
+        """
+        if wakeup is not None:
+            self._timer_drift.async_record(
+                DRIFT_UPDATE_STATE, self._clock.monotonic() - wakeup
+            )
+        started = perf_counter()
+        with self._profiler.evaluation():
+            await self._async_evaluate()
+        self._evaluations.append((self._clock.timestamp(), perf_counter() - started))
 
-        if calendar_state is None or calendar_state.state == "off":
+    async def _async_evaluate(self) -> None:
+        """Evaluate the criteria against the current calendar events."""
+
+        # Don't update if the entity is disabled
+        if not self.enabled:
+            self._cancel_call_later()
+            return
+
+        if not self._active_calendar_entity_ids():
             self._attr_is_on = False
             self._attr_extra_state_attributes.update(
                 {
+                    ATTR_CALENDAR: "",
                     ATTR_SUMMARY: "",
                     ATTR_DESCRIPTION: "",
                     ATTR_LOCATION: "",
                 }
             )
-            self.async_write_ha_state()
+            with self._profiler.stage(STAGE_STATE_WRITE):
+                self.async_write_ha_state()
+            self._async_fire_match_events(frozenset())
             return
 
         event = await self._get_event_matching_summary()
@@ -201,130 +498,273 @@ class CalendarEventBinarySensor(BinarySensorEntity):
             self._attr_is_on = True
             self._attr_extra_state_attributes.update(
                 {
-                    ATTR_SUMMARY: event.get("summary", ""),
-                    ATTR_DESCRIPTION: event.get("description", ""),
-                    ATTR_LOCATION: event.get("location", ""),
+                    ATTR_CALENDAR: event.calendar_entity_id,
+                    ATTR_SUMMARY: event.summary,
+                    ATTR_DESCRIPTION: event.description,
+                    ATTR_LOCATION: event.location,
                 }
             )
         else:
             self._attr_is_on = False
             self._attr_extra_state_attributes.update(
                 {
+                    ATTR_CALENDAR: "",
                     ATTR_SUMMARY: "",
                     ATTR_DESCRIPTION: "",
                     ATTR_LOCATION: "",
                 }
             )
 
-        self.async_write_ha_state()
+        with self._profiler.stage(STAGE_STATE_WRITE):
+            self.async_write_ha_state()
+        self._async_fire_match_events(
+            self._verdict.in_progress if self._verdict is not None else frozenset()
+        )
 
         self._cancel_call_later()
 
-        # Re-read calendar state after the await to avoid scheduling based on stale data
-        current_calendar_state = self._hass.states.get(self._calendar_entity_id)
-        # Schedule next update only if calendar is still on and entity is enabled
-        if (
-            current_calendar_state is not None
-            and current_calendar_state.state == "on"
-            and self.enabled
-        ):
-            now = utcnow()
-            seconds_until_next_minute = 60 - now.second
-            self._call_later_handle = self._hass.loop.call_later(
-                seconds_until_next_minute,
+        # Re-read calendar states after the await to avoid scheduling based on stale data
+        # Schedule next update only if a calendar is still on and entity is enabled
+        if self._active_calendar_entity_ids() and self.enabled:
+            now = self._clock.timestamp()
+            delay: float | None = None
+            if (interval := self._check_interval) is not None:
+                delay = interval - int(now) % interval
+            # Wake up right as a cached event starts or ends
+            if self._verdict is not None:
+                until_boundary = self._verdict.valid_until - now
+                if until_boundary > 0 and (delay is None or until_boundary < delay):
+                    delay = until_boundary
+            # Try a calendar that couldn't be fetched again soon
+            if self._fetch_failed:
+                retry = FETCH_RETRY_INTERVAL - int(now) % FETCH_RETRY_INTERVAL
+                if delay is None or retry < delay:
+                    delay = retry
+            if delay is None:
+                return
+            self._wakeup = self._clock.monotonic() + delay
+            self._call_later_handle = self._clock.call_later(
+                delay,
                 self._schedule_update,
             )
 
-    def _matches_criteria(self, event_field: str) -> bool:
-        """Check if event summary matches the configured criteria."""
-        event_field_lower = event_field.casefold()
-        match_lower = self._match.casefold()
-
-        if self._comparison_method == "contains":
-            return match_lower in event_field_lower
-        if self._comparison_method == "starts_with":
-            return event_field_lower.startswith(match_lower)
-        if self._comparison_method == "ends_with":
-            return event_field_lower.endswith(match_lower)
-        if self._comparison_method == "exactly":
-            return event_field_lower == match_lower
-        # Default to contains if unknown criteria
-        return match_lower in event_field_lower
-
-    async def _get_event_matching_summary(self) -> dict | None:  # noqa: PLR0911, PLR0912
-        """Check if the summary is in the calendar events."""
-
-        # Fetch all events for the calendar entity using the get_events service
-        now = utcnow()
-        end_date_time = (now + timedelta(hours=1)).isoformat()
+    @callback
+    def _async_fire_match_events(
+        self, in_progress: frozenset[CalendarEventRecord]
+    ) -> None:
+        """Fire events for each matching event that ended or started.
 
-        try:
-            events = await self._hass.services.async_call(
-                "calendar",
-                "get_events",
-                {
-                    "entity_id": self._calendar_entity_id,
-                    "end_date_time": end_date_time,
-                },
-                blocking=True,
-                return_response=True,
+        Overlapping matches each start and end at their own boundary.
+        """
+        previous = self._matched_events
+        if in_progress == previous:
+            return
+        self._matched_events = in_progress
+        for event in sorted(previous - in_progress, key=_event_order):
+            self._hass.bus.async_fire(EVENT_MATCH_ENDED, self._match_event_data(event))
+        for event in sorted(in_progress - previous, key=_event_order):
+            self._hass.bus.async_fire(
+                EVENT_MATCH_STARTED, self._match_event_data(event)
             )
-        except HomeAssistantError:
-            # The service call can fail when the calendar is not available
-            return None
-
-        if not isinstance(events, dict):
-            return None
-
-        calendar_data = events.get(self._calendar_entity_id, {})
-        if not isinstance(calendar_data, dict):
-            return None
-
-        calendar_events = calendar_data.get("events", [])
-        if not isinstance(calendar_events, list):
-            return None
-
-        for event in calendar_events:
-            if not isinstance(event, dict):
-                continue
-            start = event.get("start")
-            if not isinstance(start, str):
-                continue
-            try:
-                start_dt = dt_util.parse_datetime(start)
-                if start_dt is None:
-                    continue
-                start_dt = dt_util.as_utc(start_dt)
-            except (ValueError, TypeError):
-                continue
-            if start_dt <= utcnow():
-                summary = event.get("summary")
-                description = event.get("description")
-                location = event.get("location")
-
-                if self._match_attribute == "any":
-                    if any(
-                        self._matches_criteria(attr)
-                        for attr in [summary, description, location]
-                        if isinstance(attr, str)
-                    ):
-                        return event
-                elif (
-                    (
-                        self._match_attribute == "summary"
-                        and isinstance(summary, str)
-                        and self._matches_criteria(summary)
-                    )
-                    or (
-                        self._match_attribute == "description"
-                        and isinstance(description, str)
-                        and self._matches_criteria(description)
-                    )
-                    or (
-                        self._match_attribute == "location"
-                        and isinstance(location, str)
-                        and self._matches_criteria(location)
-                    )
+
+    def _match_event_data(self, event: CalendarEventRecord) -> dict[str, Any]:
+        """Return the data of a match started or ended event."""
+        return {
+            ATTR_ENTITY_ID: self.entity_id,
+            ATTR_CONFIG_ENTRY_ID: self.unique_id,
+            **event.as_dict(),
+        }
+
+    def _active_calendar_entity_ids(self) -> list[str]:
+        """Return the monitored calendars that currently have an event in progress.
+
+        A calendar that isn't available yet, such as a remote calendar after a
+        restart, is included while its last known events are cached.
+        """
+        active: list[str] = []
+        with self._profiler.stage(STAGE_STATE_LOOKUP):
+            for calendar_entity_id in self._calendar_entity_ids:
+                calendar_state = self._hass.states.get(calendar_entity_id)
+                if calendar_state is None or calendar_state.state in (
+                    STATE_UNAVAILABLE,
+                    STATE_UNKNOWN,
                 ):
-                    return event
-        return None
+                    if self._cache.async_get_cached(calendar_entity_id) is not None:
+                        active.append(calendar_entity_id)
+                elif calendar_state.state == "on":
+                    active.append(calendar_entity_id)
+        return active
+
+    async def _get_event_matching_summary(self) -> CalendarEventRecord | None:
+        """Return the first matching event across the active calendars.
+
+        Calendars are fetched concurrently through the shared event cache, a
+        calendar that can't be fetched is skipped so the others still produce a
+        result. The previous result is reused while the fetched events are
+        unchanged and no event has started or ended since. Large batches of
+        events are matched in the executor so they don't hold up the loop.
+        """
+        snapshots = await asyncio.gather(
+            *(
+                self._cache.async_get_snapshot(
+                    calendar_entity_id,
+                    max_age=self._max_age,
+                    refresh_after=self._refresh_after,
+                )
+                for calendar_entity_id in self._active_calendar_entity_ids()
+            )
+        )
+
+        available = [snapshot for snapshot in snapshots if snapshot is not None]
+        self._fetch_failed = len(available) < len(snapshots)
+        offloaded = await self._async_match_in_executor(available)
+
+        now = self._clock.timestamp()
+        with self._profiler.stage(STAGE_MATCHING):
+            fingerprints = tuple(
+                (snapshot.calendar_entity_id, snapshot.fingerprint)
+                for snapshot in available
+            )
+            verdict = self._verdict
+            if (
+                verdict is not None
+                and verdict.fingerprints == fingerprints
+                and now < verdict.valid_until
+            ):
+                return verdict.event
+
+            in_progress = self._find_in_progress(available, now, offloaded)
+            event = _first_event(available, in_progress)
+            self._verdict = CachedVerdict(
+                fingerprints,
+                min(
+                    (snapshot.next_boundary(now) for snapshot in available),
+                    default=now,
+                ),
+                event,
+                in_progress,
+            )
+        return event
+
+    async def _async_match_in_executor(
+        self, snapshots: list[CalendarSnapshot]
+    ) -> dict[str, frozenset[CalendarEventRecord]]:
+        """Match the events of calendars too costly to match on the loop.
+
+        Returns the matching events among each such calendar's unmatched
+        events, the other calendars are left to be matched on the loop.
+        """
+        batches = {
+            snapshot.calendar_entity_id: events
+            for snapshot in snapshots
+            if self._matcher.cost(events := self._unmatched_events(snapshot))
+            > EXECUTOR_MATCH_COST
+        }
+        if not batches:
+            return {}
+        results = await asyncio.gather(
+            *(
+                self._hass.async_add_executor_job(self._matcher.matching, events)
+                for events in batches.values()
+            )
+        )
+        return dict(zip(batches, results, strict=True))
+
+    def _find_in_progress(
+        self,
+        snapshots: list[CalendarSnapshot],
+        now: float,
+        offloaded: dict[str, frozenset[CalendarEventRecord]] | None = None,
+    ) -> frozenset[CalendarEventRecord]:
+        """Return the matching events in progress in any of the calendars.
+
+        offloaded holds the events already matched in the executor.
+        """
+        offloaded = offloaded or {}
+        return frozenset(
+            event
+            for snapshot in snapshots
+            for event in self._matching_events(
+                snapshot, offloaded.get(snapshot.calendar_entity_id)
+            )
+            if event.start <= now < event.end
+        )
+
+    def _unmatched_events(
+        self, snapshot: CalendarSnapshot
+    ) -> Collection[CalendarEventRecord]:
+        """Return the events of a snapshot the matching set doesn't cover yet."""
+        synced = self._matching.get(snapshot.calendar_entity_id)
+        if synced is not None and synced[0] == snapshot.fingerprint:
+            return ()
+        delta = snapshot.delta
+        if synced is not None and delta is not None and synced[0] == delta.previous:
+            return delta.added
+        return snapshot.events
+
+    def _matching_events(
+        self,
+        snapshot: CalendarSnapshot,
+        matched: frozenset[CalendarEventRecord] | None = None,
+    ) -> set[CalendarEventRecord]:
+        """Return the events of a snapshot that match the criteria.
+
+        The set is kept per calendar and updated from the snapshot's changes
+        when it replaced the one the set was built from, otherwise every event
+        is matched again. matched holds the matching unmatched events when
+        they were already matched in the executor.
+        """
+        calendar_entity_id = snapshot.calendar_entity_id
+        synced = self._matching.get(calendar_entity_id)
+        if synced is not None and synced[0] == snapshot.fingerprint:
+            return synced[1]
+
+        if matched is None:
+            matched = self._matcher.matching(self._unmatched_events(snapshot))
+        delta = snapshot.delta
+        if synced is not None and delta is not None and synced[0] == delta.previous:
+            matching = synced[1]
+            matching.difference_update(delta.removed)
+            matching.update(matched)
+        else:
+            matching = set(matched)
+        self._matching[calendar_entity_id] = (snapshot.fingerprint, matching)
+        return matching
+
+
+def classify_state_change(old_state: State | None, new_state: State | None) -> str:
+    """Return what a calendar state change changed.
+
+    CHANGE_STATE when the calendar turned on, off or unavailable, CHANGE_EVENT
+    when the event it shows changed and CHANGE_METADATA for anything else.
+    """
+    if old_state is None or new_state is None or old_state.state != new_state.state:
+        return CHANGE_STATE
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+    if any(
+        old_attributes.get(attribute) != new_attributes.get(attribute)
+        for attribute in _CALENDAR_EVENT_ATTRIBUTES
+    ):
+        return CHANGE_EVENT
+    return CHANGE_METADATA
+
+
+def _first_event(
+    snapshots: list[CalendarSnapshot], in_progress: frozenset[CalendarEventRecord]
+) -> CalendarEventRecord | None:
+    """Return the earliest event in progress of the first calendar having one."""
+    for snapshot in snapshots:
+        events = [
+            event
+            for event in in_progress
+            if event.calendar_entity_id == snapshot.calendar_entity_id
+        ]
+        if events:
+            return min(events, key=_event_order)
+    return None
+
+
+def _event_order(event: CalendarEventRecord) -> tuple[float, float, str]:
+    """Return the sort key choosing between simultaneous events."""
+    return (event.start, event.end, event.summary)
@@ -0,0 +1,506 @@
+"""Shared calendar event cache for calendar_event."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.singleton import singleton
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .clock import async_get_clock
+from .const import (
+    CACHE_MAX_AGE,
+    CACHE_MAX_AGE_CEILING,
+    CACHE_MAX_AGE_GROWTH,
+    CACHE_WINDOW,
+    CONF_CALENDAR_ENTITY_ID,
+    DOMAIN,
+    FETCH_TIMEOUT,
+    LOGGER,
+    RANGE_FETCH_TIMEOUT,
+    STORAGE_KEY,
+    STORAGE_MAX_AGE,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .limiter import PRIORITY_HIGH, PRIORITY_PERIODIC, async_get_fetch_limiter
+from .models import CalendarEventRecord, CalendarSnapshot
+from .profiling import (
+    STAGE_PARSING,
+    STAGE_SERVICE_CALL,
+    STAGE_VALIDATION,
+    async_get_profiler,
+)
+from .recording import async_get_recorder
+
+DATA_EVENT_CACHE: HassKey[CalendarEventCache] = HassKey(f"{DOMAIN}_event_cache")
+
+
+@callback
+@singleton(DATA_EVENT_CACHE)
+def async_get_event_cache(hass: HomeAssistant) -> CalendarEventCache:
+    """Return the event cache shared by every helper."""
+    return CalendarEventCache(hass)
+
+
+class CalendarEventCache:
+    """Cache of upcoming events per calendar.
+
+    Every helper watching a calendar reads the same snapshot, and concurrent
+    requests for a calendar share a single calendar.get_events call. Each
+    refreshed snapshot records the events added and removed since the previous
+    one so helpers only need to match the changes.
+
+    A calendar is refreshed less often while its periodic refreshes keep
+    returning the same events, as remote calendars only sync every so often,
+    and every CACHE_MAX_AGE seconds again once its events or state change.
+
+    Snapshots are persisted so helpers can evaluate straight after a restart,
+    before slow calendars are available. The last snapshot of a calendar is
+    used for as long as it covers the current time whenever a fetch fails.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self._hass = hass
+        self._clock = async_get_clock(hass)
+        self._profiler = async_get_profiler(hass)
+        self._recorder = async_get_recorder(hass)
+        self._limiter = async_get_fetch_limiter(hass)
+        self._snapshots: dict[str, CalendarSnapshot] = {}
+        self._pending: dict[
+            str, tuple[float, asyncio.Task[CalendarSnapshot | None]]
+        ] = {}
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._load_task: asyncio.Task[None] | None = None
+        # When each calendar was last persisted and its fingerprint at the time
+        self._saved: dict[str, tuple[float, int]] = {}
+        self._save_pending = False
+        # How old a calendar's snapshot may get, for calendars refreshed slower
+        self._max_ages: dict[str, float] = {}
+        self._listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        # When each calendar was last fetched and how many seconds it took
+        self._fetches: dict[str, tuple[float, float]] = {}
+
+    async def async_load(self) -> None:
+        """Restore the persisted snapshots, once."""
+        if self._load_task is None:
+            self._load_task = self._hass.async_create_task(
+                self._async_load(), f"{DOMAIN} load event cache"
+            )
+        await self._load_task
+
+    async def _async_load(self) -> None:
+        """Restore the persisted snapshots of calendars not yet fetched."""
+        data = await self._store.async_load()
+        if not isinstance(data, dict):
+            return
+        for calendar_entity_id, stored in data.items():
+            snapshot = _restore_snapshot(calendar_entity_id, stored)
+            if snapshot is None or calendar_entity_id in self._snapshots:
+                continue
+            self._snapshots[calendar_entity_id] = snapshot
+            self._saved[calendar_entity_id] = (
+                snapshot.fetched_at,
+                snapshot.fingerprint,
+            )
+
+    @callback
+    def async_add_listener(
+        self, calendar_entity_id: str, update_callback: CALLBACK_TYPE
+    ) -> Callable[[], None]:
+        """Call update_callback whenever a calendar's cached events change."""
+        listeners = self._listeners.setdefault(calendar_entity_id, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            """Stop calling update_callback."""
+            listeners.remove(update_callback)
+            if not listeners:
+                self._listeners.pop(calendar_entity_id, None)
+
+        return remove_listener
+
+    @callback
+    def async_get_max_age(self, calendar_entity_id: str) -> float:
+        """Return how long a calendar's snapshot is currently reused."""
+        return self._max_ages.get(calendar_entity_id, CACHE_MAX_AGE)
+
+    @callback
+    def async_reset_max_age(self, calendar_entity_id: str) -> None:
+        """Refresh a calendar every CACHE_MAX_AGE seconds again."""
+        self._max_ages.pop(calendar_entity_id, None)
+
+    @callback
+    def async_get_cached(self, calendar_entity_id: str) -> CalendarSnapshot | None:
+        """Return the cached snapshot for a calendar without fetching."""
+        return self._snapshots.get(calendar_entity_id)
+
+    async def async_get_snapshot(
+        self,
+        calendar_entity_id: str,
+        *,
+        max_age: float | None = None,
+        refresh_after: float | None = None,
+    ) -> CalendarSnapshot | None:
+        """Return the upcoming events for a calendar, fetching them when stale.
+
+        A snapshot older than max_age seconds, the calendar's current refresh
+        interval by default, or fetched before the refresh_after timestamp is
+        refreshed. Returns None if the calendar could not be fetched.
+        """
+        now = self._clock.timestamp()
+        snapshot = self._snapshots.get(calendar_entity_id)
+        if max_age is None:
+            max_age = self.async_get_max_age(calendar_entity_id)
+        if (
+            snapshot is not None
+            and now - snapshot.fetched_at < max_age
+            and (refresh_after is None or snapshot.fetched_at >= refresh_after)
+        ):
+            return snapshot
+
+        # Events a calendar change made outdated are fetched before periodic checks
+        priority = (
+            PRIORITY_HIGH
+            if snapshot is None
+            or (refresh_after is not None and snapshot.fetched_at < refresh_after)
+            else PRIORITY_PERIODIC
+        )
+        pending = self._pending.get(calendar_entity_id)
+        if (
+            pending is None
+            or pending[1].done()
+            or (refresh_after is not None and pending[0] < refresh_after)
+        ):
+            task = self._hass.async_create_background_task(
+                self._async_refresh(calendar_entity_id, now, priority),
+                f"{DOMAIN} fetch {calendar_entity_id}",
+            )
+            pending = (now, task)
+            self._pending[calendar_entity_id] = pending
+            task.add_done_callback(partial(self._async_fetch_done, calendar_entity_id))
+
+        # Shielded so a cancelled helper update doesn't cancel a shared fetch
+        return await asyncio.shield(pending[1])
+
+    async def async_get_events(
+        self, calendar_entity_id: str, start: float, end: float | None = None
+    ) -> list[CalendarEventRecord] | None:
+        """Return the events of a calendar overlapping a time range.
+
+        Served from the cache when the range falls within the cached window,
+        such as the current day of a calendar view, otherwise the range is
+        fetched directly without being cached. A range without an end runs to
+        the end of the cached window, or for CACHE_WINDOW seconds when fetched.
+        """
+        now = self._clock.timestamp()
+        if _window_start(now) <= start and (end is None or end <= now + CACHE_WINDOW):
+            snapshot = await self.async_get_snapshot(calendar_entity_id)
+            if snapshot is not None:
+                window_end = snapshot.end if end is None else end
+                if snapshot.covers(start, window_end):
+                    return snapshot.events_between(start, window_end)
+
+        if end is None:
+            end = start + CACHE_WINDOW
+        fetched = await self._async_fetch(
+            calendar_entity_id, start, end, fetch_timeout=RANGE_FETCH_TIMEOUT
+        )
+        if fetched is None:
+            return None
+        return fetched.events_between(start, end)
+
+    async def async_unload(self) -> None:
+        """Persist pending changes and drop every cached snapshot.
+
+        The persisted snapshots are restored again by the next async_load.
+        """
+        if self._save_pending:
+            await self._store.async_save(self._data_to_save())
+        self._load_task = None
+        self._snapshots.clear()
+        self._saved.clear()
+        self._max_ages.clear()
+        self._fetches.clear()
+
+    @callback
+    def async_diagnostics(self) -> dict[str, Any]:
+        """Return the cached window, refresh interval and last fetch of calendars."""
+        diagnostics: dict[str, Any] = {}
+        for calendar_entity_id in sorted(
+            self._snapshots.keys() | self._fetches.keys() | self._pending.keys()
+        ):
+            snapshot = self._snapshots.get(calendar_entity_id)
+            fetch = self._fetches.get(calendar_entity_id)
+            pending = self._pending.get(calendar_entity_id)
+            diagnostics[calendar_entity_id] = {
+                "window": None
+                if snapshot is None
+                else {
+                    "start": dt_util.utc_from_timestamp(snapshot.start).isoformat(),
+                    "end": dt_util.utc_from_timestamp(snapshot.end).isoformat(),
+                    "fetched_at": dt_util.utc_from_timestamp(
+                        snapshot.fetched_at
+                    ).isoformat(),
+                    "events": len(snapshot.events),
+                    "fingerprint": snapshot.fingerprint,
+                },
+                "max_age": self.async_get_max_age(calendar_entity_id),
+                "last_fetch": None
+                if fetch is None
+                else {
+                    "at": dt_util.utc_from_timestamp(fetch[0]).isoformat(),
+                    "latency_ms": round(fetch[1] * 1000, 3),
+                },
+                "fetch_in_flight": pending is not None and not pending[1].done(),
+                "listeners": len(self._listeners.get(calendar_entity_id, ())),
+            }
+        return diagnostics
+
+    @callback
+    def _async_fetch_done(
+        self, calendar_entity_id: str, task: asyncio.Task[CalendarSnapshot | None]
+    ) -> None:
+        """Forget a finished fetch unless a newer one has replaced it."""
+        pending = self._pending.get(calendar_entity_id)
+        if pending is not None and pending[1] is task:
+            del self._pending[calendar_entity_id]
+
+    async def _async_refresh(
+        self, calendar_entity_id: str, now: float, priority: int
+    ) -> CalendarSnapshot | None:
+        """Fetch the cached window of a calendar.
+
+        A refresh replaced by a newer one while waiting to fetch returns the
+        newer result instead.
+
+        Periodic refreshes returning the same events as before stretch the
+        calendar's refresh interval, any other refresh resets it.
+        """
+        task = asyncio.current_task()
+
+        @callback
+        def superseded() -> bool:
+            """Check if a newer refresh of the calendar was requested."""
+            pending = self._pending.get(calendar_entity_id)
+            return pending is not None and pending[1] is not task
+
+        snapshot = await self._async_fetch(
+            calendar_entity_id,
+            _window_start(now),
+            now + CACHE_WINDOW,
+            priority=priority,
+            is_stale=superseded,
+        )
+        if snapshot is None and superseded():
+            return await self._pending[calendar_entity_id][1]
+
+        previous = self._snapshots.get(calendar_entity_id)
+        if snapshot is None:
+            # Fall back to the last known events while the calendar is failing
+            if previous is not None and previous.end > now:
+                return previous
+            return None
+
+        if (
+            priority == PRIORITY_PERIODIC
+            and previous is not None
+            and previous.fingerprint == snapshot.fingerprint
+        ):
+            self._max_ages[calendar_entity_id] = min(
+                self.async_get_max_age(calendar_entity_id) * CACHE_MAX_AGE_GROWTH,
+                CACHE_MAX_AGE_CEILING,
+            )
+        else:
+            self.async_reset_max_age(calendar_entity_id)
+
+        if previous is not None:
+            snapshot = snapshot.replacing(previous)
+        self._snapshots[calendar_entity_id] = snapshot
+        if previous is None or previous.fingerprint != snapshot.fingerprint:
+            for update_callback in list(self._listeners.get(calendar_entity_id, ())):
+                update_callback()
+
+        saved = self._saved.get(calendar_entity_id)
+        if (
+            saved is None
+            or saved[1] != snapshot.fingerprint
+            or snapshot.fetched_at - saved[0] >= STORAGE_MAX_AGE
+        ):
+            self._saved[calendar_entity_id] = (
+                snapshot.fetched_at,
+                snapshot.fingerprint,
+            )
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+        return snapshot
+
+    async def _async_fetch(
+        self,
+        calendar_entity_id: str,
+        start: float,
+        end: float,
+        *,
+        priority: int = PRIORITY_HIGH,
+        is_stale: Callable[[], bool] | None = None,
+        fetch_timeout: float = FETCH_TIMEOUT,
+    ) -> CalendarSnapshot | None:
+        """Fetch the events of a calendar between start and end.
+
+        The fetch waits for a slot of the fetch limiter, None is returned
+        without fetching if is_stale says it is no longer wanted by then, or
+        if the calendar doesn't answer within fetch_timeout seconds.
+        """
+        profiler = self._profiler
+        start_date_time = dt_util.utc_from_timestamp(start).isoformat()
+        end_date_time = dt_util.utc_from_timestamp(end).isoformat()
+        try:
+            async with self._limiter.async_slot(priority, is_stale) as acquired:
+                if not acquired:
+                    return None
+                fetched_at = self._clock.timestamp()
+                async with asyncio.timeout(fetch_timeout):
+                    with profiler.stage(STAGE_SERVICE_CALL):
+                        response = await self._hass.services.async_call(
+                            "calendar",
+                            "get_events",
+                            {
+                                "entity_id": calendar_entity_id,
+                                "start_date_time": start_date_time,
+                                "end_date_time": end_date_time,
+                            },
+                            blocking=True,
+                            return_response=True,
+                        )
+        except TimeoutError:
+            LOGGER.debug("Timed out fetching events from %s", calendar_entity_id)
+            return None
+        except HomeAssistantError:
+            # The service call can fail when the calendar is not available
+            return None
+        self._fetches[calendar_entity_id] = (
+            fetched_at,
+            self._clock.timestamp() - fetched_at,
+        )
+
+        if self._recorder.recording:
+            self._recorder.async_record(
+                calendar_entity_id, start_date_time, end_date_time, fetched_at, response
+            )
+
+        with profiler.stage(STAGE_VALIDATION):
+            events = _response_events(response, calendar_entity_id)
+        if events is None:
+            return None
+
+        with profiler.stage(STAGE_PARSING):
+            records = (
+                CalendarEventRecord.from_service_event(calendar_entity_id, event)
+                for event in events
+            )
+            return CalendarSnapshot.create(
+                calendar_entity_id,
+                start,
+                end,
+                fetched_at,
+                tuple(record for record in records if record is not None),
+            )
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the snapshots of the calendars helpers monitor to persist."""
+        self._save_pending = False
+        monitored = {
+            calendar_entity_id
+            for entry in self._hass.config_entries.async_entries(
+                DOMAIN, include_disabled=False
+            )
+            for calendar_entity_id in entry.options.get(CONF_CALENDAR_ENTITY_ID, [])
+        }
+        return {
+            calendar_entity_id: {
+                "start": snapshot.start,
+                "end": snapshot.end,
+                "fetched_at": snapshot.fetched_at,
+                "events": [
+                    [
+                        event.start,
+                        event.end,
+                        event.summary,
+                        event.description,
+                        event.location,
+                        event.all_day,
+                    ]
+                    for event in snapshot.events
+                ],
+            }
+            for calendar_entity_id, snapshot in self._snapshots.items()
+            if calendar_entity_id in monitored
+        }
+
+
+def _window_start(now: float) -> float:
+    """Return when the cached window of a calendar fetched at now starts.
+
+    The window starts with the local day, so views of the current day are
+    served from the cache, and always slightly in the past so ranges starting
+    at a "now" read just before the fetch are still covered.
+    """
+    start_of_day = dt_util.start_of_local_day(
+        dt_util.as_local(dt_util.utc_from_timestamp(now))
+    )
+    return min(start_of_day.timestamp(), now - CACHE_MAX_AGE)
+
+
+def _restore_snapshot(calendar_entity_id: str, stored: Any) -> CalendarSnapshot | None:
+    """Return a persisted snapshot, or None if it is not valid."""
+    try:
+        return CalendarSnapshot.create(
+            calendar_entity_id,
+            float(stored["start"]),
+            float(stored["end"]),
+            float(stored["fetched_at"]),
+            tuple(
+                CalendarEventRecord.create(
+                    calendar_entity_id,
+                    float(start),
+                    float(end),
+                    str(summary),
+                    str(description),
+                    str(location),
+                    all_day=bool(all_day and all_day[0]),
+                )
+                # Events stored before the all-day flag have five fields
+                for start, end, summary, description, location, *all_day in stored[
+                    "events"
+                ]
+            ),
+        )
+    except (KeyError, TypeError, ValueError):
+        LOGGER.debug("Ignoring invalid stored events of %s", calendar_entity_id)
+        return None
+
+
+def _response_events(response: Any, calendar_entity_id: str) -> list[Any] | None:
+    """Return the event list of a calendar.get_events response."""
+    if not isinstance(response, dict):
+        return None
+
+    calendar_data = response.get(calendar_entity_id, {})
+    if not isinstance(calendar_data, dict):
+        return None
+
+    calendar_events = calendar_data.get("events", [])
+    if not isinstance(calendar_events, list):
+        return None
+
+    return calendar_events
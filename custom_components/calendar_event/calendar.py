@@ -0,0 +1,189 @@
+"""Calendar platform for calendar_event."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import (
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .cache import async_get_event_cache
+from .clock import async_get_clock
+from .const import CONF_CALENDAR_ENTITY_ID, CONF_FILTERED_CALENDAR, DOMAIN
+from .matcher import EventMatcher
+from .models import CalendarEventRecord
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+) -> None:
+    """Initialize the filtered calendar of a Calendar Event config entry."""
+
+    if not config_entry.options.get(CONF_FILTERED_CALENDAR, False):
+        return
+
+    async_add_entities(
+        [
+            FilteredCalendarEntity(
+                hass,
+                config_entry.options.get("name"),
+                config_entry.entry_id,
+                config_entry.options[CONF_CALENDAR_ENTITY_ID],
+                EventMatcher.from_options(config_entry.options),
+            )
+        ]
+    )
+
+
+class FilteredCalendarEntity(CalendarEntity):
+    """Calendar of the events matching a Calendar Event helper's criteria.
+
+    Events are read from the shared event cache, so showing the calendar on a
+    dashboard doesn't query the source calendars again for the cached window.
+    """
+
+    _attr_should_poll = False
+    _attr_has_entity_name = True
+    _attr_translation_key = "filtered"
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str | None,
+        config_entry_id: str,
+        calendar_entity_ids: list[str],
+        matcher: EventMatcher,
+    ) -> None:
+        """Initialize the filtered calendar."""
+        self._cache = async_get_event_cache(hass)
+        self._clock = async_get_clock(hass)
+        self._calendar_entity_ids = calendar_entity_ids
+        self._matcher = matcher
+        self._event: CalendarEvent | None = None
+        self._read_task: asyncio.Task[None] | None = None
+        self._attr_unique_id = f"{config_entry_id}_calendar"
+        self._attr_translation_placeholders = {"name": name or ""}
+
+    async def async_added_to_hass(self) -> None:
+        """Handle added to Hass."""
+        await super().async_added_to_hass()
+        for calendar_entity_id in self._calendar_entity_ids:
+            self.async_on_remove(
+                self._cache.async_add_listener(
+                    calendar_entity_id, self.async_write_ha_state
+                )
+            )
+        self.async_on_remove(
+            async_track_state_change_event(
+                self.hass, self._calendar_entity_ids, self._state_changed
+            )
+        )
+        self.async_on_remove(self._cancel_read_task)
+        self._async_read_calendars()
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the matching event in progress or the next one."""
+        return self._event
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Find the current or next matching event and write the state."""
+        self._event = self._next_event()
+        super().async_write_ha_state()
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Return the matching events within a datetime range."""
+        results = await asyncio.gather(
+            *(
+                self._cache.async_get_events(
+                    calendar_entity_id, start_date.timestamp(), end_date.timestamp()
+                )
+                for calendar_entity_id in self._calendar_entity_ids
+            )
+        )
+        matching = sorted(
+            (
+                event
+                for events in results
+                if events is not None
+                for event in events
+                if self._matcher.matches(event)
+            ),
+            key=_event_order,
+        )
+        return [_calendar_event(event) for event in matching]
+
+    @callback
+    def _state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Read the calendars again when one of them changes."""
+        self._async_read_calendars()
+
+    @callback
+    def _async_read_calendars(self) -> None:
+        """Make sure the cached events of the calendars are current."""
+        if self._read_task is not None and not self._read_task.done():
+            return
+        self._read_task = self.hass.async_create_background_task(
+            self._async_read(), f"{DOMAIN} read {self.entity_id}"
+        )
+
+    async def _async_read(self) -> None:
+        """Read the calendars through the cache and write the state."""
+        await asyncio.gather(
+            *(
+                self._cache.async_get_snapshot(calendar_entity_id)
+                for calendar_entity_id in self._calendar_entity_ids
+            )
+        )
+        self.async_write_ha_state()
+
+    @callback
+    def _cancel_read_task(self) -> None:
+        """Cancel reading the calendars."""
+        if self._read_task is not None:
+            self._read_task.cancel()
+            self._read_task = None
+
+    def _next_event(self) -> CalendarEvent | None:
+        """Return the first cached matching event that hasn't ended."""
+        now = self._clock.timestamp()
+        upcoming = (
+            event
+            for calendar_entity_id in self._calendar_entity_ids
+            if (snapshot := self._cache.async_get_cached(calendar_entity_id))
+            is not None
+            for event in snapshot.events
+            if event.end > now and self._matcher.matches(event)
+        )
+        event = min(upcoming, key=_event_order, default=None)
+        return _calendar_event(event) if event is not None else None
+
+
+def _calendar_event(event: CalendarEventRecord) -> CalendarEvent:
+    """Return a cached event as a calendar event."""
+    return CalendarEvent(
+        start=event.local_start(),
+        end=event.local_end(),
+        summary=event.summary,
+        description=event.description or None,
+        location=event.location or None,
+    )
+
+
+def _event_order(event: CalendarEventRecord) -> tuple[float, float, str]:
+    """Return the sort key of events."""
+    return (event.start, event.end, event.summary)
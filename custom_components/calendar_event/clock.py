@@ -0,0 +1,58 @@
+"""Clock used by calendar_event for reading the time and scheduling."""
+
+from __future__ import annotations
+
+from asyncio import TimerHandle
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+DATA_CLOCK: HassKey[Clock] = HassKey(f"{DOMAIN}_clock")
+
+
+@callback
+@singleton(DATA_CLOCK)
+def async_get_clock(hass: HomeAssistant) -> Clock:
+    """Return the clock shared by the integration.
+
+    Tests replace it by storing another clock under DATA_CLOCK before the
+    integration is set up.
+    """
+    return Clock(hass)
+
+
+class Clock:
+    """Wall clock and timers of the Home Assistant event loop.
+
+    Every time read and timer of the integration goes through a clock so
+    replays can run a simulated clock instead.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the clock."""
+        self._hass = hass
+
+    def utcnow(self) -> datetime:
+        """Return the current time in UTC."""
+        return dt_util.utcnow()
+
+    def timestamp(self) -> float:
+        """Return the current time in epoch seconds."""
+        return dt_util.utcnow().timestamp()
+
+    def monotonic(self) -> float:
+        """Return the time timers are scheduled against."""
+        return self._hass.loop.time()
+
+    def call_later(
+        self, delay: float, callback: Callable[..., Any], *args: Any
+    ) -> TimerHandle:
+        """Run callback after delay seconds."""
+        return self._hass.loop.call_later(delay, callback, *args)
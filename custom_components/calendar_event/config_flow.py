@@ -7,6 +7,8 @@ from typing import Any, cast
 
 import voluptuous as vol
 
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers import selector
 from homeassistant.helpers.schema_config_entry_flow import (
     SchemaConfigFlowHandler,
@@ -14,25 +16,32 @@ from homeassistant.helpers.schema_config_entry_flow import (
 )
 
 from .const import (
+    COMPARISON_METHODS,
     CONF_CALENDAR_ENTITY_ID,
     CONF_COMPARISON_METHOD,
+    CONF_DURATION_SENSORS,
+    CONF_FILTERED_CALENDAR,
     CONF_MATCH,
     CONF_MATCH_ATTRIBUTE,
+    CONF_NORMALIZE,
+    CONF_REFRESH_CLASS,
+    CONF_ROLLING_WINDOW,
     DOMAIN,
+    MATCH_ATTRIBUTES,
+    REFRESH_CLASSES,
+    REFRESH_NORMAL,
 )
-
-_COMPARISON_METHODS = ["contains", "starts_with", "ends_with", "exactly"]
-_MATCH_ATTRIBUTES = ["any", "summary", "description", "location"]
+from .preview import ws_start_preview
 
 OPTIONS_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_CALENDAR_ENTITY_ID): selector.EntitySelector(
-            selector.EntitySelectorConfig(domain="calendar")
+            selector.EntitySelectorConfig(domain="calendar", multiple=True)
         ),
         vol.Required(CONF_MATCH): selector.TextSelector(),
         vol.Required(CONF_MATCH_ATTRIBUTE, default="summary"): selector.SelectSelector(
             selector.SelectSelectorConfig(
-                options=_MATCH_ATTRIBUTES,
+                options=MATCH_ATTRIBUTES,
                 mode=selector.SelectSelectorMode.DROPDOWN,
                 translation_key=CONF_MATCH_ATTRIBUTE,
             ),
@@ -41,11 +50,24 @@ OPTIONS_SCHEMA = vol.Schema(
             CONF_COMPARISON_METHOD, default="contains"
         ): selector.SelectSelector(
             selector.SelectSelectorConfig(
-                options=_COMPARISON_METHODS,
+                options=COMPARISON_METHODS,
                 mode=selector.SelectSelectorMode.DROPDOWN,
                 translation_key=CONF_COMPARISON_METHOD,
             ),
         ),
+        vol.Optional(CONF_NORMALIZE, default=False): selector.BooleanSelector(),
+        vol.Optional(CONF_DURATION_SENSORS, default=False): selector.BooleanSelector(),
+        vol.Optional(CONF_FILTERED_CALENDAR, default=False): selector.BooleanSelector(),
+        vol.Optional(CONF_ROLLING_WINDOW): selector.DurationSelector(),
+        vol.Optional(
+            CONF_REFRESH_CLASS, default=REFRESH_NORMAL
+        ): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=REFRESH_CLASSES,
+                mode=selector.SelectSelectorMode.DROPDOWN,
+                translation_key=CONF_REFRESH_CLASS,
+            ),
+        ),
     }
 )
 
@@ -60,11 +82,11 @@ CONFIG_SCHEMA = vol.Schema(
 ).extend(OPTIONS_SCHEMA.schema)
 
 CONFIG_FLOW = {
-    "user": SchemaFlowFormStep(CONFIG_SCHEMA),
+    "user": SchemaFlowFormStep(CONFIG_SCHEMA, preview=DOMAIN),
 }
 
 OPTIONS_FLOW = {
-    "init": SchemaFlowFormStep(OPTIONS_SCHEMA),
+    "init": SchemaFlowFormStep(OPTIONS_SCHEMA, preview=DOMAIN),
 }
 
 
@@ -74,8 +96,13 @@ class ConfigFlowHandler(SchemaConfigFlowHandler, domain=DOMAIN):
     config_flow = CONFIG_FLOW
     options_flow = OPTIONS_FLOW
 
-    VERSION = 2
+    VERSION = 3
 
     def async_config_entry_title(self, options: Mapping[str, Any]) -> str:
         """Return config entry title."""
         return cast(str, options["name"]) if "name" in options else ""
+
+    @staticmethod
+    async def async_setup_preview(hass: HomeAssistant) -> None:
+        """Set up preview WS API."""
+        websocket_api.async_register_command(hass, ws_start_preview)
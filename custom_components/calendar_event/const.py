@@ -11,13 +11,92 @@ MIN_HA_VERSION = "2025.12"
 DOMAIN = "calendar_event"
 CONFIG_VERSION = 1
 
-PLATFORMS = [Platform.BINARY_SENSOR]
+PLATFORMS = [Platform.BINARY_SENSOR, Platform.CALENDAR, Platform.SENSOR]
+
+EVENT_MATCH_STARTED = f"{DOMAIN}_match_started"
+EVENT_MATCH_ENDED = f"{DOMAIN}_match_ended"
+
+SERVICE_BACKFILL = "backfill"
+SERVICE_FIND_MATCHES = "find_matches"
+SERVICE_GET_FETCH_STATISTICS = "get_fetch_statistics"
+SERVICE_GET_TIMER_DRIFT = "get_timer_drift"
+SERVICE_REFRESH = "refresh"
+SERVICE_START_PROFILING = "start_profiling"
+SERVICE_START_RECORDING = "start_recording"
+SERVICE_STOP_PROFILING = "stop_profiling"
+SERVICE_STOP_RECORDING = "stop_recording"
 
 CONF_CALENDAR_ENTITY_ID = "calendar_entity_id"
 CONF_MATCH = "match"
 CONF_COMPARISON_METHOD = "comparison_method"
 CONF_MATCH_ATTRIBUTE = "match_attribute"
+CONF_NORMALIZE = "normalize"
+CONF_MAX_CONCURRENT_FETCHES = "max_concurrent_fetches"
+CONF_DURATION_SENSORS = "duration_sensors"
+CONF_FILTERED_CALENDAR = "filtered_calendar"
+CONF_ROLLING_WINDOW = "rolling_window"
+CONF_REFRESH_CLASS = "refresh_class"
+
+COMPARISON_METHODS = ["contains", "starts_with", "ends_with", "exactly"]
+MATCH_ATTRIBUTES = ["any", "summary", "description", "location"]
+
+REFRESH_REALTIME = "realtime"
+REFRESH_NORMAL = "normal"
+REFRESH_RELAXED = "relaxed"
+REFRESH_BOUNDARY_ONLY = "boundary_only"
+REFRESH_CLASSES = [
+    REFRESH_REALTIME,
+    REFRESH_NORMAL,
+    REFRESH_RELAXED,
+    REFRESH_BOUNDARY_ONLY,
+]
+
+NORMALIZE_CACHE_SIZE = 4096
+# Start and end strings remembered across fetches of the same window; the
+# parsed strings stay in memory, so this is sized for a few busy calendars
+PARSE_CACHE_SIZE = 1024
+# Events matched at once, weighted by the cost of the criteria, before the
+# matching moves off the event loop
+EXECUTOR_MATCH_COST = 5000
+NORMALIZE_MATCH_COST = 4
+FETCH_TIMEOUT = 10
+# Ranges fetched outside the cached window can span months of events
+RANGE_FETCH_TIMEOUT = 60
+# Seconds before a helper checks again a calendar that couldn't be fetched
+FETCH_RETRY_INTERVAL = 60
+DEFAULT_MAX_CONCURRENT_FETCHES = 4
+CACHE_MAX_AGE = 30
+CACHE_MAX_AGE_CEILING = 15 * 60
+CACHE_MAX_AGE_GROWTH = 2
+CACHE_WINDOW = 24 * 60 * 60
+BACKFILL_DURATION = 90 * 24 * 60 * 60
+DEFAULT_ROLLING_WINDOW = 24 * 60 * 60
+PREVIEW_WINDOW = 7 * 24 * 60 * 60
+PREVIEW_EVENTS = 10
+PROFILE_SAMPLES = 1000
+# Updates of each helper whose timings are kept for diagnostics
+RECENT_EVALUATIONS = 10
+RECORDING_FLUSH_SIZE = 100
+
+STORAGE_KEY = f"{DOMAIN}.events"
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30
+STORAGE_MAX_AGE = 60 * 60
 
+ATTR_CALENDAR = "calendar"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_DURATION = "duration"
+ATTR_END_DATE_TIME = "end_date_time"
+ATTR_EVALUATIONS = "evaluations"
+ATTR_EVENTS = "events"
+ATTR_INTERVALS = "intervals"
+ATTR_ON_TIME = "on_time"
+ATTR_PATH = "path"
+ATTR_PROFILE = "profile"
+ATTR_REDACT = "redact"
+ATTR_RESPONSES = "responses"
+ATTR_STAGES = "stages"
+ATTR_START_DATE_TIME = "start_date_time"
 ATTR_DESCRIPTION = "description"
 ATTR_LOCATION = "location"
 ATTR_SUMMARY = "summary"
@@ -0,0 +1,72 @@
+"""Diagnostics support for calendar_event."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import async_get_platforms
+
+from .binary_sensor import CalendarEventBinarySensor
+from .cache import async_get_event_cache
+from .const import (
+    ATTR_DESCRIPTION,
+    ATTR_LOCATION,
+    ATTR_SUMMARY,
+    CONF_CALENDAR_ENTITY_ID,
+    DOMAIN,
+)
+from .limiter import async_get_fetch_limiter
+from .matcher import normalize_text
+from .models import parse_timestamp
+from .profiling import async_get_profiler, async_get_timer_drift
+
+# Event text can be personal, the criteria are the helper's own settings
+TO_REDACT = {ATTR_SUMMARY, ATTR_DESCRIPTION, ATTR_LOCATION}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    calendars = async_get_event_cache(hass).async_diagnostics()
+    return async_redact_data(
+        {
+            "options": dict(entry.options),
+            "helpers": [
+                entity.async_diagnostics()
+                for platform in async_get_platforms(hass, DOMAIN)
+                if platform.domain == BINARY_SENSOR_DOMAIN
+                and platform.config_entry is entry
+                for entity in platform.entities.values()
+                if isinstance(entity, CalendarEventBinarySensor)
+            ],
+            "calendars": {
+                calendar_entity_id: calendars[calendar_entity_id]
+                for calendar_entity_id in entry.options[CONF_CALENDAR_ENTITY_ID]
+                if calendar_entity_id in calendars
+            },
+            "integration": _async_integration_diagnostics(hass, calendars),
+        },
+        TO_REDACT,
+    )
+
+
+@callback
+def _async_integration_diagnostics(
+    hass: HomeAssistant, calendars: dict[str, Any]
+) -> dict[str, Any]:
+    """Return the state shared by every helper."""
+    profiler = async_get_profiler(hass)
+    return {
+        "cached_calendars": len(calendars),
+        "fetches": async_get_fetch_limiter(hass).async_statistics(),
+        "timer_drift": async_get_timer_drift(hass).async_statistics(),
+        "profiling": profiler.enabled,
+        "stages": profiler.async_statistics(),
+        "text_cache": normalize_text.cache_info()._asdict(),
+        "parse_cache": parse_timestamp.cache_info()._asdict(),
+    }
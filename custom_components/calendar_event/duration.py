@@ -0,0 +1,214 @@
+"""Matched time totals of calendar_event helpers."""
+
+from __future__ import annotations
+
+from asyncio import TimerHandle
+from collections import deque
+from collections.abc import Callable, Iterable
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
+from homeassistant.const import STATE_ON
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .clock import async_get_clock
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    DOMAIN,
+    EVENT_MATCH_ENDED,
+    EVENT_MATCH_STARTED,
+    LOGGER,
+)
+from .history import async_get_on_intervals
+from .matcher import EventMatcher
+
+PERIOD_TODAY = "today"
+PERIOD_WEEK = "week"
+PERIOD_ROLLING = "rolling"
+
+PERIODS = (PERIOD_TODAY, PERIOD_WEEK, PERIOD_ROLLING)
+
+
+def _period_starts(now: float) -> tuple[float, float, float]:
+    """Return when today, this week and tomorrow start in the local time zone."""
+    today = dt_util.as_local(dt_util.utc_from_timestamp(now)).date()
+    return (
+        dt_util.start_of_local_day(today).timestamp(),
+        dt_util.start_of_local_day(today - timedelta(days=today.weekday())).timestamp(),
+        dt_util.start_of_local_day(today + timedelta(days=1)).timestamp(),
+    )
+
+
+def _overlap(
+    intervals: Iterable[tuple[float, float]], start: float, end: float
+) -> float:
+    """Return how many seconds of the intervals fall between start and end."""
+    return sum(
+        max(0.0, min(interval_end, end) - max(interval_start, start))
+        for interval_start, interval_end in intervals
+    )
+
+
+class MatchedTimeTracker:
+    """Total the time a helper matched today, this week and over a rolling window.
+
+    Totals are kept from the helper's own match started and ended events so no
+    recorder history is queried, the time matched since the start of the week
+    is read from the calendars once when the tracker starts. Totals are only
+    recomputed when a match starts or ends and when a period rolls over, a
+    match in progress is counted up to the last of those.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry_id: str,
+        calendar_entity_ids: list[str],
+        matcher: EventMatcher,
+        rolling_window: float,
+    ) -> None:
+        """Initialize the tracker."""
+        self._hass = hass
+        self._clock = async_get_clock(hass)
+        self._config_entry_id = config_entry_id
+        self._calendar_entity_ids = calendar_entity_ids
+        self._matcher = matcher
+        self._rolling_window = rolling_window
+        # Finished matches in order, and when the match in progress started
+        self._intervals: deque[tuple[float, float]] = deque()
+        self._on_since: float | None = None
+        self.totals: dict[str, float] = dict.fromkeys(PERIODS, 0.0)
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._unsubscribes: list[CALLBACK_TYPE] = []
+        self._timer: TimerHandle | None = None
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Call update_callback whenever the totals are recomputed."""
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+    async def async_start(self) -> None:
+        """Start tracking matches, backfilling the time matched this week."""
+        self._unsubscribes = [
+            self._hass.bus.async_listen(
+                EVENT_MATCH_STARTED,
+                self._async_match_started,
+                event_filter=self._is_helper_event,
+            ),
+            self._hass.bus.async_listen(
+                EVENT_MATCH_ENDED,
+                self._async_match_ended,
+                event_filter=self._is_helper_event,
+            ),
+        ]
+
+        now = self._clock.timestamp()
+        try:
+            starts, ends = await async_get_on_intervals(
+                self._hass,
+                self._calendar_entity_ids,
+                self._matcher,
+                self._retention_start(now),
+                now,
+            )
+        except HomeAssistantError as err:
+            # Count from now on, the earlier time matched is left out
+            LOGGER.debug("Not backfilling the time matched: %s", err)
+            backfilled: list[tuple[float, float]] = []
+        else:
+            backfilled = list(zip(starts.tolist(), ends.tolist(), strict=True))
+        in_progress = (
+            backfilled.pop() if backfilled and backfilled[-1][1] >= now else None
+        )
+
+        helper_on = self._helper_is_on()
+        if in_progress is not None and (helper_on or self._on_since is not None):
+            self._on_since = min(in_progress[0], self._on_since or now)
+        elif in_progress is not None:
+            backfilled.append(in_progress)
+        self._intervals.extendleft(reversed(backfilled))
+        self._async_update()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop tracking matches."""
+        for unsubscribe in self._unsubscribes:
+            unsubscribe()
+        self._unsubscribes = []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _helper_is_on(self) -> bool:
+        """Check if the helper has a match in progress."""
+        entity_id = er.async_get(self._hass).async_get_entity_id(
+            BINARY_SENSOR_DOMAIN, DOMAIN, self._config_entry_id
+        )
+        state = self._hass.states.get(entity_id) if entity_id else None
+        return state is not None and state.state == STATE_ON
+
+    @callback
+    def _is_helper_event(self, event_data: Any) -> bool:
+        """Check if a match event is about this helper."""
+        return bool(event_data[ATTR_CONFIG_ENTRY_ID] == self._config_entry_id)
+
+    @callback
+    def _async_match_started(self, event: Event) -> None:
+        """Start counting a match."""
+        if self._on_since is None:
+            self._on_since = self._clock.timestamp()
+            self._async_update()
+
+    @callback
+    def _async_match_ended(self, event: Event) -> None:
+        """Finish counting a match, unless another one is still in progress."""
+        if self._on_since is None or self._helper_is_on():
+            return
+        self._intervals.append((self._on_since, self._clock.timestamp()))
+        self._on_since = None
+        self._async_update()
+
+    def _retention_start(self, now: float) -> float:
+        """Return when the oldest period being totalled starts."""
+        return min(_period_starts(now)[1], now - self._rolling_window)
+
+    @callback
+    def _async_update(self) -> None:
+        """Recompute the totals and wait for the next boundary."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = self._clock.timestamp()
+        today_start, week_start, tomorrow_start = _period_starts(now)
+        rolling_start = now - self._rolling_window
+
+        intervals = self._intervals
+        retention_start = min(week_start, rolling_start)
+        while intervals and intervals[0][1] <= retention_start:
+            intervals.popleft()
+
+        current = list(intervals)
+        if self._on_since is not None:
+            current.append((self._on_since, now))
+        self.totals = {
+            PERIOD_TODAY: _overlap(current, today_start, now),
+            PERIOD_WEEK: _overlap(current, week_start, now),
+            PERIOD_ROLLING: _overlap(current, rolling_start, now),
+        }
+        for update_callback in self._listeners:
+            update_callback()
+
+        # Totals change when a day starts or a match leaves the rolling window
+        wakeup = tomorrow_start
+        for interval_start, interval_end in intervals:
+            for edge in (interval_start, interval_end):
+                if edge + self._rolling_window > now:
+                    wakeup = min(wakeup, edge + self._rolling_window)
+        if self._on_since is not None and self._on_since + self._rolling_window > now:
+            wakeup = min(wakeup, self._on_since + self._rolling_window)
+        self._timer = self._clock.call_later(wakeup - now, self._async_update)
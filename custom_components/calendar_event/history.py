@@ -0,0 +1,107 @@
+"""Historical evaluation of calendar_event criteria."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+
+import numpy as np
+import numpy.typing as npt
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .cache import async_get_event_cache
+from .const import DOMAIN
+from .matcher import EventMatcher
+from .models import CalendarEventRecord
+
+type Intervals = tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]
+
+
+def merge_intervals(
+    starts: npt.NDArray[np.float64],
+    ends: npt.NDArray[np.float64],
+    range_start: float,
+    range_end: float,
+) -> Intervals:
+    """Merge overlapping intervals clipped to a range.
+
+    Returns the start and end arrays of the merged intervals in order,
+    intervals that touch are merged as a helper would stay on between them.
+    """
+    starts = np.clip(starts, range_start, range_end)
+    ends = np.clip(ends, range_start, range_end)
+    keep = ends > starts
+    starts = starts[keep]
+    ends = ends[keep]
+    if not starts.size:
+        return starts, ends
+
+    order = np.argsort(starts, kind="stable")
+    starts = starts[order]
+    # The furthest end reached by any interval so far
+    reach = np.maximum.accumulate(ends[order])
+
+    first = np.flatnonzero(np.concatenate(([True], starts[1:] > reach[:-1])))
+    last = np.append(first[1:] - 1, starts.size - 1)
+    return starts[first], reach[last]
+
+
+def matching_intervals(
+    events: Iterable[CalendarEventRecord],
+    matcher: EventMatcher,
+    range_start: float,
+    range_end: float,
+) -> Intervals:
+    """Return the merged intervals of the events matching the criteria."""
+    # Recurring events share their text, so each distinct text is matched once
+    verdicts: dict[tuple[str, str, str], bool] = {}
+    matched: list[CalendarEventRecord] = []
+    for event in events:
+        key = (event.summary, event.description, event.location)
+        verdict = verdicts.get(key)
+        if verdict is None:
+            verdict = verdicts[key] = matcher.matches(event)
+        if verdict:
+            matched.append(event)
+
+    count = len(matched)
+    starts = np.fromiter((event.start for event in matched), np.float64, count)
+    ends = np.fromiter((event.end for event in matched), np.float64, count)
+    return merge_intervals(starts, ends, range_start, range_end)
+
+
+async def async_get_on_intervals(
+    hass: HomeAssistant,
+    calendar_entity_ids: Iterable[str],
+    matcher: EventMatcher,
+    start: float,
+    end: float,
+) -> Intervals:
+    """Return when a helper with these criteria would have been on.
+
+    Each calendar is fetched once for the whole range. Raises if a calendar
+    can't be fetched, as its events missing would understate the time on.
+    """
+    cache = async_get_event_cache(hass)
+    calendar_entity_ids = list(calendar_entity_ids)
+    results = await asyncio.gather(
+        *(
+            cache.async_get_events(calendar_entity_id, start, end)
+            for calendar_entity_id in calendar_entity_ids
+        )
+    )
+    for calendar_entity_id, events in zip(calendar_entity_ids, results, strict=True):
+        if events is None:
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="fetch_failed",
+                translation_placeholders={"entity_id": calendar_entity_id},
+            )
+    return matching_intervals(
+        (event for events in results if events is not None for event in events),
+        matcher,
+        start,
+        end,
+    )
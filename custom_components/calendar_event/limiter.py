@@ -0,0 +1,126 @@
+"""Concurrency limit of calendar.get_events calls made by calendar_event."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util.hass_dict import HassKey
+from homeassistant.util.json import JsonValueType
+
+from .clock import async_get_clock
+from .const import DEFAULT_MAX_CONCURRENT_FETCHES, DOMAIN, PROFILE_SAMPLES
+from .profiling import percentile_statistics
+
+DATA_FETCH_LIMITER: HassKey[FetchLimiter] = HassKey(f"{DOMAIN}_fetch_limiter")
+
+# Calendar changes and actions someone is waiting on go before periodic checks
+PRIORITY_HIGH = 0
+PRIORITY_PERIODIC = 1
+
+
+@callback
+@singleton(DATA_FETCH_LIMITER)
+def async_get_fetch_limiter(hass: HomeAssistant) -> FetchLimiter:
+    """Return the fetch limiter shared by the integration."""
+    return FetchLimiter(hass, DEFAULT_MAX_CONCURRENT_FETCHES)
+
+
+class FetchLimiter:
+    """Limit how many calendar.get_events calls run at once.
+
+    Fetches waiting for a slot start in priority order, then in the order
+    they queued. A fetch made stale by a newer one while it waited is dropped
+    without using a slot.
+    """
+
+    def __init__(self, hass: HomeAssistant, limit: int) -> None:
+        """Initialize the limiter."""
+        self._hass = hass
+        self._clock = async_get_clock(hass)
+        self.limit = limit
+        self._active = 0
+        self._queue: list[
+            tuple[int, int, Callable[[], bool] | None, asyncio.Future[bool]]
+        ] = []
+        self._sequence = itertools.count()
+        self._waits: deque[float] = deque(maxlen=PROFILE_SAMPLES)
+        self._skipped = 0
+
+    @asynccontextmanager
+    async def async_slot(
+        self, priority: int, is_stale: Callable[[], bool] | None = None
+    ) -> AsyncIterator[bool]:
+        """Hold a slot for a fetch, yielding False if it went stale instead."""
+        acquired = await self._async_acquire(priority, is_stale)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self._active -= 1
+                self._async_start_waiting()
+
+    async def _async_acquire(
+        self, priority: int, is_stale: Callable[[], bool] | None
+    ) -> bool:
+        """Wait for a slot, returning False if the fetch went stale."""
+        if self._active < self.limit and not self._queue:
+            self._active += 1
+            self._waits.append(0.0)
+            return True
+
+        queued_at = self._clock.monotonic()
+        future: asyncio.Future[bool] = self._hass.loop.create_future()
+        heapq.heappush(self._queue, (priority, next(self._sequence), is_stale, future))
+        # Slots may be free behind fetches that were cancelled while waiting
+        self._async_start_waiting()
+        try:
+            acquired = await future
+        except asyncio.CancelledError:
+            # A slot handed over just as the fetch was cancelled is given back
+            if future.done() and not future.cancelled() and future.result():
+                self._active -= 1
+                self._async_start_waiting()
+            raise
+        if acquired:
+            self._waits.append(self._clock.monotonic() - queued_at)
+        return acquired
+
+    @callback
+    def _async_start_waiting(self) -> None:
+        """Hand free slots to the waiting fetches still wanted."""
+        while self._active < self.limit and self._queue:
+            _, _, is_stale, future = heapq.heappop(self._queue)
+            if future.done():
+                continue
+            if is_stale is not None and is_stale():
+                self._skipped += 1
+                future.set_result(False)
+                continue
+            self._active += 1
+            future.set_result(True)
+
+    @callback
+    def async_set_limit(self, limit: int) -> None:
+        """Change how many fetches may run at once."""
+        self.limit = limit
+        self._async_start_waiting()
+
+    @callback
+    def async_statistics(self) -> dict[str, JsonValueType]:
+        """Return the queue depth and how long fetches waited for a slot."""
+        statistics: dict[str, JsonValueType] = {
+            "limit": self.limit,
+            "active": self._active,
+            "queued": sum(not future.done() for *_, future in self._queue),
+            "skipped": self._skipped,
+        }
+        if self._waits:
+            statistics["wait"] = percentile_statistics(self._waits)
+        return statistics
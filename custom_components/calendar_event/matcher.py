@@ -0,0 +1,139 @@
+"""Text matching helpers for calendar_event."""
+
+from __future__ import annotations
+
+import unicodedata
+from collections.abc import Callable, Collection, Iterable, Mapping
+from functools import lru_cache
+from typing import Any
+
+from .const import (
+    CONF_COMPARISON_METHOD,
+    CONF_MATCH,
+    CONF_MATCH_ATTRIBUTE,
+    CONF_NORMALIZE,
+    NORMALIZE_CACHE_SIZE,
+    NORMALIZE_MATCH_COST,
+)
+from .models import CalendarEventRecord
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_text(text: str) -> str:
+    """Return text folded for accent and whitespace insensitive matching.
+
+    The cache is shared by every helper, so each distinct event text is only
+    decomposed once no matter how many helpers look at it.
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+class EventMatcher:
+    """Matcher compiled from a helper's criteria.
+
+    The match text is folded once and the comparison method and attributes are
+    resolved up front, so matching an event is a handful of string operations.
+    """
+
+    __slots__ = (
+        "_compare",
+        "_fields",
+        "_folded_match",
+        "comparison_method",
+        "match",
+        "match_attribute",
+        "normalize",
+    )
+
+    def __init__(
+        self,
+        match: str,
+        match_attribute: str,
+        comparison_method: str,
+        *,
+        normalize: bool = False,
+    ) -> None:
+        """Compile the matcher."""
+        self.match = match
+        self.match_attribute = match_attribute
+        self.comparison_method = comparison_method
+        self.normalize = normalize
+        self._folded_match = normalize_text(match) if normalize else match.casefold()
+        # Default to contains if unknown criteria
+        self._compare = _COMPARATORS.get(comparison_method, _contains)
+        self._fields = _MATCH_FIELDS.get(match_attribute, ())
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> EventMatcher:
+        """Compile a matcher from config entry options."""
+        return cls(
+            options[CONF_MATCH],
+            options.get(CONF_MATCH_ATTRIBUTE, "summary"),
+            options.get(CONF_COMPARISON_METHOD, "contains"),
+            normalize=options.get(CONF_NORMALIZE, False),
+        )
+
+    def matches(self, record: CalendarEventRecord) -> bool:
+        """Check if an event matches the criteria."""
+        if self.normalize:
+            raw = (record.summary, record.description, record.location)
+            texts = [normalize_text(raw[field]) for field in self._fields]
+        else:
+            texts = [record.match_text[field] for field in self._fields]
+        return any(self._compare(text, self._folded_match) for text in texts)
+
+    def matching(
+        self, records: Iterable[CalendarEventRecord]
+    ) -> frozenset[CalendarEventRecord]:
+        """Return the events that match the criteria.
+
+        The matcher and records are immutable, so this can run in the executor.
+        """
+        return frozenset(record for record in records if self.matches(record))
+
+    def cost(self, records: Collection[CalendarEventRecord]) -> int:
+        """Return how costly matching the events is, in plain comparisons."""
+        return len(records) * (NORMALIZE_MATCH_COST if self.normalize else 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the compiled criteria."""
+        return {
+            CONF_MATCH: self.match,
+            CONF_MATCH_ATTRIBUTE: self.match_attribute,
+            CONF_COMPARISON_METHOD: self.comparison_method,
+            CONF_NORMALIZE: self.normalize,
+        }
+
+
+def _contains(text: str, match: str) -> bool:
+    return match in text
+
+
+def _starts_with(text: str, match: str) -> bool:
+    return text.startswith(match)
+
+
+def _ends_with(text: str, match: str) -> bool:
+    return text.endswith(match)
+
+
+def _exactly(text: str, match: str) -> bool:
+    return text == match
+
+
+_COMPARATORS: dict[str, Callable[[str, str], bool]] = {
+    "contains": _contains,
+    "starts_with": _starts_with,
+    "ends_with": _ends_with,
+    "exactly": _exactly,
+}
+
+# Indexes into CalendarEventRecord.match_text
+_MATCH_FIELDS: dict[str, tuple[int, ...]] = {
+    "any": (0, 1, 2),
+    "summary": (0,),
+    "description": (1,),
+    "location": (2,),
+}
@@ -0,0 +1,254 @@
+"""Data models for calendar_event."""
+
+from __future__ import annotations
+
+import sys
+from datetime import date, datetime, time, tzinfo
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import JsonValueType
+
+from .const import (
+    ATTR_CALENDAR,
+    ATTR_DESCRIPTION,
+    ATTR_LOCATION,
+    ATTR_SUMMARY,
+    PARSE_CACHE_SIZE,
+)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_timestamp(value: str, time_zone: tzinfo) -> float | None:
+    """Return epoch seconds for a date or datetime string.
+
+    Dates, which calendars return for all-day events, start at midnight and
+    datetimes without an offset are local to the time zone. Refreshing a
+    calendar returns mostly the same strings, so each is only parsed once.
+    """
+    if (parsed_date := dt_util.parse_date(value)) is not None:
+        return datetime.combine(parsed_date, time(), tzinfo=time_zone).timestamp()
+    try:
+        parsed = dt_util.parse_datetime(value)
+    except ValueError:
+        return None
+    if parsed is None:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=time_zone)
+    return parsed.timestamp()
+
+
+def _parse_timestamp(value: Any) -> float | None:
+    """Return epoch seconds for a service response date or datetime string."""
+    if not isinstance(value, str):
+        return None
+    return parse_timestamp(value, dt_util.get_default_time_zone())
+
+
+def _is_date(value: Any) -> bool:
+    """Check if a service response start is a date, as all-day events have.
+
+    Only called on strings that parsed, of which ISO dates are the only ones
+    with ten characters, so they aren't parsed again.
+    """
+    return isinstance(value, str) and len(value) == len("YYYY-MM-DD")
+
+
+def _text(value: Any) -> str:
+    """Return an event text, or an empty string if missing."""
+    return value if isinstance(value, str) else ""
+
+
+class CalendarEventRecord(NamedTuple):
+    """Compact, immutable view of a calendar event.
+
+    Calendar service responses are dicts of strings; records keep the same
+    information as epoch seconds and interned text, along with the casefolded
+    text used for matching so it is only computed once per event. All-day
+    events start and end at local midnight.
+    """
+
+    calendar_entity_id: str
+    start: float
+    end: float
+    summary: str
+    description: str
+    location: str
+    match_text: tuple[str, str, str]
+    all_day: bool = False
+
+    @classmethod
+    def create(
+        cls,
+        calendar_entity_id: str,
+        start: float,
+        end: float,
+        summary: str = "",
+        description: str = "",
+        location: str = "",
+        *,
+        all_day: bool = False,
+    ) -> CalendarEventRecord:
+        """Create a record, interning its text."""
+        summary = sys.intern(summary)
+        description = sys.intern(description)
+        location = sys.intern(location)
+        return cls(
+            sys.intern(calendar_entity_id),
+            start,
+            end,
+            summary,
+            description,
+            location,
+            (
+                sys.intern(summary.casefold()),
+                sys.intern(description.casefold()),
+                sys.intern(location.casefold()),
+            ),
+            all_day,
+        )
+
+    @classmethod
+    def from_service_event(
+        cls, calendar_entity_id: str, event: Any
+    ) -> CalendarEventRecord | None:
+        """Create a record from a calendar.get_events response item.
+
+        Returns None for items that are not valid events.
+        """
+        if not isinstance(event, dict):
+            return None
+        start_value = event.get("start")
+        start = _parse_timestamp(start_value)
+        end = _parse_timestamp(event.get("end"))
+        if start is None or end is None:
+            return None
+        return cls.create(
+            calendar_entity_id,
+            start,
+            end,
+            _text(event.get("summary")),
+            _text(event.get("description")),
+            _text(event.get("location")),
+            all_day=_is_date(start_value),
+        )
+
+    def local_start(self) -> datetime | date:
+        """Return the local start, a date for all-day events."""
+        start = dt_util.as_local(dt_util.utc_from_timestamp(self.start))
+        return start.date() if self.all_day else start
+
+    def local_end(self) -> datetime | date:
+        """Return the local end, a date for all-day events."""
+        end = dt_util.as_local(dt_util.utc_from_timestamp(self.end))
+        return end.date() if self.all_day else end
+
+    def as_dict(self) -> dict[str, JsonValueType]:
+        """Return the event as a service response item."""
+        return {
+            ATTR_CALENDAR: self.calendar_entity_id,
+            "start": self.local_start().isoformat(),
+            "end": self.local_end().isoformat(),
+            ATTR_SUMMARY: self.summary,
+            ATTR_DESCRIPTION: self.description,
+            ATTR_LOCATION: self.location,
+        }
+
+
+class SnapshotDelta(NamedTuple):
+    """The events added and removed since the previous snapshot.
+
+    An event whose start, end or text changed is both removed and added.
+    """
+
+    previous: int
+    added: frozenset[CalendarEventRecord]
+    removed: frozenset[CalendarEventRecord]
+
+
+class CalendarSnapshot(NamedTuple):
+    """Events fetched from a calendar for a window of time.
+
+    The fingerprint is a hash of the events, equal for fetches that returned
+    the same events. The delta, when set, holds the changes from the snapshot
+    with the previous fingerprint.
+    """
+
+    calendar_entity_id: str
+    start: float
+    end: float
+    fetched_at: float
+    events: tuple[CalendarEventRecord, ...]
+    fingerprint: int
+    delta: SnapshotDelta | None = None
+
+    @classmethod
+    def create(
+        cls,
+        calendar_entity_id: str,
+        start: float,
+        end: float,
+        fetched_at: float,
+        events: tuple[CalendarEventRecord, ...],
+    ) -> CalendarSnapshot:
+        """Create a snapshot, fingerprinting its events."""
+        return cls(calendar_entity_id, start, end, fetched_at, events, hash(events))
+
+    def replacing(self, previous: CalendarSnapshot) -> CalendarSnapshot:
+        """Return the snapshot with its changes from a previous one."""
+        if self.fingerprint == previous.fingerprint and self.events == previous.events:
+            # Keep the previous events so unchanged fetches share them
+            return self._replace(
+                events=previous.events,
+                delta=SnapshotDelta(previous.fingerprint, frozenset(), frozenset()),
+            )
+        events = frozenset(self.events)
+        previous_events = frozenset(previous.events)
+        return self._replace(
+            delta=SnapshotDelta(
+                previous.fingerprint,
+                events - previous_events,
+                previous_events - events,
+            )
+        )
+
+    def covers(self, start: float, end: float) -> bool:
+        """Check if the snapshot holds every event between start and end."""
+        return self.start <= start and end <= self.end
+
+    def events_between(self, start: float, end: float) -> list[CalendarEventRecord]:
+        """Return the events overlapping start and end."""
+        return [
+            event
+            for event in self.events
+            if event.start < end and (event.end > start or event.start >= start)
+        ]
+
+    def next_boundary(self, now: float) -> float:
+        """Return when the next event after now starts or ends.
+
+        The end of the window is returned if no event changes before it.
+        """
+        boundary = self.end
+        for event in self.events:
+            if now < event.start < boundary:
+                boundary = event.start
+            elif now < event.end < boundary:
+                boundary = event.end
+        return boundary
+
+
+class CachedVerdict(NamedTuple):
+    """The matching events a helper found for a set of snapshots.
+
+    event is the match the helper shows, in_progress every matching event in
+    progress. It holds until the snapshots change or valid_until, the next time
+    an event starts or ends.
+    """
+
+    fingerprints: tuple[tuple[str, int], ...]
+    valid_until: float
+    event: CalendarEventRecord | None
+    in_progress: frozenset[CalendarEventRecord] = frozenset()
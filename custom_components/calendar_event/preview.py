@@ -0,0 +1,147 @@
+"""Live preview of calendar_event criteria in the config and options flows."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.data_entry_flow import UnknownFlow
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util.hass_dict import HassKey
+
+from .cache import async_get_event_cache
+from .clock import async_get_clock
+from .const import (
+    ATTR_EVENTS,
+    CONF_CALENDAR_ENTITY_ID,
+    CONF_MATCH,
+    DOMAIN,
+    PREVIEW_EVENTS,
+    PREVIEW_WINDOW,
+)
+from .matcher import EventMatcher
+from .models import CalendarEventRecord
+
+type _FlowEvents = dict[str, asyncio.Task[list[CalendarEventRecord] | None]]
+
+# Events fetched for each flow showing a preview, by flow type and id
+DATA_PREVIEW_EVENTS: HassKey[dict[tuple[str, str], _FlowEvents]] = HassKey(
+    f"{DOMAIN}_preview_events"
+)
+
+
+@callback
+def _async_flow_in_progress(hass: HomeAssistant, flow_type: str, flow_id: str) -> bool:
+    """Check if a config or options flow is still in progress."""
+    manager = (
+        hass.config_entries.flow
+        if flow_type == "config_flow"
+        else hass.config_entries.options
+    )
+    try:
+        manager.async_get(flow_id)
+    except UnknownFlow:
+        return False
+    return True
+
+
+@callback
+def _async_flow_events(
+    hass: HomeAssistant, flow_type: str, flow_id: str
+) -> _FlowEvents:
+    """Return the events fetched for a flow, forgetting finished flows."""
+    flows = hass.data.setdefault(DATA_PREVIEW_EVENTS, {})
+    for key in [key for key in flows if key != (flow_type, flow_id)]:
+        if not _async_flow_in_progress(hass, *key):
+            del flows[key]
+    return flows.setdefault((flow_type, flow_id), {})
+
+
+async def async_get_preview_events(
+    hass: HomeAssistant, flow_type: str, flow_id: str, calendar_entity_ids: list[str]
+) -> list[CalendarEventRecord]:
+    """Return the upcoming events of calendars, fetching each once per flow."""
+    flow_events = _async_flow_events(hass, flow_type, flow_id)
+    cache = async_get_event_cache(hass)
+    now = async_get_clock(hass).timestamp()
+    for calendar_entity_id in calendar_entity_ids:
+        if calendar_entity_id not in flow_events:
+            flow_events[calendar_entity_id] = hass.async_create_task(
+                cache.async_get_events(calendar_entity_id, now, now + PREVIEW_WINDOW),
+                f"{DOMAIN} preview {calendar_entity_id}",
+            )
+    results = await asyncio.gather(
+        *(flow_events[calendar_entity_id] for calendar_entity_id in calendar_entity_ids)
+    )
+    return [event for events in results if events is not None for event in events]
+
+
+def preview_state(
+    events: list[CalendarEventRecord], matcher: EventMatcher | None, now: float
+) -> tuple[str, dict[str, Any]]:
+    """Return the helper state and the upcoming events matching the criteria.
+
+    Nothing matches until some text to match has been entered.
+    """
+    if matcher is None:
+        return "off", {ATTR_EVENTS: []}
+    matching = sorted(
+        (event for event in events if event.end > now and matcher.matches(event)),
+        key=lambda event: (event.start, event.end, event.summary),
+    )
+    state = "on" if any(event.start <= now for event in matching) else "off"
+    return state, {
+        ATTR_EVENTS: [event.as_dict() for event in matching[:PREVIEW_EVENTS]]
+    }
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/start_preview",
+        vol.Required("flow_id"): str,
+        vol.Required("flow_type"): vol.Any("config_flow", "options_flow"),
+        vol.Required("user_input"): dict,
+    }
+)
+@websocket_api.async_response
+async def ws_start_preview(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Generate a preview of the events matching the criteria being entered.
+
+    The calendars are fetched once per flow, the events are filtered again
+    each time the criteria change.
+    """
+    user_input: dict[str, Any] = msg["user_input"]
+    if msg["flow_type"] == "config_flow":
+        name = user_input.get("name")
+    else:
+        flow_status = hass.config_entries.options.async_get(msg["flow_id"])
+        config_entry = hass.config_entries.async_get_entry(flow_status["handler"])
+        if not config_entry:
+            raise HomeAssistantError("Config entry not found")
+        name = config_entry.options.get("name", config_entry.title)
+
+    calendar_entity_ids: list[str] = user_input.get(CONF_CALENDAR_ENTITY_ID) or []
+    events = await async_get_preview_events(
+        hass, msg["flow_type"], msg["flow_id"], calendar_entity_ids
+    )
+    state, attributes = preview_state(
+        events,
+        EventMatcher.from_options(user_input) if user_input.get(CONF_MATCH) else None,
+        async_get_clock(hass).timestamp(),
+    )
+
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(
+            msg["id"],
+            {"attributes": {"friendly_name": name, **attributes}, "state": state},
+        )
+    )
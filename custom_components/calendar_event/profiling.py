@@ -0,0 +1,258 @@
+"""Runtime profiling of the calendar_event update pipeline and timers."""
+
+from __future__ import annotations
+
+import cProfile
+from collections import deque
+from collections.abc import Collection
+from contextlib import AbstractContextManager, nullcontext
+from statistics import quantiles
+from time import perf_counter
+from types import TracebackType
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util.hass_dict import HassKey
+from homeassistant.util.json import JsonValueType
+
+from .clock import async_get_clock
+from .const import DOMAIN, LOGGER, PROFILE_SAMPLES
+
+DATA_PROFILER: HassKey[UpdateProfiler] = HassKey(f"{DOMAIN}_profiler")
+DATA_TIMER_DRIFT: HassKey[TimerDriftMonitor] = HassKey(f"{DOMAIN}_timer_drift")
+
+STAGE_STATE_LOOKUP = "state_lookup"
+STAGE_SERVICE_CALL = "service_call"
+STAGE_VALIDATION = "validation"
+STAGE_PARSING = "parsing"
+STAGE_MATCHING = "matching"
+STAGE_STATE_WRITE = "state_write"
+STAGE_UPDATE = "update"
+
+STAGES = (
+    STAGE_STATE_LOOKUP,
+    STAGE_SERVICE_CALL,
+    STAGE_VALIDATION,
+    STAGE_PARSING,
+    STAGE_MATCHING,
+    STAGE_STATE_WRITE,
+    STAGE_UPDATE,
+)
+
+DRIFT_SCHEDULE_UPDATE = "schedule_update"
+DRIFT_UPDATE_STATE = "update_state"
+
+DRIFT_PERCENTILES = (50, 90, 99)
+
+# Shared by every stage while profiling is off so timing costs nothing
+_DISABLED: AbstractContextManager[None] = nullcontext()
+
+
+def percentile_statistics(durations: Collection[float]) -> dict[str, JsonValueType]:
+    """Return percentiles and the worst case of durations in milliseconds."""
+    samples = [duration * 1000 for duration in durations]
+    # The cut points between hundredths, interpolated between samples
+    cuts = quantiles(samples, n=100, method="inclusive")
+    result: dict[str, JsonValueType] = {"count": len(samples)}
+    for percentile in DRIFT_PERCENTILES:
+        result[f"p{percentile}"] = round(cuts[percentile - 1], 3)
+    result["max"] = round(max(samples), 3)
+    return result
+
+
+@callback
+@singleton(DATA_PROFILER)
+def async_get_profiler(hass: HomeAssistant) -> UpdateProfiler:
+    """Return the profiler shared by every helper."""
+    return UpdateProfiler(hass)
+
+
+@callback
+@singleton(DATA_TIMER_DRIFT)
+def async_get_timer_drift(hass: HomeAssistant) -> TimerDriftMonitor:
+    """Return the timer drift monitor shared by every helper."""
+    return TimerDriftMonitor()
+
+
+class _Stage:
+    """Time a stage of the update pipeline."""
+
+    __slots__ = ("_name", "_profiler", "_start")
+
+    def __init__(self, profiler: UpdateProfiler, name: str) -> None:
+        """Initialize the stage."""
+        self._profiler = profiler
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        """Start timing."""
+        self._start = perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Record the stage unless it was interrupted."""
+        if exc_type is None:
+            self._profiler.async_record(self._name, perf_counter() - self._start)
+
+
+class _Evaluation(_Stage):
+    """Time a whole helper update and count it towards a capture."""
+
+    __slots__ = ()
+
+    def __init__(self, profiler: UpdateProfiler) -> None:
+        """Initialize the evaluation."""
+        super().__init__(profiler, STAGE_UPDATE)
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Record the update and end the capture once enough have run."""
+        super().__exit__(exc_type, exc, traceback)
+        self._profiler.async_evaluation_done()
+
+
+class UpdateProfiler:
+    """Collect stage timings of helper updates while enabled.
+
+    Timings are kept for the most recent updates of each stage. A cProfile
+    capture can also be taken over a number of updates, it is written to the
+    config directory when they have run.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the profiler, disabled."""
+        self._hass = hass
+        self.enabled = False
+        self._timings: dict[str, deque[float]] = {}
+        self._profile: cProfile.Profile | None = None
+        self._remaining = 0
+        self._profile_path: str | None = None
+
+    @callback
+    def stage(self, name: str) -> AbstractContextManager[None]:
+        """Return a context manager timing a stage."""
+        if not self.enabled:
+            return _DISABLED
+        return _Stage(self, name)
+
+    @callback
+    def evaluation(self) -> AbstractContextManager[None]:
+        """Return a context manager timing a whole helper update."""
+        if not self.enabled:
+            return _DISABLED
+        return _Evaluation(self)
+
+    @callback
+    def async_record(self, name: str, duration: float) -> None:
+        """Record how long a stage took."""
+        timings = self._timings.get(name)
+        if timings is None:
+            timings = self._timings[name] = deque(maxlen=PROFILE_SAMPLES)
+        timings.append(duration)
+
+    @callback
+    def async_start(self, evaluations: int | None = None) -> None:
+        """Start collecting timings, capturing a profile of some updates."""
+        self.async_stop()
+        if evaluations:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError as err:
+                raise HomeAssistantError(
+                    translation_domain=DOMAIN,
+                    translation_key="profiler_in_use",
+                ) from err
+            self._profile = profile
+            self._remaining = evaluations
+        self._timings.clear()
+        self._profile_path = None
+        self.enabled = True
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop collecting timings, writing any profile being captured."""
+        self.enabled = False
+        self._async_end_capture()
+
+    @callback
+    def async_evaluation_done(self) -> None:
+        """Count an update towards the profile being captured."""
+        if self._profile is None:
+            return
+        self._remaining -= 1
+        if self._remaining <= 0:
+            self._async_end_capture()
+
+    @callback
+    def async_statistics(self) -> dict[str, JsonValueType]:
+        """Return the recorded timings of each stage in milliseconds."""
+        statistics: dict[str, JsonValueType] = {}
+        for name in STAGES:
+            timings = self._timings.get(name)
+            if not timings:
+                continue
+            statistics[name] = {
+                "count": len(timings),
+                "mean": round(sum(timings) / len(timings) * 1000, 3),
+                "max": round(max(timings) * 1000, 3),
+            }
+        return statistics
+
+    @property
+    def profile_path(self) -> str | None:
+        """Return where the last profile was written."""
+        return self._profile_path
+
+    @callback
+    def _async_end_capture(self) -> None:
+        """Stop the profile being captured and write it out."""
+        if (profile := self._profile) is None:
+            return
+        profile.disable()
+        self._profile = None
+        self._remaining = 0
+        timestamp = async_get_clock(self._hass).utcnow().strftime("%Y%m%d%H%M%S")
+        path = self._hass.config.path(f"{DOMAIN}_profile_{timestamp}.prof")
+        self._profile_path = path
+        LOGGER.info("Writing calendar_event profile to %s", path)
+        self._hass.async_add_executor_job(profile.dump_stats, path)
+
+
+class TimerDriftMonitor:
+    """Record how late helper timers run compared to when they were due.
+
+    Drift of schedule_update shows how late the event loop ran the timer,
+    drift of update_state adds the wait for the update task to start.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the monitor."""
+        self._drift: dict[str, deque[float]] = {
+            DRIFT_SCHEDULE_UPDATE: deque(maxlen=PROFILE_SAMPLES),
+            DRIFT_UPDATE_STATE: deque(maxlen=PROFILE_SAMPLES),
+        }
+
+    @callback
+    def async_record(self, name: str, drift: float) -> None:
+        """Record how many seconds late a timer ran."""
+        self._drift[name].append(drift)
+
+    @callback
+    def async_statistics(self) -> dict[str, JsonValueType]:
+        """Return drift percentiles and the worst case in milliseconds."""
+        return {
+            name: percentile_statistics(drift)
+            for name, drift in self._drift.items()
+            if drift
+        }
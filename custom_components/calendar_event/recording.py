@@ -0,0 +1,216 @@
+"""Recording of calendar.get_events responses for calendar_event."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from asyncio import TimerHandle
+from collections.abc import Collection
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.json import json_dumps
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util.hass_dict import HassKey
+
+from .clock import async_get_clock
+from .const import (
+    ATTR_CALENDAR,
+    ATTR_DESCRIPTION,
+    ATTR_END_DATE_TIME,
+    ATTR_LOCATION,
+    ATTR_START_DATE_TIME,
+    ATTR_SUMMARY,
+    DOMAIN,
+    LOGGER,
+    RECORDING_FLUSH_SIZE,
+)
+
+DATA_RECORDER: HassKey[ResponseRecorder] = HassKey(f"{DOMAIN}_recorder")
+
+_REDACTED_FIELDS = (ATTR_SUMMARY, ATTR_DESCRIPTION, ATTR_LOCATION)
+
+
+@callback
+@singleton(DATA_RECORDER)
+def async_get_recorder(hass: HomeAssistant) -> ResponseRecorder:
+    """Return the response recorder of the integration."""
+    return ResponseRecorder(hass)
+
+
+def redact_text(value: Any) -> Any:
+    """Replace event text with a token that is equal for equal text."""
+    if not isinstance(value, str) or not value:
+        return value
+    return f"redacted-{hashlib.sha256(value.encode()).hexdigest()[:12]}"
+
+
+def _redact_response(response: Any) -> Any:
+    """Return a get_events response with the event text redacted."""
+    if not isinstance(response, dict):
+        return response
+    redacted: dict[str, Any] = {}
+    for calendar_entity_id, calendar in response.items():
+        events = calendar.get("events") if isinstance(calendar, dict) else None
+        if not isinstance(events, list):
+            redacted[calendar_entity_id] = calendar
+            continue
+        redacted[calendar_entity_id] = {
+            **calendar,
+            "events": [
+                {
+                    key: redact_text(value) if key in _REDACTED_FIELDS else value
+                    for key, value in event.items()
+                }
+                if isinstance(event, dict)
+                else event
+                for event in events
+            ],
+        }
+    return redacted
+
+
+def _append_lines(path: str, lines: list[str]) -> None:
+    """Append lines to a file."""
+    with open(path, "a", encoding="utf-8") as file:
+        file.writelines(f"{line}\n" for line in lines)
+
+
+class ResponseRecorder:
+    """Write calendar.get_events responses to a JSON lines file.
+
+    Each line holds the calendar, the requested range, when it was fetched
+    and the raw response, optionally with the event text redacted. Lines are
+    buffered and appended in the executor, in order, and written out when
+    Home Assistant stops.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the recorder, stopped."""
+        self._hass = hass
+        self._clock = async_get_clock(hass)
+        self._path: str | None = None
+        self._redact = False
+        self._calendar_entity_ids: frozenset[str] | None = None
+        self._lines: list[str] = []
+        self._count = 0
+        self._flush: asyncio.Task[None] | None = None
+        self._timer: TimerHandle | None = None
+        self._unsubscribe_stop: CALLBACK_TYPE | None = None
+
+    @property
+    def recording(self) -> bool:
+        """Return if responses are being recorded."""
+        return self._path is not None
+
+    @callback
+    def async_start(
+        self,
+        *,
+        redact: bool = False,
+        calendar_entity_ids: Collection[str] | None = None,
+        duration: float | None = None,
+    ) -> str:
+        """Start recording responses to a new file in the config directory.
+
+        Only the responses of calendar_entity_ids are recorded when given, and
+        the recording stops by itself after duration seconds when given.
+        """
+        if self._path is not None:
+            return self._path
+        timestamp = self._clock.utcnow().strftime("%Y%m%d%H%M%S")
+        self._path = self._hass.config.path(f"{DOMAIN}_responses_{timestamp}.jsonl")
+        self._redact = redact
+        self._calendar_entity_ids = (
+            frozenset(calendar_entity_ids) if calendar_entity_ids is not None else None
+        )
+        self._count = 0
+        if duration is not None:
+            self._timer = self._clock.call_later(duration, self._async_stop_later)
+        self._unsubscribe_stop = self._hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._async_stop_on_shutdown
+        )
+        LOGGER.info("Recording calendar responses to %s", self._path)
+        return self._path
+
+    async def async_stop(self) -> tuple[str | None, int]:
+        """Stop recording, returning the file and how many responses it holds."""
+        path = self._path
+        if path is None:
+            return None, 0
+        self._async_flush()
+        self._path = None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._unsubscribe_stop is not None:
+            self._unsubscribe_stop()
+            self._unsubscribe_stop = None
+        if self._flush is not None:
+            await self._flush
+        return path, self._count
+
+    @callback
+    def _async_stop_later(self) -> None:
+        """Stop recording once its duration has passed."""
+        self._timer = None
+        self._hass.async_create_background_task(
+            self.async_stop(), f"{DOMAIN} stop recording"
+        )
+
+    async def _async_stop_on_shutdown(self, event: Event) -> None:
+        """Write out the buffered responses as Home Assistant stops."""
+        self._unsubscribe_stop = None
+        await self.async_stop()
+
+    @callback
+    def async_record(
+        self,
+        calendar_entity_id: str,
+        start_date_time: str,
+        end_date_time: str,
+        fetched_at: float,
+        response: Any,
+    ) -> None:
+        """Record a get_events response."""
+        if self._path is None or (
+            self._calendar_entity_ids is not None
+            and calendar_entity_id not in self._calendar_entity_ids
+        ):
+            return
+        self._lines.append(
+            json_dumps(
+                {
+                    ATTR_CALENDAR: calendar_entity_id,
+                    ATTR_START_DATE_TIME: start_date_time,
+                    ATTR_END_DATE_TIME: end_date_time,
+                    "fetched_at": fetched_at,
+                    "response": _redact_response(response)
+                    if self._redact
+                    else response,
+                }
+            )
+        )
+        self._count += 1
+        if len(self._lines) >= RECORDING_FLUSH_SIZE:
+            self._async_flush()
+
+    @callback
+    def _async_flush(self) -> None:
+        """Append the buffered lines after any earlier flush."""
+        if not self._lines or self._path is None:
+            return
+        self._flush = self._hass.async_create_background_task(
+            self._async_write(self._flush, self._path, self._lines),
+            f"{DOMAIN} write responses",
+        )
+        self._lines = []
+
+    async def _async_write(
+        self, previous: asyncio.Task[None] | None, path: str, lines: list[str]
+    ) -> None:
+        """Write lines once the previous flush has finished."""
+        if previous is not None:
+            await previous
+        await self._hass.async_add_executor_job(_append_lines, path, lines)
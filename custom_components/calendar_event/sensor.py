@@ -0,0 +1,97 @@
+"""Sensor platform for calendar_event."""
+
+from __future__ import annotations
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+
+from .const import (
+    CONF_CALENDAR_ENTITY_ID,
+    CONF_DURATION_SENSORS,
+    CONF_ROLLING_WINDOW,
+    DEFAULT_ROLLING_WINDOW,
+    DOMAIN,
+)
+from .duration import PERIODS, MatchedTimeTracker
+from .matcher import EventMatcher
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+) -> None:
+    """Initialize the matched time sensors of a Calendar Event config entry."""
+
+    if not config_entry.options.get(CONF_DURATION_SENSORS, False):
+        return
+
+    rolling_window = config_entry.options.get(CONF_ROLLING_WINDOW)
+    tracker = MatchedTimeTracker(
+        hass,
+        config_entry.entry_id,
+        config_entry.options[CONF_CALENDAR_ENTITY_ID],
+        EventMatcher.from_options(config_entry.options),
+        cv.time_period_dict(rolling_window).total_seconds()
+        if rolling_window
+        else DEFAULT_ROLLING_WINDOW,
+    )
+    config_entry.async_on_unload(tracker.async_stop)
+
+    async_add_entities(
+        [
+            MatchedDurationSensor(
+                tracker, config_entry.options.get("name"), config_entry.entry_id, period
+            )
+            for period in PERIODS
+        ]
+    )
+
+    config_entry.async_create_background_task(
+        hass, tracker.async_start(), f"{DOMAIN} start matched time tracker"
+    )
+
+
+class MatchedDurationSensor(SensorEntity):
+    """Representation of the time a Calendar Event helper matched in a period."""
+
+    _attr_should_poll = False
+    _attr_has_entity_name = True
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.HOURS
+    _attr_suggested_display_precision = 2
+
+    def __init__(
+        self,
+        tracker: MatchedTimeTracker,
+        name: str | None,
+        config_entry_id: str,
+        period: str,
+    ) -> None:
+        """Initialize the matched time sensor."""
+        self._tracker = tracker
+        self._period = period
+        self._attr_unique_id = f"{config_entry_id}_matched_{period}"
+        self._attr_translation_key = f"matched_{period}"
+        self._attr_translation_placeholders = {"name": name or ""}
+
+    async def async_added_to_hass(self) -> None:
+        """Handle added to Hass."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._tracker.async_add_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def native_value(self) -> float:
+        """Return the hours matched in the period."""
+        return round(self._tracker.totals[self._period] / 3600, 4)
@@ -0,0 +1,385 @@
+"""Services for calendar_event."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, cast
+
+import voluptuous as vol
+
+from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv, service
+from homeassistant.helpers.entity_platform import async_get_platforms
+from homeassistant.helpers.target import TargetSelectorData
+from homeassistant.util import dt as dt_util
+
+from .cache import async_get_event_cache
+from .clock import async_get_clock
+from .const import (
+    ATTR_DURATION,
+    ATTR_END_DATE_TIME,
+    ATTR_EVALUATIONS,
+    ATTR_EVENTS,
+    ATTR_INTERVALS,
+    ATTR_ON_TIME,
+    ATTR_PATH,
+    ATTR_PROFILE,
+    ATTR_REDACT,
+    ATTR_RESPONSES,
+    ATTR_STAGES,
+    ATTR_START_DATE_TIME,
+    BACKFILL_DURATION,
+    CACHE_WINDOW,
+    COMPARISON_METHODS,
+    CONF_CALENDAR_ENTITY_ID,
+    CONF_COMPARISON_METHOD,
+    CONF_MATCH,
+    CONF_MATCH_ATTRIBUTE,
+    CONF_NORMALIZE,
+    DOMAIN,
+    MATCH_ATTRIBUTES,
+    SERVICE_BACKFILL,
+    SERVICE_FIND_MATCHES,
+    SERVICE_GET_FETCH_STATISTICS,
+    SERVICE_GET_TIMER_DRIFT,
+    SERVICE_REFRESH,
+    SERVICE_START_PROFILING,
+    SERVICE_START_RECORDING,
+    SERVICE_STOP_PROFILING,
+    SERVICE_STOP_RECORDING,
+)
+from .history import async_get_on_intervals
+from .limiter import async_get_fetch_limiter
+from .matcher import EventMatcher
+from .profiling import async_get_profiler, async_get_timer_drift
+from .recording import async_get_recorder
+
+if TYPE_CHECKING:
+    from .binary_sensor import CalendarEventBinarySensor
+
+FIND_MATCHES_SCHEMA = vol.All(
+    cv.has_at_most_one_key(ATTR_END_DATE_TIME, ATTR_DURATION),
+    vol.Schema(
+        {
+            vol.Required(CONF_CALENDAR_ENTITY_ID): cv.entities_domain("calendar"),
+            vol.Required(CONF_MATCH): cv.string,
+            vol.Optional(CONF_MATCH_ATTRIBUTE, default="summary"): vol.In(
+                MATCH_ATTRIBUTES
+            ),
+            vol.Optional(CONF_COMPARISON_METHOD, default="contains"): vol.In(
+                COMPARISON_METHODS
+            ),
+            vol.Optional(CONF_NORMALIZE, default=False): cv.boolean,
+            vol.Optional(ATTR_START_DATE_TIME): cv.datetime,
+            vol.Optional(ATTR_END_DATE_TIME): cv.datetime,
+            vol.Optional(ATTR_DURATION): vol.All(cv.time_period, cv.positive_timedelta),
+        }
+    ),
+)
+
+BACKFILL_SCHEMA = vol.All(
+    cv.make_entity_service_schema(
+        {
+            vol.Optional(ATTR_START_DATE_TIME): cv.datetime,
+            vol.Optional(ATTR_END_DATE_TIME): cv.datetime,
+            vol.Optional(ATTR_DURATION): vol.All(cv.time_period, cv.positive_timedelta),
+        }
+    ),
+    cv.has_at_most_one_key(ATTR_START_DATE_TIME, ATTR_DURATION),
+)
+
+REFRESH_SCHEMA = vol.Schema(cv.ENTITY_SERVICE_FIELDS)
+
+START_PROFILING_SCHEMA = vol.Schema(
+    {vol.Optional(ATTR_EVALUATIONS): vol.All(vol.Coerce(int), vol.Range(min=1))}
+)
+
+START_RECORDING_SCHEMA = vol.Schema(
+    {
+        **cv.ENTITY_SERVICE_FIELDS,
+        vol.Optional(ATTR_REDACT, default=False): cv.boolean,
+        vol.Optional(ATTR_DURATION): vol.All(cv.time_period, cv.positive_timedelta),
+    }
+)
+
+
+def _validate_range(start: datetime, end: datetime) -> None:
+    """Raise if a time range is empty."""
+    if end <= start:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="end_before_start",
+        )
+
+
+def _search_range(call: ServiceCall, now: datetime) -> tuple[datetime, datetime | None]:
+    """Return the range find_matches searches.
+
+    Without a range the search runs to the end of the cached window, which the
+    clock moving on since it was fetched would otherwise overshoot.
+    """
+    start = dt_util.as_utc(call.data.get(ATTR_START_DATE_TIME, now))
+    end: datetime | None = None
+    if ATTR_END_DATE_TIME in call.data:
+        end = dt_util.as_utc(call.data[ATTR_END_DATE_TIME])
+    elif ATTR_DURATION in call.data:
+        end = start + call.data[ATTR_DURATION]
+    elif ATTR_START_DATE_TIME in call.data:
+        end = start + timedelta(seconds=CACHE_WINDOW)
+    if end is not None:
+        _validate_range(start, end)
+    return start, end
+
+
+async def _async_backfill(
+    entity: CalendarEventBinarySensor, call: ServiceCall
+) -> ServiceResponse:
+    """Return when a helper would have been on over a past range."""
+    now = async_get_clock(entity.hass).utcnow()
+    end = dt_util.as_utc(call.data.get(ATTR_END_DATE_TIME, now))
+    if ATTR_START_DATE_TIME in call.data:
+        start = dt_util.as_utc(call.data[ATTR_START_DATE_TIME])
+    else:
+        start = end - call.data.get(ATTR_DURATION, timedelta(seconds=BACKFILL_DURATION))
+    _validate_range(start, end)
+
+    starts, ends = await async_get_on_intervals(
+        entity.hass,
+        entity.calendar_entity_ids,
+        entity.matcher,
+        start.timestamp(),
+        end.timestamp(),
+    )
+    return {
+        ATTR_ON_TIME: float((ends - starts).sum()),
+        ATTR_INTERVALS: [
+            {
+                "start": dt_util.as_local(dt_util.utc_from_timestamp(on)).isoformat(),
+                "end": dt_util.as_local(dt_util.utc_from_timestamp(off)).isoformat(),
+            }
+            for on, off in zip(starts.tolist(), ends.tolist(), strict=True)
+        ],
+    }
+
+
+@callback
+def _async_refresh_targets(
+    hass: HomeAssistant, call: ServiceCall
+) -> tuple[list[CalendarEventBinarySensor], set[str]]:
+    """Return the helpers a refresh updates and the calendars it reads.
+
+    Targeting a helper reads all of its calendars, targeting a calendar reads
+    just that calendar and updates the helpers watching it. Every helper is
+    targeted when no target is given. Recordings are limited to the same
+    calendars.
+    """
+    helpers = [
+        cast("CalendarEventBinarySensor", entity)
+        for platform in async_get_platforms(hass, DOMAIN)
+        if platform.domain == BINARY_SENSOR_DOMAIN
+        for entity in platform.entities.values()
+    ]
+    if TargetSelectorData(call.data).has_any_selector:
+        selected = service.async_extract_referenced_entity_ids(hass, call)
+        targeted = selected.referenced | selected.indirectly_referenced
+    else:
+        targeted = {helper.entity_id for helper in helpers}
+
+    calendar_entity_ids: set[str] = set()
+    updated: list[CalendarEventBinarySensor] = []
+    for helper in helpers:
+        if helper.entity_id in targeted:
+            calendar_entity_ids.update(helper.calendar_entity_ids)
+            updated.append(helper)
+        elif not targeted.isdisjoint(helper.calendar_entity_ids):
+            calendar_entity_ids.update(
+                targeted.intersection(helper.calendar_entity_ids)
+            )
+            updated.append(helper)
+    return updated, calendar_entity_ids
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the calendar_event services."""
+
+    async def async_find_matches(call: ServiceCall) -> ServiceResponse:
+        """Return the events of the calendars matching the given criteria."""
+        start, end = _search_range(call, async_get_clock(hass).utcnow())
+
+        calendar_entity_ids: list[str] = call.data[CONF_CALENDAR_ENTITY_ID]
+        for calendar_entity_id in calendar_entity_ids:
+            if hass.states.get(calendar_entity_id) is None:
+                raise ServiceValidationError(
+                    translation_domain=DOMAIN,
+                    translation_key="unknown_calendar",
+                    translation_placeholders={"entity_id": calendar_entity_id},
+                )
+
+        matcher = EventMatcher.from_options(call.data)
+        cache = async_get_event_cache(hass)
+        results = await asyncio.gather(
+            *(
+                cache.async_get_events(
+                    calendar_entity_id,
+                    start.timestamp(),
+                    end.timestamp() if end is not None else None,
+                )
+                for calendar_entity_id in calendar_entity_ids
+            )
+        )
+
+        # Unlike a helper's state, a response can't leave a calendar out unnoticed
+        for calendar_entity_id, events in zip(
+            calendar_entity_ids, results, strict=True
+        ):
+            if events is None:
+                raise HomeAssistantError(
+                    translation_domain=DOMAIN,
+                    translation_key="fetch_failed",
+                    translation_placeholders={"entity_id": calendar_entity_id},
+                )
+
+        matches = sorted(
+            (
+                event
+                for events in results
+                if events is not None
+                for event in events
+                if matcher.matches(event)
+            ),
+            key=lambda event: event.start,
+        )
+        return {ATTR_EVENTS: [event.as_dict() for event in matches]}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIND_MATCHES,
+        async_find_matches,
+        schema=FIND_MATCHES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_refresh(call: ServiceCall) -> None:
+        """Fetch the calendars of helpers once each and update the helpers."""
+        helpers, calendar_entity_ids = _async_refresh_targets(hass, call)
+        cache = async_get_event_cache(hass)
+        refresh_after = async_get_clock(hass).timestamp()
+        await asyncio.gather(
+            *(
+                cache.async_get_snapshot(
+                    calendar_entity_id, refresh_after=refresh_after
+                )
+                for calendar_entity_id in calendar_entity_ids
+            )
+        )
+        await asyncio.gather(*(helper.async_refresh() for helper in helpers))
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH, async_refresh, schema=REFRESH_SCHEMA
+    )
+
+    service.async_register_platform_entity_service(
+        hass,
+        DOMAIN,
+        SERVICE_BACKFILL,
+        entity_domain=BINARY_SENSOR_DOMAIN,
+        schema=BACKFILL_SCHEMA,
+        func=_async_backfill,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    @callback
+    def async_start_profiling(call: ServiceCall) -> None:
+        """Start timing the stages of helper updates."""
+        async_get_profiler(hass).async_start(call.data.get(ATTR_EVALUATIONS))
+
+    @callback
+    def async_stop_profiling(call: ServiceCall) -> ServiceResponse:
+        """Stop timing helper updates and return the timings."""
+        profiler = async_get_profiler(hass)
+        profiler.async_stop()
+        return {
+            ATTR_STAGES: profiler.async_statistics(),
+            ATTR_PROFILE: profiler.profile_path,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_PROFILING,
+        async_start_profiling,
+        schema=START_PROFILING_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_PROFILING,
+        async_stop_profiling,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    @callback
+    def async_start_recording(call: ServiceCall) -> ServiceResponse:
+        """Start recording the responses of the targeted calendars, or all."""
+        calendar_entity_ids = None
+        if TargetSelectorData(call.data).has_any_selector:
+            calendar_entity_ids = _async_refresh_targets(hass, call)[1]
+        duration = call.data.get(ATTR_DURATION)
+        return {
+            ATTR_PATH: async_get_recorder(hass).async_start(
+                redact=call.data[ATTR_REDACT],
+                calendar_entity_ids=calendar_entity_ids,
+                duration=duration.total_seconds() if duration is not None else None,
+            )
+        }
+
+    async def async_stop_recording(call: ServiceCall) -> ServiceResponse:
+        """Stop recording calendar responses and return where they were written."""
+        path, responses = await async_get_recorder(hass).async_stop()
+        return {ATTR_PATH: path, ATTR_RESPONSES: responses}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_RECORDING,
+        async_start_recording,
+        schema=START_RECORDING_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_RECORDING,
+        async_stop_recording,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    @callback
+    def async_get_timer_drift_statistics(call: ServiceCall) -> ServiceResponse:
+        """Return how late helper timers have been running."""
+        return async_get_timer_drift(hass).async_statistics()
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_TIMER_DRIFT,
+        async_get_timer_drift_statistics,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    @callback
+    def async_get_fetch_statistics(call: ServiceCall) -> ServiceResponse:
+        """Return how many fetches wait for a slot and for how long."""
+        return async_get_fetch_limiter(hass).async_statistics()
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_FETCH_STATISTICS,
+        async_get_fetch_statistics,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -1,12 +1,31 @@
 """Tests for calendar_event integration."""
 
+from datetime import datetime
+from typing import Any
+
 import pytest
+from custom_components.calendar_event.const import (
+    CONF_CALENDAR_ENTITY_ID,
+    CONF_MATCH,
+    DOMAIN,
+)
+from custom_components.calendar_event.models import CalendarEventRecord
+from freezegun.api import FrozenDateTimeFactory
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+from homeassistant.util import dt as dt_util
 
 pytestmark = pytest.mark.asyncio
 
+MEETING_EVENT = {
+    "start": "2025-01-06T09:00:00+00:00",
+    "end": "2025-01-06T10:00:00+00:00",
+    "summary": "Team Meeting",
+    "description": "Weekly sync",
+    "location": "Board Room A",
+}
+
 
 async def setup_integration(hass: HomeAssistant, config_entry: MockConfigEntry) -> None:
     """Fixture for setting up the component."""
@@ -14,3 +33,71 @@ async def setup_integration(hass: HomeAssistant, config_entry: MockConfigEntry)
 
     await hass.config_entries.async_setup(config_entry.entry_id)
     await hass.async_block_till_done()
+
+
+def mock_event(
+    summary: str = "",
+    description: str = "",
+    location: str = "",
+    calendar_entity_id: str = "calendar.test_calendar",
+) -> CalendarEventRecord:
+    """Return an event record that is in progress."""
+    return CalendarEventRecord.create(
+        calendar_entity_id, 0, 4102444800, summary, description, location
+    )
+
+
+def _parse(value: str) -> datetime:
+    """Parse a datetime, or a date starting at local midnight."""
+    return dt_util.as_utc(dt_util.parse_datetime(value, raise_on_error=True))
+
+
+class MockCalendarBackend:
+    """Stand-in for the calendar.get_events service."""
+
+    def __init__(self) -> None:
+        """Initialize the backend with no events."""
+        self.events: dict[str, list[dict[str, Any]]] = {}
+        self.calls: list[dict[str, Any]] = []
+
+    async def async_get_events(self, call: ServiceCall) -> ServiceResponse:
+        """Return the events overlapping the requested range."""
+        self.calls.append(dict(call.data))
+        entity_ids = call.data["entity_id"]
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        start = _parse(call.data["start_date_time"])
+        end = _parse(call.data["end_date_time"])
+        return {
+            entity_id: {
+                "events": [
+                    event
+                    for event in self.events.get(entity_id, [])
+                    if _parse(event["start"]) < end and _parse(event["end"]) > start
+                ]
+            }
+            for entity_id in entity_ids
+        }
+
+
+async def setup_meeting_helper(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Set up a helper watching a calendar with a meeting in progress."""
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    calendar_backend.events = {"calendar.work": [MEETING_EVENT]}
+    hass.states.async_set("calendar.work", "on")
+    await setup_integration(
+        hass,
+        MockConfigEntry(
+            domain=DOMAIN,
+            version=3,
+            options={
+                "name": "Meeting",
+                CONF_CALENDAR_ENTITY_ID: ["calendar.work"],
+                CONF_MATCH: "meeting",
+            },
+        ),
+    )
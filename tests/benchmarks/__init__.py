@@ -0,0 +1,6 @@
+"""Benchmarks for calendar_event.
+
+Benchmarks run as part of the normal test suite with modest sizes and assert on
+relative cost, run them on their own with ``pytest tests/benchmarks -s`` to see
+the measurements.
+"""
@@ -0,0 +1,66 @@
+"""Speed of evaluating criteria over a long history."""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+from custom_components.calendar_event.history import (
+    matching_intervals,
+    merge_intervals,
+)
+from custom_components.calendar_event.matcher import EventMatcher
+from custom_components.calendar_event.models import CalendarEventRecord
+
+EVENT_COUNT = 50000
+
+
+def _merge_in_python(
+    intervals: list[tuple[float, float]],
+) -> list[tuple[float, float]]:
+    """Merge intervals one at a time."""
+    merged: list[tuple[float, float]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def test_backfill_speed() -> None:
+    """Test merging is vectorized and matching scales with distinct events."""
+    rng = np.random.default_rng(0)
+    starts = rng.uniform(0, 90 * 24 * 60 * 60, EVENT_COUNT)
+    ends = starts + rng.uniform(15 * 60, 2 * 60 * 60, EVENT_COUNT)
+    events = [
+        CalendarEventRecord.create(
+            "calendar.work", start, end, f"Standup {index % 50}", "Daily sync"
+        )
+        for index, (start, end) in enumerate(
+            zip(starts.tolist(), ends.tolist(), strict=True)
+        )
+    ]
+
+    begin = time.perf_counter()
+    python_merged = _merge_in_python(list(zip(starts, ends, strict=True)))
+    python_time = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    merged_starts, merged_ends = merge_intervals(starts, ends, 0, float(ends.max()))
+    numpy_time = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    matching_intervals(
+        events, EventMatcher("standup 1", "summary", "starts_with"), 0, ends.max()
+    )
+    matching_time = time.perf_counter() - begin
+
+    print(  # noqa: T201
+        f"{EVENT_COUNT} intervals: python merge {python_time * 1000:.1f} ms, "
+        f"numpy merge {numpy_time * 1000:.1f} ms, "
+        f"match and merge {matching_time * 1000:.1f} ms"
+    )
+    assert merged_starts.tolist() == [start for start, _ in python_merged]
+    assert merged_ends.tolist() == [end for _, end in python_merged]
+    assert numpy_time < python_time
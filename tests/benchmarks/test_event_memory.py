@@ -0,0 +1,69 @@
+"""Memory usage of cached calendar events."""
+
+from __future__ import annotations
+
+import gc
+import json
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from custom_components.calendar_event.models import CalendarEventRecord
+
+EVENT_COUNT = 5000
+
+
+def _service_response(count: int) -> str:
+    """Return a get_events response shaped like a recurring-heavy calendar."""
+    start = datetime(2025, 1, 6, 9, tzinfo=UTC)
+    events = [
+        {
+            "start": (start + timedelta(minutes=30 * index)).isoformat(),
+            "end": (start + timedelta(minutes=30 * index + 25)).isoformat(),
+            "summary": f"Standup {index % 20}",
+            "description": "Daily sync with the platform team. " * 4,
+            "location": "Board Room A",
+        }
+        for index in range(count)
+    ]
+    return json.dumps({"calendar.work": {"events": events}})
+
+
+def _retained_size(factory: Callable[[], Any]) -> tuple[Any, int]:
+    """Return the object built by factory and the memory it keeps alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = factory()
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, after - before
+
+
+def test_event_record_memory() -> None:
+    """Test records retain much less memory than service response dicts."""
+    payload = _service_response(EVENT_COUNT)
+
+    events, dict_size = _retained_size(
+        lambda: json.loads(payload)["calendar.work"]["events"]
+    )
+    assert len(events) == EVENT_COUNT
+    del events
+
+    records, record_size = _retained_size(
+        lambda: [
+            CalendarEventRecord.from_service_event("calendar.work", event)
+            for event in json.loads(payload)["calendar.work"]["events"]
+        ]
+    )
+    assert all(record is not None for record in records)
+
+    print(  # noqa: T201
+        f"{EVENT_COUNT} events: dicts {dict_size / EVENT_COUNT:.0f} B/event, "
+        f"records {record_size / EVENT_COUNT:.0f} B/event"
+    )
+    assert record_size < dict_size / 2
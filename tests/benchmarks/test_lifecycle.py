@@ -0,0 +1,220 @@
+"""Resources left behind by helpers that come and go."""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from custom_components.calendar_event.cache import async_get_event_cache
+from custom_components.calendar_event.const import (
+    CONF_CALENDAR_ENTITY_ID,
+    CONF_DURATION_SENSORS,
+    CONF_FILTERED_CALENDAR,
+    CONF_MATCH,
+    CONF_REFRESH_CLASS,
+    DOMAIN,
+    REFRESH_CLASSES,
+)
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.config_entries import RELOAD_AFTER_UPDATE_DELAY, ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity_platform import DATA_ENTITY_PLATFORM
+from homeassistant.helpers.event import _KeyedEventData
+from homeassistant.util import dt as dt_util
+
+from .. import MockCalendarBackend
+
+if TYPE_CHECKING:
+    from freezegun.api import FrozenDateTimeFactory
+
+CYCLES = 40
+WARMUP_CYCLES = 10
+HELPERS = 25
+CALENDARS = ("calendar.family", "calendar.work")
+MATCHES = ("dentist", "standup", "school", "réunion", "gym")
+# The bounded timing samples still filling up stay below this, while a helper
+# left behind holds several kilobytes, so leaking one per cycle goes over it
+MEMORY_GROWTH = 128 * 1024
+
+
+def _helper_options(index: int) -> dict[str, Any]:
+    """Return the options of a helper, varying the features it uses."""
+    return {
+        "name": f"Helper {index}",
+        CONF_CALENDAR_ENTITY_ID: list(CALENDARS[: 1 + index % len(CALENDARS)]),
+        CONF_MATCH: MATCHES[index % len(MATCHES)],
+        CONF_DURATION_SENSORS: index % 3 == 0,
+        CONF_FILTERED_CALENDAR: index % 4 == 0,
+        CONF_REFRESH_CLASS: REFRESH_CLASSES[index % len(REFRESH_CLASSES)],
+    }
+
+
+def _resources(hass: HomeAssistant) -> dict[str, int]:
+    """Return the listeners, timers and tasks alive in Home Assistant."""
+    return {
+        "bus listeners": sum(hass.bus.async_listeners().values()),
+        "tracked entities": sum(
+            len(jobs)
+            for data in hass.data.values()
+            if isinstance(data, _KeyedEventData)
+            for jobs in data.callbacks.values()
+        ),
+        "cache listeners": sum(
+            len(listeners)
+            for listeners in async_get_event_cache(hass)._listeners.values()
+        ),
+        "timers": sum(
+            not handle.cancelled()
+            for handle in hass.loop._scheduled  # type: ignore[attr-defined]
+        ),
+        "tasks": len(hass._tasks) + len(hass._background_tasks),
+    }
+
+
+def _integration_memory() -> int:
+    """Return the bytes still allocated by the integration's own code."""
+    # Removed entities and config entries are freed with their reference cycles
+    gc.collect()
+    return sum(
+        stat.size
+        for stat in tracemalloc.take_snapshot()
+        .filter_traces(
+            [
+                tracemalloc.Filter(
+                    inclusive=True,
+                    filename_pattern="*custom_components/calendar_event/*",
+                )
+            ]
+        )
+        .statistics("filename")
+    )
+
+
+async def _async_settle(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Let pending reloads, saves and fetches finish."""
+    for _ in range(2):
+        freezer.tick(timedelta(seconds=RELOAD_AFTER_UPDATE_DELAY + 1))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+
+async def _async_churn(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+    cycle: int,
+) -> None:
+    """Create helpers, exercise them and remove them again."""
+    entries = []
+    for index in range(HELPERS):
+        entry = MockConfigEntry(
+            domain=DOMAIN, version=3, options=_helper_options(cycle + index)
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        entries.append(entry)
+    await hass.async_block_till_done()
+
+    # Calendars turning on and off, showing different events
+    for message in ("Dentist", "Standup", None):
+        freezer.tick(30)
+        for calendar_entity_id in CALENDARS:
+            if message is None:
+                hass.states.async_set(calendar_entity_id, "off")
+            else:
+                hass.states.async_set(calendar_entity_id, "on", {"message": message})
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+    # Options changes reload the helper
+    for entry in entries[::5]:
+        hass.config_entries.async_update_entry(
+            entry, options={**entry.options, CONF_MATCH: "meeting"}
+        )
+    await hass.async_block_till_done()
+
+    # Disabling and enabling a helper reloads it after a delay
+    entity_registry = er.async_get(hass)
+    disabled = [
+        entity.entity_id
+        for entry in entries[1::7]
+        for entity in er.async_entries_for_config_entry(entity_registry, entry.entry_id)
+        if entity.domain == "binary_sensor"
+    ]
+    for entity_id in disabled:
+        entity_registry.async_update_entity(
+            entity_id, disabled_by=er.RegistryEntryDisabler.USER
+        )
+    await _async_settle(hass, freezer)
+    for entity_id in disabled:
+        entity_registry.async_update_entity(entity_id, disabled_by=None)
+    await _async_settle(hass, freezer)
+
+    for entry in entries:
+        await hass.config_entries.async_remove(entry.entry_id)
+    await _async_settle(hass, freezer)
+
+    # Home Assistant keeps unloaded entity platforms listed and removed entities
+    # to restore their settings, and the backend records every call; none of
+    # this is held by the integration
+    hass.data[DATA_ENTITY_PLATFORM][DOMAIN] = [
+        platform
+        for platform in hass.data[DATA_ENTITY_PLATFORM][DOMAIN]
+        if platform.config_entry is None
+        or platform.config_entry.state is ConfigEntryState.LOADED
+    ]
+    entity_registry.deleted_entities.clear()
+    calendar_backend.calls.clear()
+
+
+async def test_lifecycle_churn(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test churning helpers leaves no listeners, timers, tasks or memory."""
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    calendar_backend.events = {
+        calendar_entity_id: [
+            {
+                "start": dt_util.utcnow().replace(minute=0).isoformat(),
+                "end": (dt_util.utcnow() + timedelta(hours=1)).isoformat(),
+                "summary": summary,
+            }
+            for summary in ("Dentist", "Standup", "Réunion")
+        ]
+        for calendar_entity_id in CALENDARS
+    }
+    for calendar_entity_id in CALENDARS:
+        hass.states.async_set(calendar_entity_id, "off")
+
+    tracemalloc.start()
+    try:
+        # The first rounds create the shared caches, limiter and monitors
+        for cycle in range(WARMUP_CYCLES):
+            await _async_churn(hass, freezer, calendar_backend, cycle)
+        baseline = _resources(hass)
+        baseline_memory = _integration_memory()
+
+        for cycle in range(WARMUP_CYCLES, CYCLES):
+            await _async_churn(hass, freezer, calendar_backend, cycle)
+
+        resources = _resources(hass)
+        memory = _integration_memory()
+    finally:
+        tracemalloc.stop()
+
+    print(  # noqa: T201
+        f"{CYCLES * HELPERS} helpers created and removed, "
+        f"{memory - baseline_memory} bytes held by the integration, {resources}"
+    )
+    assert not hass.config_entries.async_entries(DOMAIN)
+    assert resources == baseline
+    assert memory - baseline_memory < MEMORY_GROWTH
@@ -0,0 +1,55 @@
+"""Calendar traffic of helpers over a replayed week."""
+
+from __future__ import annotations
+
+import time
+from datetime import UTC, datetime
+
+from custom_components.calendar_event.const import (
+    CONF_CALENDAR_ENTITY_ID,
+    CONF_MATCH,
+    DOMAIN,
+)
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from .. import setup_integration
+from ..replay import CalendarReplay, load_recorded_events
+
+MATCHES = ("dentist", "standup", "lunch", "meeting", "retro")
+
+
+async def test_replay_week_traffic(hass: HomeAssistant) -> None:
+    """Test a week of several helpers sharing a calendar replays quickly."""
+    replay = CalendarReplay(
+        hass, datetime(2025, 1, 6, tzinfo=UTC), load_recorded_events("work_week")
+    )
+    await replay.async_start()
+    for match in MATCHES:
+        await setup_integration(
+            hass,
+            MockConfigEntry(
+                domain=DOMAIN,
+                version=3,
+                options={
+                    "name": match,
+                    CONF_CALENDAR_ENTITY_ID: ["calendar.work"],
+                    CONF_MATCH: match,
+                },
+            ),
+        )
+
+    begin = time.perf_counter()
+    await replay.async_run_until(datetime(2025, 1, 13, tzinfo=UTC))
+    elapsed = time.perf_counter() - begin
+
+    print(  # noqa: T201
+        f"{len(MATCHES)} helpers over a week: {replay.fetches} fetches, "
+        f"{replay.writes} state writes, {replay.transitions} transitions "
+        f"in {elapsed:.2f} s"
+    )
+    # Every recorded event turns exactly one helper on and off
+    assert replay.transitions == 2 * 16
+    # Helpers share each fetch
+    assert replay.fetches < replay.writes / len(MATCHES)
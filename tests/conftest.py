@@ -20,7 +20,10 @@ from homeassistant.config_entries import SOURCE_USER
 from homeassistant.const import (
     CONF_NAME,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, SupportsResponse
+from homeassistant.setup import async_setup_component
+
+from . import MockCalendarBackend
 
 pytest_plugins = "pytest_homeassistant_custom_component"
 
@@ -77,3 +80,20 @@ async def load_integration(
     await hass.async_block_till_done()
 
     return config_entry
+
+
+@pytest.fixture
+async def calendar_backend(hass: HomeAssistant) -> MockCalendarBackend:
+    """Register a calendar.get_events service backed by in-memory events.
+
+    The calendar integration is set up first so it doesn't replace the service.
+    """
+    assert await async_setup_component(hass, "calendar", {})
+    backend = MockCalendarBackend()
+    hass.services.async_register(
+        "calendar",
+        "get_events",
+        backend.async_get_events,
+        supports_response=SupportsResponse.ONLY,
+    )
+    return backend
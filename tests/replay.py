@@ -0,0 +1,200 @@
+"""Accelerated replay of recorded calendars for calendar_event tests."""
+
+from __future__ import annotations
+
+import heapq
+import json
+from asyncio import TimerHandle
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from custom_components.calendar_event.clock import DATA_CLOCK, Clock
+
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_STATE_REPORTED
+from homeassistant.core import Event, HomeAssistant, SupportsResponse, callback
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+
+from . import MockCalendarBackend
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load_recording(path: Path) -> dict[str, list[dict[str, Any]]]:
+    """Return the events of each calendar in a recording of get_events responses.
+
+    Recordings are written by calendar_event.start_recording, one response per
+    line. Events returned by several responses are only kept once.
+    """
+    events: dict[str, dict[tuple[tuple[str, Any], ...], dict[str, Any]]] = {}
+    for line in path.read_text().splitlines():
+        if not line:
+            continue
+        for calendar_entity_id, calendar in json.loads(line)["response"].items():
+            calendar_events = events.setdefault(calendar_entity_id, {})
+            for event in calendar["events"]:
+                calendar_events.setdefault(tuple(sorted(event.items())), event)
+    return {
+        calendar_entity_id: list(calendar_events.values())
+        for calendar_entity_id, calendar_events in events.items()
+    }
+
+
+def load_recorded_events(name: str) -> dict[str, list[dict[str, Any]]]:
+    """Return the events of each calendar in a recording fixture."""
+    return load_recording(FIXTURES / f"{name}.jsonl")
+
+
+class ReplayClock(Clock):
+    """Simulated clock whose timers run when the replay advances it."""
+
+    def __init__(self, hass: HomeAssistant, start: datetime) -> None:
+        """Initialize the clock at start."""
+        super().__init__(hass)
+        self._now = start.timestamp()
+        self._timers: list[TimerHandle] = []
+
+    def utcnow(self) -> datetime:
+        """Return the simulated time."""
+        return dt_util.utc_from_timestamp(self._now)
+
+    def timestamp(self) -> float:
+        """Return the simulated time in epoch seconds."""
+        return self._now
+
+    def monotonic(self) -> float:
+        """Return the simulated time, timers run exactly when due."""
+        return self._now
+
+    def call_later(
+        self, delay: float, callback: Callable[..., Any], *args: Any
+    ) -> TimerHandle:
+        """Run callback once the clock has advanced by delay seconds."""
+        handle = TimerHandle(self._now + delay, callback, args, self._hass.loop)
+        heapq.heappush(self._timers, handle)
+        return handle
+
+    async def async_advance(self, until: float) -> None:
+        """Run every timer due before until in order, then move to until."""
+        while self._timers and self._timers[0].when() <= until:
+            handle = heapq.heappop(self._timers)
+            if handle.cancelled():
+                continue
+            self._now = max(self._now, handle.when())
+            handle._run()
+            await self._hass.async_block_till_done()
+        self._now = until
+
+
+class CalendarReplay:
+    """Replay recorded calendars against the integration.
+
+    Calendars switch on and off as their recorded events start and end, like
+    calendar entities do, and calendar.get_events answers from the recording.
+    Fetches, helper state writes and helper on/off transitions are counted.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        start: datetime,
+        events: dict[str, list[dict[str, Any]]],
+    ) -> None:
+        """Initialize the replay, installing its clock."""
+        self.clock = ReplayClock(hass, start)
+        hass.data[DATA_CLOCK] = self.clock
+        self.backend = MockCalendarBackend()
+        self.backend.events = events
+        self.writes = 0
+        self.transitions = 0
+        self._hass = hass
+        self._boundaries = {
+            calendar_entity_id: sorted(
+                {
+                    dt_util.parse_datetime(event[key]).timestamp()
+                    for event in calendar_events
+                    for key in ("start", "end")
+                }
+            )
+            for calendar_entity_id, calendar_events in events.items()
+        }
+
+    @property
+    def fetches(self) -> int:
+        """Return how many times calendar.get_events was called."""
+        return len(self.backend.calls)
+
+    async def async_start(self) -> None:
+        """Register the calendars and start counting helper updates."""
+        # Set up first so the calendar integration doesn't replace the service
+        assert await async_setup_component(self._hass, "calendar", {})
+        self._hass.services.async_register(
+            "calendar",
+            "get_events",
+            self.backend.async_get_events,
+            supports_response=SupportsResponse.ONLY,
+        )
+        self._hass.bus.async_listen(EVENT_STATE_CHANGED, self._async_state_changed)
+        self._hass.bus.async_listen(
+            EVENT_STATE_REPORTED,
+            self._async_state_reported,
+            event_filter=_is_helper_event,
+        )
+        now = self.clock.timestamp()
+        for calendar_entity_id, boundaries in self._boundaries.items():
+            self._async_update_calendar(calendar_entity_id)
+            for boundary in boundaries:
+                if boundary > now:
+                    self.clock.call_later(
+                        boundary - now, self._async_update_calendar, calendar_entity_id
+                    )
+
+    async def async_run_until(self, until: datetime) -> None:
+        """Run the replay up to a time."""
+        await self.clock.async_advance(until.timestamp())
+
+    @callback
+    def _async_update_calendar(self, calendar_entity_id: str) -> None:
+        """Set a calendar state from its events in progress."""
+        now = self.clock.timestamp()
+        in_progress = [
+            event
+            for event in self.backend.events[calendar_entity_id]
+            if dt_util.parse_datetime(event["start"]).timestamp()
+            <= now
+            < dt_util.parse_datetime(event["end"]).timestamp()
+        ]
+        if in_progress:
+            self._hass.states.async_set(
+                calendar_entity_id, "on", {"message": in_progress[0]["summary"]}
+            )
+        else:
+            self._hass.states.async_set(calendar_entity_id, "off")
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Count helper state writes that changed the state."""
+        if not _is_helper_event(event.data):
+            return
+        self.writes += 1
+        old_state = event.data["old_state"]
+        new_state = event.data["new_state"]
+        if (
+            old_state is not None
+            and new_state is not None
+            and old_state.state != new_state.state
+        ):
+            self.transitions += 1
+
+    @callback
+    def _async_state_reported(self, event: Event) -> None:
+        """Count helper state writes that changed nothing."""
+        self.writes += 1
+
+
+@callback
+def _is_helper_event(event_data: Any) -> bool:
+    """Check if a state event is about a helper."""
+    return event_data["entity_id"].startswith("binary_sensor.")
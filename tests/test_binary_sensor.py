@@ -1,8 +1,17 @@
 """The test for the calendar_event binary sensor platform."""
 
+import asyncio
+from typing import Any
 from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
+from custom_components.calendar_event.binary_sensor import (
+    CHANGE_EVENT,
+    CHANGE_METADATA,
+    CHANGE_STATE,
+    CalendarEventBinarySensor,
+    classify_state_change,
+)
 from custom_components.calendar_event.const import (
     ATTR_DESCRIPTION,
     ATTR_LOCATION,
@@ -11,14 +20,28 @@ from custom_components.calendar_event.const import (
     CONF_COMPARISON_METHOD,
     CONF_MATCH,
     CONF_MATCH_ATTRIBUTE,
+    CONF_REFRESH_CLASS,
     DOMAIN,
+    EVENT_MATCH_ENDED,
+    EVENT_MATCH_STARTED,
+    REFRESH_BOUNDARY_ONLY,
+    REFRESH_NORMAL,
+    REFRESH_REALTIME,
+    REFRESH_RELAXED,
+)
+from custom_components.calendar_event.matcher import EventMatcher
+from custom_components.calendar_event.models import CalendarEventRecord
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+    async_fire_time_changed,
 )
-from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, State, SupportsResponse
 from homeassistant.helpers import entity_registry as er
 
-from . import setup_integration
+from . import MockCalendarBackend, mock_event, setup_integration
 
 
 @pytest.fixture
@@ -103,10 +126,9 @@ async def test_binary_sensor_matching_criteria(
         "custom_components.calendar_event.binary_sensor.CalendarEventBinarySensor._get_event_matching_summary"
     ) as mock_get_events:
         if expected_match:
-            mock_get_events.return_value = {
-                "summary": event_summary,
-                "description": "Test event description",
-            }
+            mock_get_events.return_value = mock_event(
+                summary=event_summary, description="Test event description"
+            )
         else:
             mock_get_events.return_value = None
 
@@ -255,10 +277,9 @@ async def test_binary_sensor_state_change_listener(
         assert binary_sensor_state.state == "off"
 
         # Now mock finding a matching event
-        mock_get_events.return_value = {
-            "summary": "Team Meeting",
-            "description": "Weekly team sync",
-        }
+        mock_get_events.return_value = mock_event(
+            summary="Team Meeting", description="Weekly team sync"
+        )
 
         # Change calendar to active state
         hass.states.async_set(
@@ -312,10 +333,9 @@ async def test_binary_sensor_default_comparison_method(
     with patch(
         "custom_components.calendar_event.binary_sensor.CalendarEventBinarySensor._get_event_matching_summary"
     ) as mock_get_events:
-        mock_get_events.return_value = {
-            "summary": "Team Meeting",
-            "description": "Default test",
-        }
+        mock_get_events.return_value = mock_event(
+            summary="Team Meeting", description="Default test"
+        )
 
         await setup_integration(hass, config_entry)
 
@@ -452,7 +472,7 @@ async def test_get_event_matching_summary_match_attribute(
         config_entry=None,
         name="Test",
         unique_id="test",
-        calendar_entity_id=mock_calendar_entity.entity_id,
+        calendar_entity_ids=[mock_calendar_entity.entity_id],
         match=match_text,
         match_attribute=match_attribute,
         comparison_method=comparison_method,
@@ -461,8 +481,11 @@ async def test_get_event_matching_summary_match_attribute(
     event = {
         **event_data,
         "start": "2000-01-01T00:00:00+00:00",
+        "end": "2100-01-01T00:00:00+00:00",
     }
 
+    hass.states.async_set(mock_calendar_entity.entity_id, "on")
+
     with patch(
         "homeassistant.core.ServiceRegistry.async_call",
         AsyncMock(
@@ -476,7 +499,9 @@ async def test_get_event_matching_summary_match_attribute(
         result = await sensor._get_event_matching_summary()
 
     if expected_match:
-        assert result == event
+        assert result == CalendarEventRecord.from_service_event(
+            mock_calendar_entity.entity_id, event
+        )
     else:
         assert result is None
 
@@ -485,6 +510,7 @@ async def test_get_event_matching_summary_match_attribute(
         "get_events",
         {
             "entity_id": mock_calendar_entity.entity_id,
+            "start_date_time": ANY,
             "end_date_time": ANY,
         },
         blocking=True,
@@ -492,6 +518,571 @@ async def test_get_event_matching_summary_match_attribute(
     )
 
 
+async def test_get_event_matching_summary_multiple_calendars(
+    hass: HomeAssistant,
+) -> None:
+    """Test calendars are fetched concurrently and a slow calendar is skipped."""
+    from custom_components.calendar_event.binary_sensor import CalendarEventBinarySensor
+
+    sensor = CalendarEventBinarySensor(
+        hass=hass,
+        config_entry=None,
+        name="Test",
+        unique_id="test",
+        calendar_entity_ids=["calendar.slow", "calendar.off", "calendar.fast"],
+        match="dentist",
+        match_attribute="summary",
+        comparison_method="contains",
+    )
+
+    hass.states.async_set("calendar.slow", "on")
+    hass.states.async_set("calendar.off", "off")
+    hass.states.async_set("calendar.fast", "on")
+
+    fast_event = {
+        "summary": "Dentist",
+        "start": "2000-01-01T00:00:00+00:00",
+        "end": "2100-01-01T00:00:00+00:00",
+    }
+
+    async def mock_get_events(
+        domain: str, service: str, data: dict[str, Any], **kwargs: Any
+    ) -> dict[str, Any]:
+        if data["entity_id"] == "calendar.slow":
+            await asyncio.sleep(60)
+        return {data["entity_id"]: {"events": [fast_event]}}
+
+    with (
+        patch("custom_components.calendar_event.cache.FETCH_TIMEOUT", 0.01),
+        patch(
+            "homeassistant.core.ServiceRegistry.async_call",
+            side_effect=mock_get_events,
+        ) as mock_async_call,
+    ):
+        result = await sensor._get_event_matching_summary()
+
+    assert result is not None
+    assert result.calendar_entity_id == "calendar.fast"
+    assert result.summary == "Dentist"
+    assert {call.args[2]["entity_id"] for call in mock_async_call.call_args_list} == {
+        "calendar.slow",
+        "calendar.fast",
+    }
+
+
+async def test_get_event_matching_summary_reuses_verdict(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test matching is skipped while the fetched events are unchanged."""
+    from custom_components.calendar_event.binary_sensor import CalendarEventBinarySensor
+
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    hass.states.async_set("calendar.work", "on")
+    calendar_backend.events = {
+        "calendar.work": [
+            {
+                "start": "2025-01-06T09:00:00+00:00",
+                "end": "2025-01-06T10:00:00+00:00",
+                "summary": "Dentist",
+            },
+            {
+                "start": "2025-01-06T09:15:00+00:00",
+                "end": "2025-01-06T11:00:00+00:00",
+                "summary": "Standup",
+            },
+        ]
+    }
+    sensor = CalendarEventBinarySensor(
+        hass=hass,
+        config_entry=None,
+        name="Test",
+        unique_id="test",
+        calendar_entity_ids=["calendar.work"],
+        match="dentist",
+        match_attribute="summary",
+        comparison_method="contains",
+    )
+
+    with patch.object(
+        EventMatcher, "matches", autospec=True, side_effect=EventMatcher.matches
+    ) as mock_matches:
+        first = await sensor._get_event_matching_summary()
+        assert first is not None
+        assert first.summary == "Dentist"
+        assert mock_matches.call_count == 2
+
+        # A refetch returning the same events reuses the verdict
+        freezer.tick(60)
+        assert await sensor._get_event_matching_summary() == first
+        assert len(calendar_backend.calls) == 2
+        assert mock_matches.call_count == 2
+
+        # Only the changed event is matched again
+        calendar_backend.events["calendar.work"][0]["summary"] = "Dentist - Sam"
+        freezer.tick(60)
+        result = await sensor._get_event_matching_summary()
+        assert result is not None
+        assert result.summary == "Dentist - Sam"
+        assert mock_matches.call_count == 3
+
+        # Once an event has ended the matching events are checked again
+        freezer.move_to("2025-01-06T10:00:00+00:00")
+        assert await sensor._get_event_matching_summary() is None
+        assert mock_matches.call_count == 3
+
+
+@pytest.mark.parametrize(("normalize", "executor_jobs"), [(False, 0), (True, 1)])
+async def test_large_calendars_matched_in_executor(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+    normalize: bool,
+    executor_jobs: int,
+) -> None:
+    """Test costly matching runs in the executor, small changes on the loop."""
+    from custom_components.calendar_event.binary_sensor import CalendarEventBinarySensor
+
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    hass.states.async_set("calendar.work", "on")
+    calendar_backend.events = {
+        "calendar.work": [
+            {
+                "start": f"2025-01-06T{hour:02}:{minute:02}:00+00:00",
+                "end": f"2025-01-06T{hour:02}:{minute:02}:30+00:00",
+                "summary": f"Reminder {copy}",
+            }
+            for hour in range(10, 20)
+            for minute in range(60)
+            for copy in range(4)
+        ]
+        + [
+            {
+                "start": "2025-01-06T09:00:00+00:00",
+                "end": "2025-01-06T10:00:00+00:00",
+                "summary": "Réunion",
+            }
+        ]
+    }
+    sensor = CalendarEventBinarySensor(
+        hass=hass,
+        config_entry=None,
+        name="Test",
+        unique_id="test",
+        calendar_entity_ids=["calendar.work"],
+        match="reunion" if normalize else "Réunion",
+        match_attribute="summary",
+        comparison_method="contains",
+        normalize=normalize,
+    )
+
+    with patch.object(
+        hass, "async_add_executor_job", wraps=hass.async_add_executor_job
+    ) as mock_executor_job:
+        first = await sensor._get_event_matching_summary()
+        assert first is not None
+        assert first.summary == "Réunion"
+        assert mock_executor_job.call_count == executor_jobs
+
+        # A single changed event is matched on the loop
+        calendar_backend.events["calendar.work"][0]["summary"] = "Réunion - Sam"
+        freezer.tick(60)
+        assert await sensor._get_event_matching_summary() == first
+        assert mock_executor_job.call_count == executor_jobs
+
+
+async def test_match_started_and_ended_events(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test events are fired when a matching event starts and ends."""
+    started = async_capture_events(hass, EVENT_MATCH_STARTED)
+    ended = async_capture_events(hass, EVENT_MATCH_ENDED)
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    calendar_backend.events = {
+        "calendar.work": [
+            {
+                "start": "2025-01-06T09:00:00+00:00",
+                "end": "2025-01-06T10:00:00+00:00",
+                "summary": "Dentist",
+                "location": "High Street",
+            }
+        ]
+    }
+    hass.states.async_set("calendar.work", "on")
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=3,
+        options={
+            "name": "Dentist",
+            CONF_CALENDAR_ENTITY_ID: ["calendar.work"],
+            CONF_MATCH: "dentist",
+        },
+    )
+    await setup_integration(hass, config_entry)
+
+    assert len(started) == 1
+    assert started[0].data == {
+        "entity_id": "binary_sensor.dentist",
+        "config_entry_id": config_entry.entry_id,
+        "calendar": "calendar.work",
+        "start": "2025-01-06T01:00:00-08:00",
+        "end": "2025-01-06T02:00:00-08:00",
+        "summary": "Dentist",
+        "description": "",
+        "location": "High Street",
+    }
+    assert not ended
+
+    # Re-evaluating the same match fires nothing
+    freezer.tick(5)
+    hass.states.async_set("calendar.work", "on", {"message": "Dentist"})
+    await hass.async_block_till_done()
+    assert len(started) == 1
+
+    freezer.move_to("2025-01-06T10:00:00+00:00")
+    hass.states.async_set("calendar.work", "off")
+    await hass.async_block_till_done()
+
+    assert len(started) == 1
+    assert len(ended) == 1
+    assert ended[0].data == started[0].data
+
+
+async def test_overlapping_match_events(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test overlapping matches each start and end at their own boundary."""
+    started = async_capture_events(hass, EVENT_MATCH_STARTED)
+    ended = async_capture_events(hass, EVENT_MATCH_ENDED)
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    calendar_backend.events = {
+        "calendar.work": [
+            {
+                "start": "2025-01-06T09:00:00+00:00",
+                "end": "2025-01-06T11:00:00+00:00",
+                "summary": "Dentist A",
+            },
+            {
+                "start": "2025-01-06T10:00:00+00:00",
+                "end": "2025-01-06T12:00:00+00:00",
+                "summary": "Dentist B",
+            },
+        ]
+    }
+    hass.states.async_set("calendar.work", "on", {"message": "Dentist A"})
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=3,
+        options={
+            "name": "Dentist",
+            CONF_CALENDAR_ENTITY_ID: ["calendar.work"],
+            CONF_MATCH: "dentist",
+            CONF_REFRESH_CLASS: REFRESH_BOUNDARY_ONLY,
+        },
+    )
+    await setup_integration(hass, config_entry)
+    assert [event.data["summary"] for event in started] == ["Dentist A"]
+
+    freezer.move_to("2025-01-06T10:00:00+00:00")
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert [event.data["summary"] for event in started] == ["Dentist A", "Dentist B"]
+    assert started[1].data["start"] == "2025-01-06T02:00:00-08:00"
+    assert not ended
+
+    freezer.move_to("2025-01-06T11:00:00+00:00")
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert [event.data["summary"] for event in ended] == ["Dentist A"]
+    assert len(started) == 2
+    assert hass.states.get("binary_sensor.dentist").attributes["summary"] == (
+        "Dentist B"
+    )
+
+    freezer.move_to("2025-01-06T12:00:00+00:00")
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert [event.data["summary"] for event in ended] == ["Dentist A", "Dentist B"]
+    assert hass.states.get("binary_sensor.dentist").state == "off"
+
+
+async def test_wakes_up_at_cached_boundary(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test a match ending between minutes is noticed as it ends."""
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    calendar_backend.events = {
+        "calendar.work": [
+            {
+                "start": "2025-01-06T09:00:00+00:00",
+                "end": "2025-01-06T10:00:00+00:00",
+                "summary": "Team Meeting",
+            },
+            {
+                "start": "2025-01-06T09:30:00+00:00",
+                "end": "2025-01-06T09:30:20+00:00",
+                "summary": "Dentist",
+            },
+        ]
+    }
+    hass.states.async_set("calendar.work", "on", {"message": "Team Meeting"})
+    await setup_integration(
+        hass,
+        MockConfigEntry(
+            domain=DOMAIN,
+            version=3,
+            options={
+                "name": "Dentist",
+                CONF_CALENDAR_ENTITY_ID: ["calendar.work"],
+                CONF_MATCH: "dentist",
+            },
+        ),
+    )
+    assert hass.states.get("binary_sensor.dentist").state == "on"
+    calendar_backend.calls.clear()
+
+    freezer.move_to("2025-01-06T09:30:20+00:00")
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.dentist").state == "off"
+    assert not calendar_backend.calls
+
+
+async def test_all_day_event(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test an all-day event matches for the whole local day."""
+    freezer.move_to("2025-01-06T20:00:00-08:00")
+    calendar_backend.events = {
+        "calendar.family": [
+            {"start": "2025-01-06", "end": "2025-01-07", "summary": "Bin day"}
+        ]
+    }
+    hass.states.async_set("calendar.family", "on", {"message": "Bin day"})
+    await setup_integration(
+        hass,
+        MockConfigEntry(
+            domain=DOMAIN,
+            version=3,
+            options={
+                "name": "Bins",
+                CONF_CALENDAR_ENTITY_ID: ["calendar.family"],
+                CONF_MATCH: "bin day",
+            },
+        ),
+    )
+    assert hass.states.get("binary_sensor.bins").state == "on"
+
+    freezer.move_to("2025-01-07T00:00:00-08:00")
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.bins").state == "off"
+
+
+@pytest.mark.parametrize(
+    ("refresh_class", "delay"),
+    [
+        (REFRESH_REALTIME, 20),
+        (REFRESH_NORMAL, 50),
+        (REFRESH_RELAXED, 1790),
+        (REFRESH_BOUNDARY_ONLY, 5390),
+    ],
+)
+async def test_refresh_class(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+    refresh_class: str,
+    delay: float,
+) -> None:
+    """Test helpers check their calendars as often as their refresh class."""
+    freezer.move_to("2025-01-06T09:30:10+00:00")
+    calendar_backend.events = {
+        "calendar.work": [
+            {
+                "start": "2025-01-06T09:00:00+00:00",
+                "end": "2025-01-06T11:00:00+00:00",
+                "summary": "Dentist",
+            }
+        ]
+    }
+    hass.states.async_set("calendar.work", "on", {"message": "Dentist"})
+
+    with patch.object(hass.loop, "call_later") as mock_call_later:
+        await setup_integration(
+            hass,
+            MockConfigEntry(
+                domain=DOMAIN,
+                version=3,
+                options={
+                    "name": "Dentist",
+                    CONF_CALENDAR_ENTITY_ID: ["calendar.work"],
+                    CONF_MATCH: "dentist",
+                    CONF_REFRESH_CLASS: refresh_class,
+                },
+            ),
+        )
+
+    assert hass.states.get("binary_sensor.dentist").state == "on"
+    assert mock_call_later.call_args[0][0] == delay
+
+
+async def test_boundary_only_retries_failed_fetch(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test a helper checking only as events change retries a failed fetch."""
+    freezer.move_to("2025-01-06T09:30:10+00:00")
+    hass.states.async_set("calendar.work", "on", {"message": "Dentist"})
+    await setup_integration(
+        hass,
+        MockConfigEntry(
+            domain=DOMAIN,
+            version=3,
+            options={
+                "name": "Dentist",
+                CONF_CALENDAR_ENTITY_ID: ["calendar.work"],
+                CONF_MATCH: "dentist",
+                CONF_REFRESH_CLASS: REFRESH_BOUNDARY_ONLY,
+            },
+        ),
+    )
+    assert hass.states.get("binary_sensor.dentist").state == "off"
+
+    # The calendar can be fetched again
+    backend = MockCalendarBackend()
+    backend.events = {
+        "calendar.work": [
+            {
+                "start": "2025-01-06T09:00:00+00:00",
+                "end": "2025-01-06T11:00:00+00:00",
+                "summary": "Dentist",
+            }
+        ]
+    }
+    hass.services.async_register(
+        "calendar",
+        "get_events",
+        backend.async_get_events,
+        supports_response=SupportsResponse.ONLY,
+    )
+    freezer.move_to("2025-01-06T09:31:00+00:00")
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.dentist").state == "on"
+
+
+@pytest.mark.parametrize(
+    ("old", "new", "change"),
+    [
+        (None, ("on", {}), CHANGE_STATE),
+        (("off", {}), ("on", {"message": "Dentist"}), CHANGE_STATE),
+        (("on", {}), ("unavailable", {}), CHANGE_STATE),
+        (("on", {"message": "Dentist"}), ("on", {"message": "Retro"}), CHANGE_EVENT),
+        (
+            ("on", {"message": "Dentist", "end_time": "2025-01-06 10:00:00"}),
+            ("on", {"message": "Dentist", "end_time": "2025-01-06 10:30:00"}),
+            CHANGE_EVENT,
+        ),
+        (
+            ("on", {"message": "Dentist"}),
+            ("on", {"message": "Dentist", "friendly_name": "Work"}),
+            CHANGE_METADATA,
+        ),
+    ],
+)
+def test_classify_state_change(
+    old: tuple[str, dict[str, Any]] | None,
+    new: tuple[str, dict[str, Any]],
+    change: str,
+) -> None:
+    """Test calendar state changes are classified by what they changed."""
+    old_state = State("calendar.work", old[0], old[1]) if old else None
+    new_state = State("calendar.work", new[0], new[1])
+
+    assert classify_state_change(old_state, new_state) == change
+
+
+async def test_state_changes_refresh_only_when_needed(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test calendar changes only fetch events when the cache can't explain them."""
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    calendar_backend.events = {
+        "calendar.work": [
+            {
+                "start": "2025-01-06T09:00:00+00:00",
+                "end": "2025-01-06T10:00:00+00:00",
+                "summary": "Dentist",
+                "location": "High Street",
+            }
+        ]
+    }
+    hass.states.async_set("calendar.work", "on", {"message": "Dentist"})
+    await setup_integration(
+        hass,
+        MockConfigEntry(
+            domain=DOMAIN,
+            version=3,
+            options={
+                "name": "Dentist",
+                CONF_CALENDAR_ENTITY_ID: ["calendar.work"],
+                CONF_MATCH: "dentist",
+            },
+        ),
+    )
+    assert len(calendar_backend.calls) == 1
+    freezer.tick(5)
+
+    # Metadata changes are ignored
+    with patch.object(
+        CalendarEventBinarySensor, "_schedule_update"
+    ) as mock_schedule_update:
+        hass.states.async_set(
+            "calendar.work", "on", {"message": "Dentist", "friendly_name": "Work"}
+        )
+        await hass.async_block_till_done()
+    mock_schedule_update.assert_not_called()
+
+    # The cached events already explain the event shown
+    hass.states.async_set(
+        "calendar.work", "on", {"message": "Dentist", "location": "High Street"}
+    )
+    await hass.async_block_till_done()
+    assert len(calendar_backend.calls) == 1
+    assert hass.states.get("binary_sensor.dentist").state == "on"
+
+    # An edited event is fetched again
+    calendar_backend.events["calendar.work"][0]["location"] = "Market Square"
+    hass.states.async_set(
+        "calendar.work", "on", {"message": "Dentist", "location": "Market Square"}
+    )
+    await hass.async_block_till_done()
+    assert len(calendar_backend.calls) == 2
+    assert hass.states.get("binary_sensor.dentist").attributes["location"] == (
+        "Market Square"
+    )
+
+    # Turning off needs no new events
+    hass.states.async_set("calendar.work", "off")
+    await hass.async_block_till_done()
+    assert len(calendar_backend.calls) == 2
+    assert hass.states.get("binary_sensor.dentist").state == "off"
+
+
 async def test_binary_sensor_sets_summary_description_and_location_attributes(
     hass: HomeAssistant,
     mock_calendar_entity: er.RegistryEntry,
@@ -514,11 +1105,11 @@ async def test_binary_sensor_sets_summary_description_and_location_attributes(
     with patch(
         "custom_components.calendar_event.binary_sensor.CalendarEventBinarySensor._get_event_matching_summary"
     ) as mock_get_events:
-        mock_get_events.return_value = {
-            "summary": "Team Meeting",
-            "description": "Weekly team sync",
-            "location": "Board Room A",
-        }
+        mock_get_events.return_value = mock_event(
+            summary="Team Meeting",
+            description="Weekly team sync",
+            location="Board Room A",
+        )
 
         await setup_integration(hass, config_entry)
 
@@ -587,22 +1178,56 @@ def test_matches_criteria_logic(
     expected_match: bool,
 ) -> None:
     """Test the matching criteria logic directly."""
-    from custom_components.calendar_event.binary_sensor import CalendarEventBinarySensor
+    matcher = EventMatcher(match_text, match_attribute, comparison_method)
 
-    # Create a mock sensor to test the matching logic
-    sensor = CalendarEventBinarySensor(
-        hass=None,
-        config_entry=None,
-        name="Test",
-        unique_id="test",
-        calendar_entity_id="calendar.test",
-        match=match_text,
-        comparison_method=comparison_method,
-        match_attribute=match_attribute,
+    assert matcher.matches(mock_event(summary=event_summary)) == expected_match
+
+
+@pytest.mark.parametrize(
+    ("normalize", "comparison_method", "match_text", "event_summary", "expected_match"),
+    [
+        (False, "contains", "reunion", "Réunion d'équipe", False),
+        (True, "contains", "reunion", "Réunion d'équipe", True),
+        (True, "starts_with", "REUNION", "réunion d'équipe", True),
+        (True, "exactly", "cafe  meeting", "Café meeting", True),
+        (True, "exactly", "café meeting", "Cafe\tMeeting ", True),
+        (True, "ends_with", "ﬁnal", "Round final", True),
+        (True, "contains", "reunion", "Daily Standup", False),
+    ],
+)
+def test_matches_criteria_normalized(
+    normalize: bool,
+    comparison_method: str,
+    match_text: str,
+    event_summary: str,
+    expected_match: bool,
+) -> None:
+    """Test accent and whitespace insensitive matching."""
+    matcher = EventMatcher(
+        match_text, "summary", comparison_method, normalize=normalize
     )
 
-    result = sensor._matches_criteria(event_summary)
-    assert result == expected_match
+    assert matcher.matches(mock_event(summary=event_summary)) == expected_match
+
+
+def test_normalized_text_cache_shared_between_helpers() -> None:
+    """Test each distinct event text is only normalized once across helpers."""
+    from custom_components.calendar_event.matcher import normalize_text
+
+    matchers = [
+        EventMatcher(match, "summary", "contains", normalize=True)
+        for match in ("réunion", "équipe", "standup")
+    ]
+    event = mock_event(summary="Réunion d'équipe")
+
+    normalize_text.cache_clear()
+    for _ in range(5):
+        for matcher in matchers:
+            matcher.matches(event)
+
+    cache_info = normalize_text.cache_info()
+    assert cache_info.misses == 1
+    assert cache_info.hits == 14
 
 
 async def test_binary_sensor_disabled_no_call_later(
@@ -627,10 +1252,9 @@ async def test_binary_sensor_disabled_no_call_later(
     with patch(
         "custom_components.calendar_event.binary_sensor.CalendarEventBinarySensor._get_event_matching_summary"
     ) as mock_get_events:
-        mock_get_events.return_value = {
-            "summary": "Team Meeting",
-            "description": "Test event description",
-        }
+        mock_get_events.return_value = mock_event(
+            summary="Team Meeting", description="Test event description"
+        )
 
         # Mock the call_later method to track if it's called
         with patch.object(hass.loop, "call_later") as mock_call_later:
@@ -686,10 +1310,9 @@ async def test_binary_sensor_enabled_schedules_call_later(
     with patch(
         "custom_components.calendar_event.binary_sensor.CalendarEventBinarySensor._get_event_matching_summary"
     ) as mock_get_events:
-        mock_get_events.return_value = {
-            "summary": "Team Meeting",
-            "description": "Test event description",
-        }
+        mock_get_events.return_value = mock_event(
+            summary="Team Meeting", description="Test event description"
+        )
 
         # Mock the call_later method to track if it's called
         with patch.object(hass.loop, "call_later") as mock_call_later:
@@ -747,10 +1370,9 @@ async def test_binary_sensor_cancels_call_later_when_disabled(
     with patch(
         "custom_components.calendar_event.binary_sensor.CalendarEventBinarySensor._get_event_matching_summary"
     ) as mock_get_events:
-        mock_get_events.return_value = {
-            "summary": "Team Meeting",
-            "description": "Test event description",
-        }
+        mock_get_events.return_value = mock_event(
+            summary="Team Meeting", description="Test event description"
+        )
 
         await setup_integration(hass, config_entry)
 
@@ -0,0 +1,387 @@
+"""Test the shared calendar event cache."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from custom_components.calendar_event.cache import async_get_event_cache
+from custom_components.calendar_event.const import (
+    CACHE_MAX_AGE,
+    CONF_CALENDAR_ENTITY_ID,
+    CONF_MATCH,
+    DOMAIN,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from custom_components.calendar_event.models import (
+    CalendarEventRecord,
+    parse_timestamp,
+)
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.core import HomeAssistant, SupportsResponse
+from homeassistant.util import dt as dt_util
+
+from . import MockCalendarBackend, setup_integration
+
+if TYPE_CHECKING:
+    from freezegun.api import FrozenDateTimeFactory
+
+EVENT = {
+    "start": "2025-01-06T09:00:00+00:00",
+    "end": "2025-01-06T10:00:00+00:00",
+    "summary": "Team Meeting",
+    "description": "Weekly sync",
+}
+MEETING_OPTIONS = {
+    "name": "Meeting",
+    CONF_CALENDAR_ENTITY_ID: ["calendar.work"],
+    CONF_MATCH: "meeting",
+}
+
+
+async def test_helpers_share_fetch(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test helpers watching the same calendar share a single fetch."""
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    calendar_backend.events = {"calendar.work": [EVENT]}
+    hass.states.async_set("calendar.work", "on")
+
+    for match in ("meeting", "team", "standup"):
+        await setup_integration(
+            hass,
+            MockConfigEntry(
+                domain=DOMAIN,
+                version=3,
+                options={
+                    "name": f"Test {match}",
+                    CONF_CALENDAR_ENTITY_ID: ["calendar.work"],
+                    CONF_MATCH: match,
+                },
+            ),
+        )
+    calendar_backend.calls.clear()
+
+    # An event that isn't cached yet starts
+    calendar_backend.events["calendar.work"].append(
+        {
+            "start": "2025-01-06T09:35:00+00:00",
+            "end": "2025-01-06T09:45:00+00:00",
+            "summary": "Standup",
+        }
+    )
+    freezer.move_to("2025-01-06T09:35:00+00:00")
+    hass.states.async_set("calendar.work", "on", {"message": "Standup"})
+    await hass.async_block_till_done()
+
+    assert len(calendar_backend.calls) == 1
+    assert hass.states.get("binary_sensor.test_meeting").state == "on"
+    assert hass.states.get("binary_sensor.test_team").state == "on"
+    assert hass.states.get("binary_sensor.test_standup").state == "on"
+
+
+async def test_snapshot_max_age(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test cached snapshots are reused until they are too old."""
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    calendar_backend.events = {"calendar.work": [EVENT]}
+    cache = async_get_event_cache(hass)
+
+    first = await cache.async_get_snapshot("calendar.work")
+    assert first is not None
+    assert [event.summary for event in first.events] == ["Team Meeting"]
+
+    freezer.tick(10)
+    assert await cache.async_get_snapshot("calendar.work") is first
+    assert (
+        await cache.async_get_snapshot(
+            "calendar.work", refresh_after=first.fetched_at + 1
+        )
+        is not first
+    )
+
+    freezer.tick(60)
+    assert await cache.async_get_snapshot("calendar.work") is not first
+    assert len(calendar_backend.calls) == 3
+
+
+async def test_adaptive_max_age(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test unchanged calendars are refreshed less often until they change."""
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    calendar_backend.events = {
+        "calendar.work": [
+            {
+                "start": "2025-01-06T14:00:00+00:00",
+                "end": "2025-01-06T15:00:00+00:00",
+                "summary": "Retro",
+            }
+        ]
+    }
+    cache = async_get_event_cache(hass)
+    await cache.async_get_snapshot("calendar.work")
+    assert cache.async_get_max_age("calendar.work") == CACHE_MAX_AGE
+
+    # Each refresh returning the same events doubles the interval
+    max_ages = []
+    for _ in range(7):
+        freezer.tick(cache.async_get_max_age("calendar.work"))
+        await cache.async_get_snapshot("calendar.work")
+        max_ages.append(cache.async_get_max_age("calendar.work"))
+    assert max_ages == [60, 120, 240, 480, 900, 900, 900]
+    assert len(calendar_backend.calls) == 8
+
+    freezer.tick(CACHE_MAX_AGE)
+    await cache.async_get_snapshot("calendar.work")
+    assert len(calendar_backend.calls) == 8
+
+    # Changed events bring the interval back down
+    calendar_backend.events["calendar.work"].append(
+        {
+            "start": "2025-01-06T11:00:00+00:00",
+            "end": "2025-01-06T11:30:00+00:00",
+            "summary": "Lunch",
+        }
+    )
+    freezer.tick(900)
+    snapshot = await cache.async_get_snapshot("calendar.work")
+    assert len(snapshot.events) == 2
+    assert cache.async_get_max_age("calendar.work") == CACHE_MAX_AGE
+
+    # As does a refresh after the calendar changed
+    freezer.tick(CACHE_MAX_AGE)
+    snapshot = await cache.async_get_snapshot("calendar.work")
+    assert cache.async_get_max_age("calendar.work") == 60
+    await cache.async_get_snapshot(
+        "calendar.work", refresh_after=snapshot.fetched_at + 1
+    )
+    assert cache.async_get_max_age("calendar.work") == CACHE_MAX_AGE
+
+
+async def test_cache_cleared_on_last_unload(
+    hass: HomeAssistant,
+    calendar_backend: MockCalendarBackend,
+    loaded_entry: MockConfigEntry,
+) -> None:
+    """Test the cache is emptied once the last helper is unloaded."""
+    cache = async_get_event_cache(hass)
+    await cache.async_get_snapshot("calendar.my_calendar")
+    assert cache.async_get_cached("calendar.my_calendar") is not None
+
+    assert await hass.config_entries.async_unload(loaded_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert cache.async_get_cached("calendar.my_calendar") is None
+
+
+async def test_snapshot_delta(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test refreshed snapshots hold the events changed since the last one."""
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    standup = {
+        "start": "2025-01-06T11:00:00+00:00",
+        "end": "2025-01-06T11:15:00+00:00",
+        "summary": "Standup",
+    }
+    calendar_backend.events = {"calendar.work": [EVENT, standup]}
+    cache = async_get_event_cache(hass)
+
+    first = await cache.async_get_snapshot("calendar.work")
+    assert first is not None
+    assert first.delta is None
+
+    freezer.tick(60)
+    unchanged = await cache.async_get_snapshot("calendar.work")
+    assert unchanged is not None
+    assert unchanged.events is first.events
+    assert unchanged.delta == (first.fingerprint, frozenset(), frozenset())
+
+    calendar_backend.events["calendar.work"][1] = {**standup, "location": "Online"}
+    freezer.tick(60)
+    changed = await cache.async_get_snapshot("calendar.work")
+    assert changed is not None
+    assert changed.fingerprint != first.fingerprint
+    assert changed.delta is not None
+    assert changed.delta.previous == first.fingerprint
+    assert [event.location for event in changed.delta.added] == ["Online"]
+    assert [event.location for event in changed.delta.removed] == [""]
+
+
+async def test_snapshots_persisted(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test changed snapshots are written to storage after a delay."""
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    calendar_backend.events = {"calendar.work": [EVENT]}
+    MockConfigEntry(domain=DOMAIN, version=3, options=MEETING_OPTIONS).add_to_hass(hass)
+    cache = async_get_event_cache(hass)
+
+    snapshot = await cache.async_get_snapshot("calendar.work")
+    assert snapshot is not None
+    assert STORAGE_KEY not in hass_storage
+
+    freezer.tick(STORAGE_SAVE_DELAY)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert hass_storage[STORAGE_KEY]["data"] == {
+        "calendar.work": {
+            "start": snapshot.start,
+            "end": snapshot.end,
+            "fetched_at": snapshot.fetched_at,
+            "events": [
+                [
+                    datetime(2025, 1, 6, 9, tzinfo=UTC).timestamp(),
+                    datetime(2025, 1, 6, 10, tzinfo=UTC).timestamp(),
+                    "Team Meeting",
+                    "Weekly sync",
+                    "",
+                    False,
+                ]
+            ],
+        }
+    }
+
+    # Fetching the same events again isn't written
+    hass_storage.pop(STORAGE_KEY)
+    freezer.tick(CACHE_MAX_AGE)
+    assert await cache.async_get_snapshot("calendar.work") is not snapshot
+    freezer.tick(STORAGE_SAVE_DELAY)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert STORAGE_KEY not in hass_storage
+
+
+async def test_unmonitored_calendars_not_persisted(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test only the calendars helpers monitor are written to storage."""
+    calendar_backend.events = {"calendar.work": [EVENT], "calendar.family": [EVENT]}
+    MockConfigEntry(domain=DOMAIN, version=3, options=MEETING_OPTIONS).add_to_hass(hass)
+    cache = async_get_event_cache(hass)
+    await cache.async_get_snapshot("calendar.work")
+    await cache.async_get_snapshot("calendar.family")
+
+    freezer.tick(STORAGE_SAVE_DELAY)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert list(hass_storage[STORAGE_KEY]["data"]) == ["calendar.work"]
+
+
+async def test_restored_snapshot_until_calendar_available(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test helpers use persisted events until their calendar is available."""
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": STORAGE_KEY,
+        "data": {
+            "calendar.work": {
+                "start": datetime(2025, 1, 6, 8, tzinfo=UTC).timestamp(),
+                "end": datetime(2025, 1, 7, 8, tzinfo=UTC).timestamp(),
+                "fetched_at": datetime(2025, 1, 6, 8, tzinfo=UTC).timestamp(),
+                "events": [
+                    [
+                        datetime(2025, 1, 6, 9, tzinfo=UTC).timestamp(),
+                        datetime(2025, 1, 6, 10, tzinfo=UTC).timestamp(),
+                        "Team Meeting",
+                        "Weekly sync",
+                        "",
+                    ]
+                ],
+            }
+        },
+    }
+
+    entry = MockConfigEntry(domain=DOMAIN, version=3, options=MEETING_OPTIONS)
+    await setup_integration(hass, entry)
+
+    state = hass.states.get("binary_sensor.meeting")
+    assert state.state == "on"
+    assert state.attributes["summary"] == "Team Meeting"
+
+    # Reloading the only helper restores the persisted events again
+    hass.config_entries.async_update_entry(
+        entry, options={**MEETING_OPTIONS, CONF_MATCH: "team"}
+    )
+    await hass.async_block_till_done()
+    freezer.tick(STORAGE_SAVE_DELAY)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.meeting").state == "on"
+    assert "calendar.work" in hass_storage[STORAGE_KEY]["data"]
+
+    # The live calendar has no events in progress
+    hass.services.async_register(
+        "calendar",
+        "get_events",
+        MockCalendarBackend().async_get_events,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.states.async_set("calendar.work", "off")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.meeting").state == "off"
+
+
+async def test_all_day_events_parsed(hass: HomeAssistant) -> None:
+    """Test dates start at local midnight and each string is only parsed once."""
+    parse_timestamp.cache_clear()
+    events = [
+        CalendarEventRecord.from_service_event(
+            "calendar.family",
+            {"start": "2025-01-06", "end": "2025-01-07", "summary": summary},
+        )
+        for summary in ("Bin day", "Holiday")
+    ]
+
+    local_midnight = datetime(2025, 1, 6, tzinfo=dt_util.get_default_time_zone())
+    assert [(event.start, event.end) for event in events] == [
+        (local_midnight.timestamp(), local_midnight.timestamp() + 24 * 3600)
+    ] * 2
+    assert parse_timestamp.cache_info().misses == 2
+    assert parse_timestamp.cache_info().hits == 2
+    assert events[0].all_day
+    assert events[0].as_dict()["start"] == "2025-01-06"
+    assert events[0].as_dict()["end"] == "2025-01-07"
+
+    assert (
+        CalendarEventRecord.from_service_event(
+            "calendar.family", {"start": "2025-01-06T09:00:00", "end": "tomorrow"}
+        )
+        is None
+    )
+    timed = CalendarEventRecord.from_service_event(
+        "calendar.family", {"start": "2025-01-06T09:00:00", "end": "2025-01-06T10:00"}
+    )
+    assert timed is not None
+    assert not timed.all_day
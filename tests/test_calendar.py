@@ -0,0 +1,189 @@
+"""Test the calendar_event filtered calendars."""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from custom_components.calendar_event.const import (
+    CONF_CALENDAR_ENTITY_ID,
+    CONF_FILTERED_CALENDAR,
+    CONF_MATCH,
+    DOMAIN,
+    SERVICE_REFRESH,
+)
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.components.calendar import DATA_COMPONENT
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from . import MockCalendarBackend, setup_integration
+
+if TYPE_CHECKING:
+    from freezegun.api import FrozenDateTimeFactory
+
+
+async def _async_setup_dentist(
+    hass: HomeAssistant, calendar_backend: MockCalendarBackend
+) -> None:
+    """Set up a dentist helper with a filtered calendar."""
+    calendar_backend.events = {
+        "calendar.work": [
+            {
+                "start": "2025-01-06T09:00:00+00:00",
+                "end": "2025-01-06T10:00:00+00:00",
+                "summary": "Dentist",
+                "location": "High Street",
+            },
+            {
+                "start": "2025-01-06T09:15:00+00:00",
+                "end": "2025-01-06T09:45:00+00:00",
+                "summary": "Standup",
+            },
+            {
+                "start": "2025-01-06T14:00:00+00:00",
+                "end": "2025-01-06T15:00:00+00:00",
+                "summary": "Dentist follow-up",
+            },
+        ]
+    }
+    hass.states.async_set("calendar.work", "on", {"message": "Dentist"})
+    await setup_integration(
+        hass,
+        MockConfigEntry(
+            domain=DOMAIN,
+            version=3,
+            options={
+                "name": "Dentist",
+                CONF_CALENDAR_ENTITY_ID: ["calendar.work"],
+                CONF_MATCH: "dentist",
+                CONF_FILTERED_CALENDAR: True,
+            },
+        ),
+    )
+
+
+async def test_filtered_calendar_state(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test the calendar shows the matching event in progress or the next one."""
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    await _async_setup_dentist(hass, calendar_backend)
+
+    state = hass.states.get("calendar.dentist")
+    assert state.state == "on"
+    assert state.attributes["message"] == "Dentist"
+    assert state.attributes["location"] == "High Street"
+
+    freezer.move_to("2025-01-06T10:00:00+00:00")
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("calendar.dentist")
+    assert state.state == "off"
+    assert state.attributes["message"] == "Dentist follow-up"
+
+    # Events added to the cache show up straight away
+    calendar_backend.events["calendar.work"].append(
+        {
+            "start": "2025-01-06T11:00:00+00:00",
+            "end": "2025-01-06T11:30:00+00:00",
+            "summary": "Dentist call",
+        }
+    )
+    freezer.tick(1)
+    await hass.services.async_call(DOMAIN, SERVICE_REFRESH, {}, blocking=True)
+    assert hass.states.get("calendar.dentist").attributes["message"] == "Dentist call"
+
+
+async def test_filtered_calendar_events(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test only matching events are listed, read from the event cache."""
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    await _async_setup_dentist(hass, calendar_backend)
+    calendar_backend.calls.clear()
+    entity = hass.data[DATA_COMPONENT].get_entity("calendar.dentist")
+
+    events = await entity.async_get_events(
+        hass,
+        datetime(2025, 1, 6, 9, 30, tzinfo=UTC),
+        datetime(2025, 1, 6, 18, tzinfo=UTC),
+    )
+
+    assert [event.summary for event in events] == ["Dentist", "Dentist follow-up"]
+    assert events[0].start == datetime(2025, 1, 6, 9, tzinfo=UTC)
+    assert events[0].location == "High Street"
+    assert events[1].location is None
+    assert not calendar_backend.calls
+
+
+async def test_filtered_calendar_day_view(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test a view of the current day is read from the event cache."""
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    await _async_setup_dentist(hass, calendar_backend)
+    calendar_backend.calls.clear()
+    entity = hass.data[DATA_COMPONENT].get_entity("calendar.dentist")
+    freezer.tick(5)
+
+    start = dt_util.start_of_local_day()
+    events = await entity.async_get_events(hass, start, start + timedelta(days=1))
+
+    assert [event.summary for event in events] == ["Dentist", "Dentist follow-up"]
+    assert not calendar_backend.calls
+
+
+async def test_filtered_calendar_all_day_event(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test all-day events are listed with dates."""
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    await _async_setup_dentist(hass, calendar_backend)
+    calendar_backend.events["calendar.work"].append(
+        {"start": "2025-01-06", "end": "2025-01-07", "summary": "Dentist day"}
+    )
+    freezer.tick(1)
+    await hass.services.async_call(DOMAIN, SERVICE_REFRESH, {}, blocking=True)
+    entity = hass.data[DATA_COMPONENT].get_entity("calendar.dentist")
+
+    start = dt_util.start_of_local_day()
+    events = await entity.async_get_events(hass, start, start + timedelta(days=1))
+
+    [all_day] = [event for event in events if event.summary == "Dentist day"]
+    assert all_day.all_day
+    assert all_day.start == date(2025, 1, 6)
+    assert all_day.end == date(2025, 1, 7)
+
+
+async def test_filtered_calendar_optional(
+    hass: HomeAssistant, calendar_backend: MockCalendarBackend
+) -> None:
+    """Test no calendar is created unless asked for."""
+    await setup_integration(
+        hass,
+        MockConfigEntry(
+            domain=DOMAIN,
+            version=3,
+            options={
+                "name": "Dentist",
+                CONF_CALENDAR_ENTITY_ID: ["calendar.work"],
+                CONF_MATCH: "dentist",
+            },
+        ),
+    )
+
+    assert hass.states.async_entity_ids("calendar") == []
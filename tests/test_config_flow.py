@@ -2,22 +2,35 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
 from unittest.mock import AsyncMock
 
 import pytest
 from custom_components.calendar_event.const import (
     CONF_CALENDAR_ENTITY_ID,
     CONF_COMPARISON_METHOD,
+    CONF_DURATION_SENSORS,
+    CONF_FILTERED_CALENDAR,
     CONF_MATCH,
     CONF_MATCH_ATTRIBUTE,
+    CONF_NORMALIZE,
+    CONF_REFRESH_CLASS,
     DOMAIN,
+    REFRESH_NORMAL,
 )
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_NAME
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
+from . import MockCalendarBackend
+
+if TYPE_CHECKING:
+    from freezegun.api import FrozenDateTimeFactory
+    from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
 
 @pytest.mark.parametrize(
     (
@@ -30,28 +43,28 @@ from homeassistant.data_entry_flow import FlowResultType
     [
         (
             "Test Calendar Event",
-            "calendar.my_calendar",
+            ["calendar.my_calendar"],
             "Meeting",
             "summary",
             "contains",
         ),
         (
             "Another Test",
-            "calendar.work_calendar",
+            ["calendar.work_calendar"],
             "Doctor",
             "summary",
             "starts_with",
         ),
         (
             "Third Test",
-            "calendar.personal",
+            ["calendar.personal"],
             "Appointment",
             "summary",
             "ends_with",
         ),
         (
             "Exact Match Test",
-            "calendar.events",
+            ["calendar.events"],
             "Birthday Party",
             "summary",
             "exactly",
@@ -61,7 +74,7 @@ from homeassistant.data_entry_flow import FlowResultType
 async def test_config_flow(
     hass: HomeAssistant,
     name: str,
-    calendar_entity_id: str,
+    calendar_entity_id: list[str],
     summary: str,
     match_attribute: str,
     comparison_method: str,
@@ -89,7 +102,7 @@ async def test_config_flow(
     await hass.async_block_till_done()
 
     assert result.get("type") is FlowResultType.CREATE_ENTRY
-    assert result.get("version") == 2
+    assert result.get("version") == 3
     assert result.get("title") == name
 
     assert result.get("options") == {
@@ -98,6 +111,10 @@ async def test_config_flow(
         CONF_MATCH: summary,
         CONF_MATCH_ATTRIBUTE: match_attribute,
         CONF_COMPARISON_METHOD: comparison_method,
+        CONF_NORMALIZE: False,
+        CONF_DURATION_SENSORS: False,
+        CONF_FILTERED_CALENDAR: False,
+        CONF_REFRESH_CLASS: REFRESH_NORMAL,
     }
 
     assert len(mock_setup_entry.mock_calls) == 1
@@ -116,7 +133,7 @@ async def test_options_flow(
         data={},
         options={
             CONF_NAME: "Original Name",
-            CONF_CALENDAR_ENTITY_ID: "calendar.original",
+            CONF_CALENDAR_ENTITY_ID: ["calendar.original"],
             CONF_MATCH: "Original Summary",
             CONF_MATCH_ATTRIBUTE: "summary",
             CONF_COMPARISON_METHOD: "contains",
@@ -134,7 +151,7 @@ async def test_options_flow(
     result = await hass.config_entries.options.async_configure(
         result["flow_id"],
         {
-            CONF_CALENDAR_ENTITY_ID: "calendar.updated",
+            CONF_CALENDAR_ENTITY_ID: ["calendar.updated"],
             CONF_MATCH: "Updated Summary",
             CONF_MATCH_ATTRIBUTE: "summary",
             CONF_COMPARISON_METHOD: "starts_with",
@@ -146,8 +163,97 @@ async def test_options_flow(
     assert result.get("type") is FlowResultType.CREATE_ENTRY
     assert result.get("data") == {
         CONF_NAME: "Original Name",
-        CONF_CALENDAR_ENTITY_ID: "calendar.updated",
+        CONF_CALENDAR_ENTITY_ID: ["calendar.updated"],
         CONF_MATCH: "Updated Summary",
         CONF_MATCH_ATTRIBUTE: "summary",
         CONF_COMPARISON_METHOD: "starts_with",
+        CONF_NORMALIZE: False,
+        CONF_DURATION_SENSORS: False,
+        CONF_FILTERED_CALENDAR: False,
+        CONF_REFRESH_CLASS: REFRESH_NORMAL,
     }
+
+
+@pytest.mark.parametrize("flow_type", ["config_flow", "options_flow"])
+async def test_flow_preview(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+    mock_setup_entry: AsyncMock,
+    flow_type: str,
+) -> None:
+    """Test the preview filters the calendar fetched once per flow."""
+    client = await hass_ws_client(hass)
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    calendar_backend.events = {
+        "calendar.work": [
+            {
+                "start": "2025-01-06T09:00:00+00:00",
+                "end": "2025-01-06T10:00:00+00:00",
+                "summary": "Team Meeting",
+            },
+            {
+                "start": "2025-01-08T14:00:00+00:00",
+                "end": "2025-01-08T15:00:00+00:00",
+                "summary": "Dentist",
+            },
+        ]
+    }
+    if flow_type == "config_flow":
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+        name = "Work"
+    else:
+        config_entry = MockConfigEntry(
+            domain=DOMAIN,
+            options={
+                CONF_NAME: "Original Name",
+                CONF_CALENDAR_ENTITY_ID: ["calendar.work"],
+                CONF_MATCH: "meeting",
+            },
+            title="Original Name",
+        )
+        config_entry.add_to_hass(hass)
+        result = await hass.config_entries.options.async_init(config_entry.entry_id)
+        name = "Original Name"
+    assert result["preview"] == DOMAIN
+
+    async def async_preview(match: str) -> dict:
+        """Return the preview for some text to match."""
+        await client.send_json_auto_id(
+            {
+                "type": f"{DOMAIN}/start_preview",
+                "flow_id": result["flow_id"],
+                "flow_type": flow_type,
+                "user_input": {
+                    CONF_NAME: name,
+                    CONF_CALENDAR_ENTITY_ID: ["calendar.work"],
+                    CONF_MATCH: match,
+                },
+            }
+        )
+        msg = await client.receive_json()
+        assert msg["success"]
+        msg = await client.receive_json()
+        return msg["event"]
+
+    preview = await async_preview("meeting")
+    assert preview["state"] == "on"
+    assert preview["attributes"]["friendly_name"] == name
+    assert [event["summary"] for event in preview["attributes"]["events"]] == [
+        "Team Meeting"
+    ]
+
+    preview = await async_preview("dent")
+    assert preview["state"] == "off"
+    assert [event["summary"] for event in preview["attributes"]["events"]] == [
+        "Dentist"
+    ]
+
+    preview = await async_preview("")
+    assert preview["attributes"]["events"] == []
+
+    # The calendar was only fetched once
+    assert len(calendar_backend.calls) == 1
@@ -0,0 +1,83 @@
+"""Test the calendar_event diagnostics."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from custom_components.calendar_event.const import (
+    CONF_CALENDAR_ENTITY_ID,
+    CONF_MATCH,
+    DOMAIN,
+)
+from custom_components.calendar_event.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.core import HomeAssistant
+
+from . import MockCalendarBackend, setup_integration
+
+if TYPE_CHECKING:
+    from freezegun.api import FrozenDateTimeFactory
+
+
+async def test_config_entry_diagnostics(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test the helper, its calendars and the shared state are included."""
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    calendar_backend.events = {
+        "calendar.work": [
+            {
+                "start": "2025-01-06T09:00:00+00:00",
+                "end": "2025-01-06T10:00:00+00:00",
+                "summary": "Dentist",
+                "location": "High Street",
+            },
+            {
+                "start": "2025-01-06T14:00:00+00:00",
+                "end": "2025-01-06T15:00:00+00:00",
+                "summary": "Team Meeting",
+            },
+        ]
+    }
+    hass.states.async_set("calendar.work", "on", {"message": "Dentist"})
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=3,
+        options={
+            "name": "Dentist",
+            CONF_CALENDAR_ENTITY_ID: ["calendar.work"],
+            CONF_MATCH: "dentist",
+        },
+    )
+    await setup_integration(hass, entry)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    [helper] = diagnostics["helpers"]
+    assert helper["entity_id"] == "binary_sensor.dentist"
+    assert helper["is_on"] is True
+    assert helper["matcher"]["match"] == "dentist"
+    assert helper["next_wakeup"] == "2025-01-06T09:31:00+00:00"
+    assert helper["update_task"] == "done"
+    assert helper["verdict"]["valid_until"] == "2025-01-06T10:00:00+00:00"
+    assert helper["verdict"]["event"]["summary"] == REDACTED
+    assert helper["verdict"]["event"]["location"] == REDACTED
+    assert helper["evaluations"]
+
+    calendar = diagnostics["calendars"]["calendar.work"]
+    assert calendar["window"]["events"] == 2
+    assert calendar["window"]["fetched_at"] == "2025-01-06T09:30:00+00:00"
+    assert calendar["last_fetch"]["at"] == "2025-01-06T09:30:00+00:00"
+    assert calendar["fetch_in_flight"] is False
+
+    integration = diagnostics["integration"]
+    assert integration["cached_calendars"] == 1
+    assert integration["fetches"]["active"] == 0
+    assert integration["profiling"] is False
+    assert "High Street" not in str(diagnostics)
@@ -0,0 +1,68 @@
+"""Test the historical evaluation of calendar_event criteria."""
+
+from __future__ import annotations
+
+import numpy as np
+from custom_components.calendar_event.history import (
+    matching_intervals,
+    merge_intervals,
+)
+from custom_components.calendar_event.matcher import EventMatcher
+from custom_components.calendar_event.models import CalendarEventRecord
+
+
+def test_merge_intervals() -> None:
+    """Test overlapping, touching and nested intervals are merged."""
+    starts, ends = merge_intervals(
+        np.array([50.0, 0.0, 10.0, 20.0, 30.0, 60.0]),
+        np.array([55.0, 10.0, 20.0, 25.0, 40.0, 60.0]),
+        0,
+        100,
+    )
+
+    assert starts.tolist() == [0.0, 30.0, 50.0]
+    assert ends.tolist() == [25.0, 40.0, 55.0]
+
+
+def test_merge_intervals_nested() -> None:
+    """Test an interval contained in a longer one doesn't split it."""
+    starts, ends = merge_intervals(
+        np.array([0.0, 10.0, 30.0]), np.array([50.0, 20.0, 40.0]), 0, 100
+    )
+
+    assert starts.tolist() == [0.0]
+    assert ends.tolist() == [50.0]
+
+
+def test_merge_intervals_clipped_to_range() -> None:
+    """Test intervals are clipped to the range and dropped outside it."""
+    starts, ends = merge_intervals(
+        np.array([-20.0, 90.0, 120.0]), np.array([10.0, 150.0, 130.0]), 0, 100
+    )
+
+    assert starts.tolist() == [0.0, 90.0]
+    assert ends.tolist() == [10.0, 100.0]
+
+
+def test_merge_intervals_empty() -> None:
+    """Test merging no intervals."""
+    starts, ends = merge_intervals(np.array([]), np.array([]), 0, 100)
+
+    assert starts.size == 0
+    assert ends.size == 0
+
+
+def test_matching_intervals() -> None:
+    """Test only the matching events contribute intervals."""
+    events = [
+        CalendarEventRecord.create("calendar.work", 0, 10, "Dentist"),
+        CalendarEventRecord.create("calendar.work", 5, 30, "Standup"),
+        CalendarEventRecord.create("calendar.work", 40, 50, "dentist"),
+    ]
+
+    starts, ends = matching_intervals(
+        events, EventMatcher("dentist", "summary", "exactly"), 0, 100
+    )
+
+    assert starts.tolist() == [0.0, 40.0]
+    assert ends.tolist() == [10.0, 50.0]
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from custom_components.calendar_event.const import (
+    CONF_CALENDAR_ENTITY_ID,
     CONF_MATCH,
     DOMAIN,
 )
@@ -105,7 +106,76 @@ async def test_migrate_entry_summary_to_match(hass: HomeAssistant) -> None:
 
     assert await async_migrate_entry(hass, config_entry)
 
-    assert config_entry.version == 2
+    assert config_entry.version == 3
     assert config_entry.options[CONF_MATCH] == "Legacy Option Match"
+    assert config_entry.options[CONF_CALENDAR_ENTITY_ID] == ["calendar.my_calendar"]
     assert "summary" not in config_entry.options
     assert config_entry.data == {}
+
+
+async def test_migrate_entry_calendar_to_list(hass: HomeAssistant) -> None:
+    """Test migration wraps the single calendar option in a list."""
+    from custom_components.calendar_event import async_migrate_entry
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=2,
+        data={},
+        options={
+            "name": DEFAULT_NAME,
+            "calendar_entity_id": "calendar.my_calendar",
+            "match": "Test Event",
+            "comparison_method": "contains",
+            "match_attribute": "description",
+        },
+        title=DEFAULT_NAME,
+    )
+    config_entry.add_to_hass(hass)
+
+    assert await async_migrate_entry(hass, config_entry)
+
+    assert config_entry.version == 3
+    assert config_entry.options[CONF_CALENDAR_ENTITY_ID] == ["calendar.my_calendar"]
+    assert config_entry.options["match_attribute"] == "description"
+
+
+async def test_source_calendar_removed(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """Test removing one of several calendars keeps the helper for the rest."""
+
+    first = entity_registry.async_get_or_create(
+        "calendar", "test", "first", suggested_object_id="first"
+    )
+    second = entity_registry.async_get_or_create(
+        "calendar", "test", "second", suggested_object_id="second"
+    )
+
+    config_entry = MockConfigEntry(
+        data={},
+        domain=DOMAIN,
+        version=3,
+        options={
+            "name": DEFAULT_NAME,
+            "calendar_entity_id": [first.entity_id, second.entity_id],
+            "match": "Test Event",
+            "comparison_method": "contains",
+            "match_attribute": "summary",
+        },
+        title=DEFAULT_NAME,
+    )
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_registry.async_remove(first.entity_id)
+    await hass.async_block_till_done()
+
+    assert config_entry.options[CONF_CALENDAR_ENTITY_ID] == [second.entity_id]
+    assert config_entry.state is ConfigEntryState.LOADED
+
+    entity_registry.async_remove(second.entity_id)
+    await hass.async_block_till_done()
+
+    assert hass.config_entries.async_get_entry(config_entry.entry_id) is None
@@ -0,0 +1,160 @@
+"""Test the calendar.get_events concurrency limit."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from custom_components.calendar_event.cache import async_get_event_cache
+from custom_components.calendar_event.const import (
+    DOMAIN,
+    SERVICE_GET_FETCH_STATISTICS,
+)
+from custom_components.calendar_event.limiter import (
+    PRIORITY_HIGH,
+    PRIORITY_PERIODIC,
+    FetchLimiter,
+    async_get_fetch_limiter,
+)
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from . import MockCalendarBackend
+
+if TYPE_CHECKING:
+    from freezegun.api import FrozenDateTimeFactory
+
+EVENT = {
+    "start": "2025-01-06T09:00:00+00:00",
+    "end": "2025-01-06T10:00:00+00:00",
+    "summary": "Team Meeting",
+}
+
+
+async def _async_take_slot(
+    limiter: FetchLimiter, priority: int, order: list[str], name: str
+) -> bool:
+    """Take a slot of the limiter and note when it was granted."""
+    async with limiter.async_slot(priority) as acquired:
+        order.append(name)
+        await asyncio.sleep(0)
+    return acquired
+
+
+async def test_priority_order(hass: HomeAssistant) -> None:
+    """Test waiting fetches start by priority, then in the order they queued."""
+    limiter = FetchLimiter(hass, 1)
+    order: list[str] = []
+    release = asyncio.Event()
+
+    async def async_hold() -> None:
+        async with limiter.async_slot(PRIORITY_HIGH):
+            await release.wait()
+
+    holder = hass.async_create_task(async_hold())
+    await asyncio.sleep(0)
+    waiting = [
+        hass.async_create_task(_async_take_slot(limiter, priority, order, name))
+        for priority, name in (
+            (PRIORITY_PERIODIC, "periodic 1"),
+            (PRIORITY_HIGH, "state change 1"),
+            (PRIORITY_PERIODIC, "periodic 2"),
+            (PRIORITY_HIGH, "state change 2"),
+        )
+    ]
+    await asyncio.sleep(0)
+    assert limiter.async_statistics()["queued"] == 4
+    assert limiter.async_statistics()["active"] == 1
+
+    release.set()
+    await holder
+    assert await asyncio.gather(*waiting) == [True] * 4
+    assert order == ["state change 1", "state change 2", "periodic 1", "periodic 2"]
+
+    statistics = limiter.async_statistics()
+    assert statistics["active"] == 0
+    assert statistics["queued"] == 0
+    assert statistics["wait"]["count"] == 5
+
+
+async def test_stale_fetch_skipped(hass: HomeAssistant) -> None:
+    """Test a fetch that went stale while waiting doesn't take a slot."""
+    limiter = FetchLimiter(hass, 1)
+    stale = False
+
+    async def async_wait() -> bool:
+        async with limiter.async_slot(PRIORITY_PERIODIC, lambda: stale) as acquired:
+            return acquired
+
+    async with limiter.async_slot(PRIORITY_HIGH):
+        waiting = hass.async_create_task(async_wait())
+        await asyncio.sleep(0)
+        stale = True
+
+    assert await waiting is False
+    assert limiter.async_statistics()["skipped"] == 1
+    assert limiter.async_statistics()["active"] == 0
+
+
+async def test_cancelled_fetch_frees_queue(hass: HomeAssistant) -> None:
+    """Test fetches cancelled while waiting don't hold up the others."""
+    limiter = FetchLimiter(hass, 1)
+    order: list[str] = []
+
+    async with limiter.async_slot(PRIORITY_HIGH):
+        cancelled = hass.async_create_task(
+            _async_take_slot(limiter, PRIORITY_HIGH, order, "cancelled")
+        )
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+
+    # The slot is free again though the cancelled fetch is still queued
+    assert await _async_take_slot(limiter, PRIORITY_PERIODIC, order, "next")
+    assert order == ["next"]
+    assert limiter.async_statistics()["active"] == 0
+
+
+async def test_superseded_refresh_skipped(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test a periodic refresh replaced by a calendar change isn't fetched."""
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    calendar_backend.events = {"calendar.work": [EVENT]}
+    cache = async_get_event_cache(hass)
+    limiter = async_get_fetch_limiter(hass)
+    limiter.async_set_limit(1)
+    first = await cache.async_get_snapshot("calendar.work")
+    calendar_backend.calls.clear()
+
+    freezer.tick(60)
+    async with limiter.async_slot(PRIORITY_HIGH):
+        periodic = hass.async_create_task(cache.async_get_snapshot("calendar.work"))
+        await asyncio.sleep(0)
+        freezer.tick(1)
+        changed = hass.async_create_task(
+            cache.async_get_snapshot(
+                "calendar.work", refresh_after=first.fetched_at + 61
+            )
+        )
+        await asyncio.sleep(0)
+
+    assert await periodic is await changed
+    assert len(calendar_backend.calls) == 1
+    assert limiter.async_statistics()["skipped"] == 1
+
+
+async def test_configured_limit(hass: HomeAssistant) -> None:
+    """Test the limit can be set in YAML and statistics read with an action."""
+    assert await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {"max_concurrent_fetches": 2}}
+    )
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_GET_FETCH_STATISTICS, {}, blocking=True, return_response=True
+    )
+
+    assert response == {"limit": 2, "active": 0, "queued": 0, "skipped": 0}
@@ -0,0 +1,169 @@
+"""Test profiling of the calendar_event update pipeline."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+from custom_components.calendar_event.const import (
+    DOMAIN,
+    SERVICE_GET_TIMER_DRIFT,
+    SERVICE_START_PROFILING,
+    SERVICE_STOP_PROFILING,
+)
+from custom_components.calendar_event.profiling import (
+    DRIFT_SCHEDULE_UPDATE,
+    TimerDriftMonitor,
+    async_get_profiler,
+)
+from pytest_homeassistant_custom_component.common import (
+    async_fire_time_changed,
+)
+
+from homeassistant.core import HomeAssistant
+
+from . import MockCalendarBackend, setup_meeting_helper
+
+if TYPE_CHECKING:
+    from freezegun.api import FrozenDateTimeFactory
+
+
+async def _async_refresh(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Make the helper update with freshly fetched events."""
+    freezer.tick(5)
+    hass.states.async_set("calendar.work", "on", {"message": str(freezer())})
+    await hass.async_block_till_done()
+
+
+async def test_profiling_stages(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test each stage of an update is timed while profiling."""
+    await setup_meeting_helper(hass, freezer, calendar_backend)
+
+    await hass.services.async_call(DOMAIN, SERVICE_START_PROFILING, {}, blocking=True)
+    await _async_refresh(hass, freezer)
+    await _async_refresh(hass, freezer)
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_STOP_PROFILING, {}, blocking=True, return_response=True
+    )
+
+    assert list(response["stages"]) == [
+        "state_lookup",
+        "service_call",
+        "validation",
+        "parsing",
+        "matching",
+        "state_write",
+        "update",
+    ]
+    assert response["stages"]["update"]["count"] == 2
+    assert response["stages"]["service_call"]["count"] == 2
+    assert response["profile"] is None
+    assert hass.states.get("binary_sensor.meeting").state == "on"
+
+    # Nothing is recorded once profiling stops
+    await _async_refresh(hass, freezer)
+    assert async_get_profiler(hass).async_statistics() == response["stages"]
+
+
+async def test_profiling_capture(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+    tmp_path: Path,
+) -> None:
+    """Test a profile of a number of updates is written to the config dir."""
+    hass.config.config_dir = str(tmp_path)
+    await setup_meeting_helper(hass, freezer, calendar_backend)
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_START_PROFILING, {"evaluations": 2}, blocking=True
+    )
+    await _async_refresh(hass, freezer)
+    assert not await hass.async_add_executor_job(os.listdir, tmp_path)
+
+    await _async_refresh(hass, freezer)
+    await hass.async_block_till_done()
+    assert await hass.async_add_executor_job(os.listdir, tmp_path) == [
+        "calendar_event_profile_20250106093010.prof"
+    ]
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_STOP_PROFILING, {}, blocking=True, return_response=True
+    )
+    assert response["profile"] == str(
+        tmp_path / "calendar_event_profile_20250106093010.prof"
+    )
+
+
+async def test_profiling_disabled(hass: HomeAssistant) -> None:
+    """Test stages share a no-op context while profiling is off."""
+    profiler = async_get_profiler(hass)
+
+    assert profiler.stage("matching") is profiler.stage("state_write")
+    assert profiler.evaluation() is profiler.stage("matching")
+
+
+async def test_timer_drift(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test how late the minute timer runs is recorded."""
+    await setup_meeting_helper(hass, freezer, calendar_backend)
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_GET_TIMER_DRIFT, {}, blocking=True, return_response=True
+    )
+    assert response == {}
+
+    # The timer is due on the next minute, a minute after set up, run it late
+    late = hass.loop.time() + 60.25
+    with patch.object(hass.loop, "time", return_value=late):
+        async_fire_time_changed(hass, fire_all=True)
+        await hass.async_block_till_done()
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_GET_TIMER_DRIFT, {}, blocking=True, return_response=True
+    )
+    assert response["schedule_update"]["count"] == 1
+    assert 240 < response["schedule_update"]["max"] <= 250
+    assert response["update_state"]["count"] == 1
+    assert response["update_state"]["max"] >= response["schedule_update"]["max"]
+
+
+async def test_timer_drift_not_recorded_for_state_changes(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test updates triggered before the timer was due record no drift."""
+    await setup_meeting_helper(hass, freezer, calendar_backend)
+
+    await _async_refresh(hass, freezer)
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_GET_TIMER_DRIFT, {}, blocking=True, return_response=True
+    )
+    assert response == {}
+
+
+def test_timer_drift_percentiles() -> None:
+    """Test drift percentiles and worst case are in milliseconds."""
+    monitor = TimerDriftMonitor()
+    for drift in range(1, 101):
+        monitor.async_record(DRIFT_SCHEDULE_UPDATE, drift / 1000)
+
+    assert monitor.async_statistics() == {
+        "schedule_update": {
+            "count": 100,
+            "p50": 50.5,
+            "p90": 90.1,
+            "p99": 99.01,
+            "max": 100.0,
+        }
+    }
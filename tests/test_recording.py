@@ -0,0 +1,225 @@
+"""Test recording of calendar responses."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from custom_components.calendar_event.cache import async_get_event_cache
+from custom_components.calendar_event.const import (
+    DOMAIN,
+    SERVICE_START_RECORDING,
+    SERVICE_STOP_RECORDING,
+)
+from custom_components.calendar_event.recording import (
+    async_get_recorder,
+    redact_text,
+)
+from pytest_homeassistant_custom_component.common import (
+    async_fire_time_changed,
+)
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from . import MEETING_EVENT, MockCalendarBackend, setup_meeting_helper
+from .replay import load_recording
+
+if TYPE_CHECKING:
+    from freezegun.api import FrozenDateTimeFactory
+
+
+async def _async_record(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, *, redact: bool
+) -> dict:
+    """Record two refreshes of the calendar."""
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_START_RECORDING,
+        {"redact": redact},
+        blocking=True,
+        return_response=True,
+    )
+    for _ in range(2):
+        freezer.tick(60)
+        hass.states.async_set("calendar.work", "on", {"message": str(freezer())})
+        await hass.async_block_till_done()
+    stopped = await hass.services.async_call(
+        DOMAIN, SERVICE_STOP_RECORDING, {}, blocking=True, return_response=True
+    )
+    assert stopped["path"] == response["path"]
+    return stopped
+
+
+async def test_recording(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+    tmp_path: Path,
+) -> None:
+    """Test responses are recorded and can be replayed."""
+    hass.config.config_dir = str(tmp_path)
+    await setup_meeting_helper(hass, freezer, calendar_backend)
+
+    response = await _async_record(hass, freezer, redact=False)
+
+    assert response == {
+        "path": str(tmp_path / "calendar_event_responses_20250106093000.jsonl"),
+        "responses": 2,
+    }
+    path = Path(response["path"])
+    lines = [
+        json.loads(line)
+        for line in (await hass.async_add_executor_job(path.read_text)).splitlines()
+    ]
+    assert [line["fetched_at"] for line in lines] == [1736155860.0, 1736155920.0]
+    assert lines[0]["calendar"] == "calendar.work"
+    assert lines[0]["start_date_time"] == "2025-01-06T08:00:00+00:00"
+    assert lines[0]["end_date_time"] == "2025-01-07T09:31:00+00:00"
+    # Both responses hold the same event, which is replayed once
+    assert await hass.async_add_executor_job(load_recording, path) == {
+        "calendar.work": [MEETING_EVENT]
+    }
+
+    # Nothing is recorded once stopped
+    freezer.tick(60)
+    hass.states.async_set("calendar.work", "on", {"message": "later"})
+    await hass.async_block_till_done()
+    assert len(calendar_backend.calls) == 4
+    assert (await hass.async_add_executor_job(path.read_text)).count("\n") == 2
+
+
+async def test_recording_redacted(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+    tmp_path: Path,
+) -> None:
+    """Test event text is replaced by tokens when redacting."""
+    hass.config.config_dir = str(tmp_path)
+    await setup_meeting_helper(hass, freezer, calendar_backend)
+
+    response = await _async_record(hass, freezer, redact=True)
+
+    events = await hass.async_add_executor_job(load_recording, Path(response["path"]))
+    assert events == {
+        "calendar.work": [
+            {
+                "start": MEETING_EVENT["start"],
+                "end": MEETING_EVENT["end"],
+                "summary": redact_text("Team Meeting"),
+                "description": redact_text("Weekly sync"),
+                "location": redact_text("Board Room A"),
+            }
+        ]
+    }
+    assert "Team Meeting" not in json.dumps(events)
+
+
+def test_redact_text() -> None:
+    """Test equal text is redacted to equal tokens."""
+    assert redact_text("Standup") == redact_text("Standup")
+    assert redact_text("Standup") != redact_text("Retro")
+    assert redact_text("Standup").startswith("redacted-")
+    assert redact_text("") == ""
+    assert redact_text(None) is None
+
+
+async def test_recording_targeted_calendars(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+    tmp_path: Path,
+) -> None:
+    """Test only the calendars of the targeted helpers are recorded."""
+    hass.config.config_dir = str(tmp_path)
+    await setup_meeting_helper(hass, freezer, calendar_backend)
+    hass.states.async_set("calendar.family", "on")
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_START_RECORDING,
+        {"entity_id": "binary_sensor.meeting"},
+        blocking=True,
+    )
+
+    cache = async_get_event_cache(hass)
+    freezer.tick(60)
+    await cache.async_get_snapshot("calendar.work")
+    await cache.async_get_snapshot("calendar.family")
+    stopped = await hass.services.async_call(
+        DOMAIN, SERVICE_STOP_RECORDING, {}, blocking=True, return_response=True
+    )
+
+    assert stopped["responses"] == 1
+    lines = await hass.async_add_executor_job(Path(stopped["path"]).read_text)
+    assert "calendar.family" not in lines
+
+
+async def test_recording_duration(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+    tmp_path: Path,
+) -> None:
+    """Test a recording stops by itself after its duration."""
+    hass.config.config_dir = str(tmp_path)
+    await setup_meeting_helper(hass, freezer, calendar_backend)
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_START_RECORDING,
+        {"duration": {"minutes": 5}},
+        blocking=True,
+        return_response=True,
+    )
+    freezer.tick(60)
+    hass.states.async_set("calendar.work", "on", {"message": "Team Meeting"})
+    await hass.async_block_till_done()
+
+    freezer.tick(5 * 60)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert not async_get_recorder(hass).recording
+    path = Path(response["path"])
+    assert (await hass.async_add_executor_job(path.read_text)).count("\n") == 1
+
+
+async def test_recording_written_on_stop(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+    tmp_path: Path,
+) -> None:
+    """Test buffered responses are written as Home Assistant stops."""
+    hass.config.config_dir = str(tmp_path)
+    await setup_meeting_helper(hass, freezer, calendar_backend)
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_START_RECORDING,
+        {},
+        blocking=True,
+        return_response=True,
+    )
+    freezer.tick(60)
+    hass.states.async_set("calendar.work", "on", {"message": "Team Meeting"})
+    await hass.async_block_till_done()
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+
+    assert not async_get_recorder(hass).recording
+    path = Path(response["path"])
+    assert (await hass.async_add_executor_job(path.read_text)).count("\n") == 1
+
+
+async def test_stop_recording_not_started(hass: HomeAssistant) -> None:
+    """Test stopping when nothing is being recorded."""
+    assert await async_setup_component(hass, DOMAIN, {})
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_STOP_RECORDING, {}, blocking=True, return_response=True
+    )
+
+    assert response == {"path": None, "responses": 0}
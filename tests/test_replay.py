@@ -0,0 +1,58 @@
+"""Test helpers against a replayed week of calendar events."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from custom_components.calendar_event.const import (
+    CONF_CALENDAR_ENTITY_ID,
+    CONF_MATCH,
+    DOMAIN,
+)
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from . import setup_integration
+from .replay import CalendarReplay, load_recorded_events
+
+WEEK_START = datetime(2025, 1, 6, tzinfo=UTC)
+WEEK_END = datetime(2025, 1, 13, tzinfo=UTC)
+
+
+async def test_replay_week(hass: HomeAssistant) -> None:
+    """Test a helper turns on and off with each matching event of a week."""
+    replay = CalendarReplay(hass, WEEK_START, load_recorded_events("work_week"))
+    await replay.async_start()
+    await setup_integration(
+        hass,
+        MockConfigEntry(
+            domain=DOMAIN,
+            version=3,
+            options={
+                "name": "Dentist",
+                CONF_CALENDAR_ENTITY_ID: ["calendar.work"],
+                CONF_MATCH: "dentist",
+            },
+        ),
+    )
+
+    await replay.async_run_until(datetime(2025, 1, 8, 14, 30, tzinfo=UTC))
+    state = hass.states.get("binary_sensor.dentist")
+    assert state.state == "on"
+    assert state.attributes["summary"] == "Dentist - Sam"
+
+    await replay.async_run_until(datetime(2025, 1, 10, 9, 5, tzinfo=UTC))
+    assert hass.states.get("binary_sensor.dentist").state == "off"
+
+    # The follow up starts part way through the standup
+    await replay.async_run_until(datetime(2025, 1, 10, 9, 10, tzinfo=UTC))
+    assert hass.states.get("binary_sensor.dentist").state == "on"
+
+    await replay.async_run_until(WEEK_END)
+    assert hass.states.get("binary_sensor.dentist").state == "off"
+
+    # Three appointments, each turning the helper on and off
+    assert replay.transitions == 6
+    assert replay.fetches > 0
+    assert replay.writes >= replay.transitions
@@ -0,0 +1,145 @@
+"""Test the calendar_event matched time sensors."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import pytest
+from custom_components.calendar_event.const import (
+    CONF_CALENDAR_ENTITY_ID,
+    CONF_DURATION_SENSORS,
+    CONF_MATCH,
+    DOMAIN,
+    EVENT_MATCH_ENDED,
+    EVENT_MATCH_STARTED,
+)
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from homeassistant.core import HomeAssistant
+
+from . import setup_integration
+from .replay import CalendarReplay, load_recorded_events
+
+
+@pytest.fixture(autouse=True)
+async def utc_time_zone(hass: HomeAssistant) -> None:
+    """Count days and weeks in UTC like the recorded calendar."""
+    await hass.config.async_set_time_zone("UTC")
+
+
+async def _async_start_replay(hass: HomeAssistant, start: datetime) -> CalendarReplay:
+    """Replay the work week from start with a dentist helper."""
+    replay = CalendarReplay(hass, start, load_recorded_events("work_week"))
+    await replay.async_start()
+    await setup_integration(
+        hass,
+        MockConfigEntry(
+            domain=DOMAIN,
+            version=3,
+            options={
+                "name": "Dentist",
+                CONF_CALENDAR_ENTITY_ID: ["calendar.work"],
+                CONF_MATCH: "dentist",
+                CONF_DURATION_SENSORS: True,
+            },
+        ),
+    )
+    return replay
+
+
+def _totals(hass: HomeAssistant) -> tuple[float, float, float]:
+    """Return the hours matched today, this week and over the rolling window."""
+    return (
+        float(hass.states.get("sensor.dentist_today").state),
+        float(hass.states.get("sensor.dentist_this_week").state),
+        float(hass.states.get("sensor.dentist_rolling").state),
+    )
+
+
+async def test_matched_time(hass: HomeAssistant) -> None:
+    """Test the matched time is totalled as matches start and end."""
+    replay = await _async_start_replay(hass, datetime(2025, 1, 6, tzinfo=UTC))
+    assert _totals(hass) == (0, 0, 0)
+
+    # A match in progress is counted up to the last boundary
+    await replay.async_run_until(datetime(2025, 1, 8, 14, 30, tzinfo=UTC))
+    assert _totals(hass) == (0, 0, 0)
+
+    await replay.async_run_until(datetime(2025, 1, 8, 15, 30, tzinfo=UTC))
+    assert _totals(hass) == (1, 1, 1)
+
+    # A new day starts, the rolling window still covers yesterday
+    await replay.async_run_until(datetime(2025, 1, 9, 10, tzinfo=UTC))
+    assert _totals(hass) == (0, 1, 1)
+
+    # The match leaves the rolling window a day after it started and ended
+    await replay.async_run_until(datetime(2025, 1, 9, 14, 30, tzinfo=UTC))
+    assert _totals(hass) == (0, 1, 1)
+    await replay.async_run_until(datetime(2025, 1, 9, 15, 30, tzinfo=UTC))
+    assert _totals(hass) == (0, 1, 0)
+
+    await replay.async_run_until(datetime(2025, 1, 11, 12, tzinfo=UTC))
+    assert _totals(hass) == (0.75, 2.25, 0.75)
+
+    # A new week starts
+    await replay.async_run_until(datetime(2025, 1, 13, 1, tzinfo=UTC))
+    assert _totals(hass) == (0, 0, 0)
+
+
+async def test_matched_time_backfilled(hass: HomeAssistant) -> None:
+    """Test the time matched earlier in the week is read from the calendar."""
+    replay = await _async_start_replay(hass, datetime(2025, 1, 10, 9, 30, tzinfo=UTC))
+    await replay.async_run_until(datetime(2025, 1, 10, 9, 31, tzinfo=UTC))
+
+    # The follow up in progress is counted up to when the helper started
+    assert _totals(hass) == pytest.approx((1 / 3, 4 / 3, 1 / 3), abs=1e-4)
+    assert hass.states.get("binary_sensor.dentist").state == "on"
+
+    await replay.async_run_until(datetime(2025, 1, 10, 10, tzinfo=UTC))
+    assert _totals(hass) == (0.5, 1.5, 0.5)
+
+
+async def test_match_in_progress_kept_on_reload(hass: HomeAssistant) -> None:
+    """Test reloading a helper neither fires its match again nor loses its time."""
+    replay = await _async_start_replay(hass, datetime(2025, 1, 10, 9, 30, tzinfo=UTC))
+    await replay.async_run_until(datetime(2025, 1, 10, 9, 31, tzinfo=UTC))
+    started = async_capture_events(hass, EVENT_MATCH_STARTED)
+    ended = async_capture_events(hass, EVENT_MATCH_ENDED)
+
+    [entry] = hass.config_entries.async_entries(DOMAIN)
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.dentist").state == "on"
+    assert not started
+    assert not ended
+
+    # The follow up ends at 9:40
+    await replay.async_run_until(datetime(2025, 1, 10, 10, tzinfo=UTC))
+    assert len(ended) == 1
+    assert _totals(hass) == (0.5, 1.5, 0.5)
+
+
+async def test_matched_time_sensors_optional(hass: HomeAssistant) -> None:
+    """Test no sensors are created unless asked for."""
+    replay = CalendarReplay(
+        hass, datetime(2025, 1, 6, tzinfo=UTC), load_recorded_events("work_week")
+    )
+    await replay.async_start()
+    await setup_integration(
+        hass,
+        MockConfigEntry(
+            domain=DOMAIN,
+            version=3,
+            options={
+                "name": "Dentist",
+                CONF_CALENDAR_ENTITY_ID: ["calendar.work"],
+                CONF_MATCH: "dentist",
+            },
+        ),
+    )
+
+    assert hass.states.async_entity_ids("sensor") == []
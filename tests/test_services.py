@@ -0,0 +1,400 @@
+"""Test calendar_event services."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+import pytest
+from custom_components.calendar_event.const import (
+    CONF_CALENDAR_ENTITY_ID,
+    CONF_MATCH,
+    DOMAIN,
+    SERVICE_BACKFILL,
+    SERVICE_FIND_MATCHES,
+    SERVICE_REFRESH,
+)
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+
+from . import MockCalendarBackend, setup_integration
+
+if TYPE_CHECKING:
+    from freezegun.api import FrozenDateTimeFactory
+
+
+async def _async_fail_get_events(call: ServiceCall) -> ServiceResponse:
+    """Fail like a calendar that can't be reached."""
+    raise HomeAssistantError("Calendar unreachable")
+
+
+@pytest.fixture(autouse=True)
+async def setup_calendars(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Set up two calendars with events over the next week."""
+    freezer.move_to("2025-01-06T08:00:00+00:00")
+    assert await async_setup_component(hass, DOMAIN, {})
+    hass.states.async_set("calendar.family", "off")
+    hass.states.async_set("calendar.work", "off")
+    calendar_backend.events = {
+        "calendar.family": [
+            {
+                "start": "2025-01-06T15:00:00+00:00",
+                "end": "2025-01-06T16:00:00+00:00",
+                "summary": "Dentist - Sam",
+            },
+            {
+                "start": "2025-01-09T10:00:00+00:00",
+                "end": "2025-01-09T11:00:00+00:00",
+                "summary": "Dentist - Alex",
+            },
+        ],
+        "calendar.work": [
+            {
+                "start": "2025-01-06T09:00:00+00:00",
+                "end": "2025-01-06T10:00:00+00:00",
+                "summary": "Standup",
+                "location": "Dentist waiting room",
+            },
+            {
+                "start": "2025-01-06T11:00:00+00:00",
+                "end": "2025-01-06T12:00:00+00:00",
+                "summary": "Dentist",
+            },
+        ],
+    }
+
+
+async def test_find_matches(
+    hass: HomeAssistant, calendar_backend: MockCalendarBackend
+) -> None:
+    """Test matching events are returned from every calendar in start order."""
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_FIND_MATCHES,
+        {
+            "calendar_entity_id": ["calendar.family", "calendar.work"],
+            "match": "dentist",
+            "comparison_method": "starts_with",
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert [(event["calendar"], event["summary"]) for event in response["events"]] == [
+        ("calendar.work", "Dentist"),
+        ("calendar.family", "Dentist - Sam"),
+    ]
+    assert dt_util.parse_datetime(response["events"][0]["start"]) == datetime(
+        2025, 1, 6, 11, tzinfo=UTC
+    )
+    assert dt_util.parse_datetime(response["events"][0]["end"]) == datetime(
+        2025, 1, 6, 12, tzinfo=UTC
+    )
+
+
+async def test_find_matches_uses_cache(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test repeated queries within the cached window don't refetch."""
+    for match in ("dentist", "standup", "dentist"):
+        freezer.tick(2)
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_FIND_MATCHES,
+            {"calendar_entity_id": "calendar.work", "match": match},
+            blocking=True,
+            return_response=True,
+        )
+
+    assert len(calendar_backend.calls) == 1
+
+
+async def test_find_matches_outside_cached_window(
+    hass: HomeAssistant, calendar_backend: MockCalendarBackend
+) -> None:
+    """Test a range beyond the cached window is fetched directly."""
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_FIND_MATCHES,
+        {
+            "calendar_entity_id": "calendar.family",
+            "match": "dentist",
+            "match_attribute": "any",
+            "duration": {"days": 7},
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert [event["summary"] for event in response["events"]] == [
+        "Dentist - Sam",
+        "Dentist - Alex",
+    ]
+    assert len(calendar_backend.calls) == 1
+
+
+async def test_find_matches_calendar_fails(hass: HomeAssistant) -> None:
+    """Test a calendar that can't be read fails the search."""
+    hass.services.async_register(
+        "calendar",
+        "get_events",
+        _async_fail_get_events,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    with pytest.raises(HomeAssistantError) as err:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_FIND_MATCHES,
+            {"calendar_entity_id": ["calendar.work"], "match": "dentist"},
+            blocking=True,
+            return_response=True,
+        )
+    assert err.value.translation_key == "fetch_failed"
+    assert err.value.translation_placeholders == {"entity_id": "calendar.work"}
+
+
+async def test_find_matches_end_before_start(hass: HomeAssistant) -> None:
+    """Test an empty time range is rejected."""
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_FIND_MATCHES,
+            {
+                "calendar_entity_id": "calendar.work",
+                "match": "dentist",
+                "start_date_time": "2025-01-06T12:00:00+00:00",
+                "end_date_time": "2025-01-06T11:00:00+00:00",
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+
+async def test_find_matches_unknown_calendar(hass: HomeAssistant) -> None:
+    """Test an unknown calendar is rejected."""
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_FIND_MATCHES,
+            {"calendar_entity_id": "calendar.missing", "match": "dentist"},
+            blocking=True,
+            return_response=True,
+        )
+
+
+async def test_backfill(
+    hass: HomeAssistant, calendar_backend: MockCalendarBackend
+) -> None:
+    """Test backfill merges the matching events of every calendar."""
+    calendar_backend.events["calendar.work"].append(
+        {
+            "start": "2025-01-06T11:30:00+00:00",
+            "end": "2025-01-06T12:30:00+00:00",
+            "summary": "Dentist follow up",
+        }
+    )
+    await setup_integration(
+        hass,
+        MockConfigEntry(
+            domain=DOMAIN,
+            version=3,
+            options={
+                "name": "Dentist",
+                CONF_CALENDAR_ENTITY_ID: ["calendar.family", "calendar.work"],
+                CONF_MATCH: "dentist",
+            },
+        ),
+    )
+    calendar_backend.calls.clear()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BACKFILL,
+        {
+            "entity_id": "binary_sensor.dentist",
+            "start_date_time": "2025-01-06T00:00:00+00:00",
+            "end_date_time": "2025-01-09T10:30:00+00:00",
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    result = response["binary_sensor.dentist"]
+    assert [
+        (
+            dt_util.parse_datetime(interval["start"]),
+            dt_util.parse_datetime(interval["end"]),
+        )
+        for interval in result["intervals"]
+    ] == [
+        (
+            datetime(2025, 1, 6, 11, tzinfo=UTC),
+            datetime(2025, 1, 6, 12, 30, tzinfo=UTC),
+        ),
+        (datetime(2025, 1, 6, 15, tzinfo=UTC), datetime(2025, 1, 6, 16, tzinfo=UTC)),
+        (
+            datetime(2025, 1, 9, 10, tzinfo=UTC),
+            datetime(2025, 1, 9, 10, 30, tzinfo=UTC),
+        ),
+    ]
+    assert result["on_time"] == 3 * 60 * 60
+    assert len(calendar_backend.calls) == 2
+
+
+async def test_backfill_defaults_to_last_90_days(
+    hass: HomeAssistant, calendar_backend: MockCalendarBackend
+) -> None:
+    """Test backfill covers the 90 days up to now by default."""
+    await setup_integration(
+        hass,
+        MockConfigEntry(
+            domain=DOMAIN,
+            version=3,
+            options={
+                "name": "Dentist",
+                CONF_CALENDAR_ENTITY_ID: ["calendar.family"],
+                CONF_MATCH: "dentist",
+            },
+        ),
+    )
+    calendar_backend.calls.clear()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BACKFILL,
+        {"entity_id": "binary_sensor.dentist"},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response["binary_sensor.dentist"] == {"on_time": 0.0, "intervals": []}
+    assert dt_util.parse_datetime(
+        calendar_backend.calls[0]["start_date_time"]
+    ) == datetime(2024, 10, 8, 8, tzinfo=UTC)
+    assert dt_util.parse_datetime(
+        calendar_backend.calls[0]["end_date_time"]
+    ) == datetime(2025, 1, 6, 8, tzinfo=UTC)
+
+
+async def test_backfill_calendar_fails(
+    hass: HomeAssistant, calendar_backend: MockCalendarBackend
+) -> None:
+    """Test backfill raises rather than reporting a calendar it couldn't read."""
+    await setup_integration(
+        hass,
+        MockConfigEntry(
+            domain=DOMAIN,
+            version=3,
+            options={
+                "name": "Dentist",
+                CONF_CALENDAR_ENTITY_ID: ["calendar.family"],
+                CONF_MATCH: "dentist",
+            },
+        ),
+    )
+    hass.services.async_register(
+        "calendar",
+        "get_events",
+        _async_fail_get_events,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    with pytest.raises(HomeAssistantError) as err:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_BACKFILL,
+            {"entity_id": "binary_sensor.dentist"},
+            blocking=True,
+            return_response=True,
+        )
+    assert err.value.translation_key == "fetch_failed"
+    assert err.value.translation_placeholders == {"entity_id": "calendar.family"}
+
+
+async def test_refresh(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_backend: MockCalendarBackend,
+) -> None:
+    """Test refresh reads each targeted calendar once and updates its helpers."""
+    freezer.move_to("2025-01-06T09:30:00+00:00")
+    hass.states.async_set("calendar.family", "on", {"message": "School run"})
+    hass.states.async_set("calendar.work", "on", {"message": "Standup"})
+    for name, calendar_entity_ids in (
+        ("Dentist", ["calendar.family", "calendar.work"]),
+        ("School", ["calendar.family"]),
+        ("Standup", ["calendar.work"]),
+    ):
+        await setup_integration(
+            hass,
+            MockConfigEntry(
+                domain=DOMAIN,
+                version=3,
+                options={
+                    "name": name,
+                    CONF_CALENDAR_ENTITY_ID: calendar_entity_ids,
+                    CONF_MATCH: name,
+                },
+            ),
+        )
+    assert hass.states.get("binary_sensor.dentist").state == "off"
+    assert hass.states.get("binary_sensor.school").state == "off"
+
+    # Events the calendars' states don't mention yet
+    calendar_backend.events["calendar.family"].append(
+        {
+            "start": "2025-01-06T09:00:00+00:00",
+            "end": "2025-01-06T10:00:00+00:00",
+            "summary": "School run",
+        }
+    )
+    calendar_backend.events["calendar.work"].append(
+        {
+            "start": "2025-01-06T09:15:00+00:00",
+            "end": "2025-01-06T09:45:00+00:00",
+            "summary": "Dentist checkup",
+        }
+    )
+
+    calendar_backend.calls.clear()
+    freezer.tick(1)
+    await hass.services.async_call(
+        DOMAIN, SERVICE_REFRESH, {"entity_id": "binary_sensor.dentist"}, blocking=True
+    )
+    assert sorted(call["entity_id"] for call in calendar_backend.calls) == [
+        "calendar.family",
+        "calendar.work",
+    ]
+    assert hass.states.get("binary_sensor.dentist").state == "on"
+    assert hass.states.get("binary_sensor.school").state == "off"
+
+    # Targeting a calendar updates the helpers watching it
+    calendar_backend.calls.clear()
+    freezer.tick(1)
+    await hass.services.async_call(
+        DOMAIN, SERVICE_REFRESH, {"entity_id": "calendar.family"}, blocking=True
+    )
+    assert [call["entity_id"] for call in calendar_backend.calls] == ["calendar.family"]
+    assert hass.states.get("binary_sensor.school").state == "on"
+
+    # Every helper without a target, still reading each calendar once
+    calendar_backend.calls.clear()
+    freezer.tick(1)
+    await hass.services.async_call(DOMAIN, SERVICE_REFRESH, {}, blocking=True)
+    assert len(calendar_backend.calls) == 2
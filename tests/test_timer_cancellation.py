@@ -34,7 +34,7 @@ async def test_timer_cancelled_when_entity_disabled_directly(
         config_entry=config_entry,
         name="Test",
         unique_id="test_id",
-        calendar_entity_id="calendar.test",
+        calendar_entity_ids=["calendar.test"],
         match="Test",
         match_attribute="summary",
         comparison_method="contains",
@@ -78,7 +78,7 @@ async def test_timer_not_scheduled_when_disabled(hass: HomeAssistant) -> None:
         config_entry=config_entry,
         name="Test",
         unique_id="test_id",
-        calendar_entity_id="calendar.test",
+        calendar_entity_ids=["calendar.test"],
         match="Test",
         match_attribute="summary",
         comparison_method="contains",
@@ -121,7 +121,7 @@ async def test_timer_cancelled_in_state_changed_when_disabled(
         config_entry=config_entry,
         name="Test",
         unique_id="test_id",
-        calendar_entity_id="calendar.test",
+        calendar_entity_ids=["calendar.test"],
         match="Test",
         match_attribute="summary",
         comparison_method="contains",